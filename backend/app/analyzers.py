@@ -0,0 +1,586 @@
+"""Code analyzers behind /generate-tests, /debug, /review, /refactor and /analyze-logs.
+
+Pure functions of the request fields returning the response dict, so they can
+be called from the endpoints, batch workers and benchmarks alike. Structure
+derived from the code (lines, brackets, language, AST) comes from the shared
+document cache.
+"""
+import ast
+import re
+
+from . import language_detect, log_analyzer, review_rules
+from .documents import get_document
+
+# Bump when analyzer output changes for reasons the source fingerprint cannot see
+ANALYZER_VERSION = "1"
+
+
+def detection(doc) -> tuple:
+    """(language, confidence) of the document's code, detected once per content hash."""
+    return doc.derive("language", lambda d: language_detect.detect(d.code))
+
+
+def detect_language(code: str) -> str:
+    """Detect programming language from code syntax"""
+    return detection(get_document(code))[0]
+
+
+def language_mismatch(doc, language: str) -> dict | None:
+    """The warning fields when the code confidently looks like a language other than the selected one."""
+    detected, confidence = detection(doc)
+    if not language_detect.is_mismatch(language, detected, confidence):
+        return None
+    return {"detected_language": detected, "confidence": confidence}
+
+
+def python_functions(doc) -> list:
+    """Names of the functions defined in Python code, in source order.
+
+    Taken from the AST so commented-out or quoted defs are ignored; code that
+    does not parse falls back to a regex scan.
+    """
+    tree = doc.python_ast
+    if tree is None:
+        return [name for name, _params in re.findall(r'def\s+(\w+)\s*\(([^)]*)\)', doc.code)]
+    defs = [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    return [node.name for node in sorted(defs, key=lambda node: (node.lineno, node.col_offset))]
+
+
+def generate_test_cases(code: str, language: str) -> list:
+    """Generate test cases based on code analysis"""
+    test_cases = []
+    
+    # Extract function/method names
+    if language.lower() == "python":
+        for func_name in get_document(code).derive("python_functions", python_functions):
+            test_cases.append({
+                "test_name": f"test_{func_name}_basic",
+                "description": f"Test basic functionality of {func_name}",
+                "code": f"def test_{func_name}_basic():\n    result = {func_name}()\n    assert result is not None"
+            })
+            test_cases.append({
+                "test_name": f"test_{func_name}_edge_case",
+                "description": f"Test edge cases for {func_name}",
+                "code": f"def test_{func_name}_edge_case():\n    # Test with edge case values\n    pass"
+            })
+    
+    elif language.lower() == "java":
+        methods = re.findall(r'public\s+\w+\s+(\w+)\s*\(([^)]*)\)', code)
+        for method_name, params in methods:
+            test_cases.append({
+                "test_name": f"test{method_name.capitalize()}Basic",
+                "description": f"Test basic functionality of {method_name}",
+                "code": f"@Test\npublic void test{method_name.capitalize()}Basic() {{\n    // Arrange\n    // Act\n    // Assert\n    assertNotNull(result);\n}}"
+            })
+            test_cases.append({
+                "test_name": f"test{method_name.capitalize()}NullInput",
+                "description": f"Test {method_name} with null input",
+                "code": f"@Test\npublic void test{method_name.capitalize()}NullInput() {{\n    // Test null handling\n}}"
+            })
+    
+    elif language.lower() == "c#":
+        methods = re.findall(r'public\s+\w+\s+(\w+)\s*\(([^)]*)\)', code)
+        for method_name, params in methods:
+            test_cases.append({
+                "test_name": f"Test{method_name}Basic",
+                "description": f"Test basic functionality of {method_name}",
+                "code": f"[Test]\npublic void Test{method_name}Basic() {{\n    // Arrange\n    // Act\n    // Assert\n    Assert.IsNotNull(result);\n}}"
+            })
+    
+    elif language.lower() == "javascript":
+        functions = re.findall(r'function\s+(\w+)\s*\(([^)]*)\)', code)
+        for func_name, params in functions:
+            test_cases.append({
+                "test_name": f"test_{func_name}_basic",
+                "description": f"Test basic functionality of {func_name}",
+                "code": f"test('{func_name} basic test', () => {{\n    const result = {func_name}();\n    expect(result).toBeDefined();\n}});"
+            })
+    
+    # Add generic test cases if none found
+    if not test_cases:
+        test_cases = [
+            {
+                "test_name": "test_basic_functionality",
+                "description": "Test basic code functionality",
+                "code": "// Add your test implementation here"
+            },
+            {
+                "test_name": "test_edge_cases",
+                "description": "Test edge cases and boundary conditions",
+                "code": "// Test with edge case values"
+            },
+            {
+                "test_name": "test_error_handling",
+                "description": "Test error handling and exceptions",
+                "code": "// Test error scenarios"
+            }
+        ]
+    
+    return test_cases
+
+
+def generate_tests(code: str, language: str) -> dict:
+    if not code or not code.strip():
+        return {"status": "error", "message": "Code cannot be empty"}
+    
+    # Detect language mismatch
+    doc = get_document(code)
+    mismatch = language_mismatch(doc, language)
+    if mismatch:
+        return {
+            "status": "warning",
+            "message": f"Language mismatch! Selected: {language}, Detected: {mismatch['detected_language'].upper()} "
+                       f"({mismatch['confidence']:.0%} confidence)",
+            **mismatch
+        }
+    
+    test_cases = generate_test_cases(code, language)
+    
+    result = {
+        "status": "success",
+        "language": language,
+        "test_cases": test_cases,
+        "total_tests": len(test_cases)
+    }
+    
+    return result
+
+
+def debug(code: str, error: str, language: str) -> dict:
+    # Validate inputs
+    if not code or not code.strip():
+        return {"status": "error", "message": "Code cannot be empty"}
+    
+    # Detect language mismatch
+    doc = get_document(code)
+    mismatch = language_mismatch(doc, language)
+    if mismatch:
+        return {
+            "status": "warning",
+            "message": f"Language mismatch detected! Selected: {language}, Detected: {mismatch['detected_language'].upper()} "
+                       f"({mismatch['confidence']:.0%} confidence)",
+            **mismatch
+        }
+    
+    # Analyze the code and error message
+    code_lines = doc.lines
+    total_lines = len(code_lines)
+    issues = []
+    suggested_fixes = []
+    explanations = []
+    
+    # Count total brackets
+    total_open = doc.open_brackets
+    total_close = doc.close_brackets
+    
+    # Check for bracket mismatch
+    if abs(total_open - total_close) > 0:
+        issues.append({
+            "type": "Syntax Error",
+            "line": "Multiple lines",
+            "message": f"Bracket mismatch: {total_open} opening vs {total_close} closing brackets",
+            "severity": "High"
+        })
+        suggested_fixes.append({
+            "issue": "Unmatched Brackets",
+            "fix_code": "// Check your code for:\n// - Missing closing brackets }\n// - Missing closing parentheses )\n// - Extra opening brackets {",
+            "explanation": "Count and match all opening and closing brackets throughout your code"
+        })
+        explanations.append("Bracket mismatch detected - ensure all brackets are properly paired")
+    
+    # Analyze code line by line
+    for i, line in enumerate(code_lines, 1):
+        line_stripped = line.strip()
+        
+        # Skip empty lines and comments
+        if not line_stripped or line_stripped.startswith('//') or line_stripped.startswith('/*'):
+            continue
+        
+        # Check for null/undefined access
+        if '.close()' in line_stripped or '.Close()' in line_stripped:
+            if 'if' not in line_stripped and 'null' not in line_stripped:
+                issues.append({
+                    "type": "Potential Null Reference",
+                    "line": i,
+                    "message": f"Calling .close() without null check at line {i}",
+                    "severity": "High"
+                })
+                suggested_fixes.append({
+                    "issue": f"Null Reference at Line {i}",
+                    "fix_code": f"if (input != null) {{\n    input.Close();\n}}",
+                    "explanation": "Always check if object is null before calling methods on it"
+                })
+                explanations.append(f"Line {i}: Add null check before calling .Close() to prevent NullReferenceException")
+        
+        # Check for potential division by zero
+        if '/' in line_stripped and any(var in line_stripped for var in ['num', 'value', 'input']):
+            issues.append({
+                "type": "Potential Division by Zero",
+                "line": i,
+                "message": f"Division operation without zero check at line {i}",
+                "severity": "Medium"
+            })
+            suggested_fixes.append({
+                "issue": f"Division by Zero Risk at Line {i}",
+                "fix_code": f"if (divisor != 0) {{\n    result = numerator / divisor;\n}} else {{\n    Console.WriteLine(\"Error: Cannot divide by zero\");\n}}",
+                "explanation": "Always check if divisor is zero before performing division"
+            })
+            explanations.append(f"Line {i}: Add zero check before division to prevent runtime error")
+    
+    # Analyze error message if provided
+    if error and error.strip():
+        error_msg = error
+        
+        # Extract line number from error
+        line_match = re.search(r'line (\d+)', error_msg, re.IGNORECASE)
+        error_line = int(line_match.group(1)) if line_match else 0
+        
+        if "NullPointerException" in error_msg or "NullReferenceException" in error_msg:
+            issues.append({
+                "type": "Null Reference Error",
+                "line": error_line,
+                "message": "Attempting to access member of null object",
+                "severity": "High"
+            })
+            suggested_fixes.append({
+                "issue": f"Null Reference Error at Line {error_line}",
+                "fix_code": f"if (obj != null) {{\n    // Your code here\n    obj.Method();\n}} else {{\n    Console.WriteLine(\"Object is null\");\n}}",
+                "explanation": "Check if object is null before accessing its members"
+            })
+            explanations.append(f"Line {error_line}: Object is null - add null check before accessing")
+        
+        elif "IndexOutOfBounds" in error_msg or "IndexError" in error_msg or "ArgumentOutOfRange" in error_msg:
+            issues.append({
+                "type": "Index Out of Bounds",
+                "line": error_line,
+                "message": "Array/List index is out of valid range",
+                "severity": "High"
+            })
+            suggested_fixes.append({
+                "issue": f"Index Out of Bounds at Line {error_line}",
+                "fix_code": f"if (index >= 0 && index < array.Length) {{\n    var item = array[index];\n}} else {{\n    Console.WriteLine(\"Index out of range\");\n}}",
+                "explanation": "Verify index is within valid range before accessing array/list"
+            })
+            explanations.append(f"Line {error_line}: Index out of bounds - check array length before accessing")
+        
+        elif "FormatException" in error_msg or "NumberFormat" in error_msg:
+            issues.append({
+                "type": "Format Exception",
+                "line": error_line,
+                "message": "Invalid format for type conversion",
+                "severity": "High"
+            })
+            suggested_fixes.append({
+                "issue": f"Format Exception at Line {error_line}",
+                "fix_code": f"if (int.TryParse(input, out int result)) {{\n    // Use result\n}} else {{\n    Console.WriteLine(\"Invalid number format\");\n}}",
+                "explanation": "Use TryParse instead of Parse to handle invalid input gracefully"
+            })
+            explanations.append(f"Line {error_line}: Invalid input format - use TryParse for safe conversion")
+        
+        elif "DivideByZero" in error_msg:
+            issues.append({
+                "type": "Division by Zero",
+                "line": error_line,
+                "message": "Attempted to divide by zero",
+                "severity": "High"
+            })
+            suggested_fixes.append({
+                "issue": f"Division by Zero at Line {error_line}",
+                "fix_code": f"if (divisor != 0) {{\n    result = numerator / divisor;\n}} else {{\n    Console.WriteLine(\"Cannot divide by zero\");\n}}",
+                "explanation": "Check if divisor is zero before division"
+            })
+            explanations.append(f"Line {error_line}: Division by zero - add check before operation")
+    
+    # If no issues found
+    if not issues:
+        issues.append({
+            "type": "No Issues Found",
+            "line": 0,
+            "message": "Code appears syntactically correct",
+            "severity": "Low"
+        })
+        explanations.append("No critical issues detected - code looks good")
+    
+    bugs_found = len(issues)
+    primary_issue = issues[0] if issues else {"type": "Unknown", "line": 0}
+    
+    result = {
+        "status": "success",
+        "language": language,
+        "issue": primary_issue["type"],
+        "error_line": primary_issue.get("line", 0),
+        "severity": primary_issue.get("severity", "Low"),
+        "suggestion": primary_issue.get("message", ""),
+        "code_lines": total_lines,
+        "bugs_found": bugs_found,
+        "all_issues": issues,
+        "suggested_fixes": suggested_fixes,
+        "explanations": explanations
+    }
+    
+    return result
+
+
+def review(code: str, language: str) -> dict:
+    if not code or not code.strip():
+        return {"status": "error", "message": "Code cannot be empty"}
+    
+    # Detect language mismatch
+    doc = get_document(code)
+    mismatch = language_mismatch(doc, language)
+    if mismatch:
+        return {
+            "status": "warning",
+            "message": f"Language mismatch! Selected: {language}, Detected: {mismatch['detected_language'].upper()} "
+                       f"({mismatch['confidence']:.0%} confidence). Please select the correct language.",
+            **mismatch
+        }
+    
+    code_lines = doc.lines
+    total_lines = len(code_lines)
+    findings = []
+    quality_score = 90  # Start with good score
+    security_issues = 0
+    syntax_errors = 0
+    
+    # Count total brackets for validation
+    total_open = doc.open_brackets
+    total_close = doc.close_brackets
+    
+    # Only flag if there's a significant mismatch in the entire code
+    if abs(total_open - total_close) > 2:
+        findings.append({"type": "error", "line": 0, "message": f"Bracket mismatch in code: {total_open} opening vs {total_close} closing"})
+        quality_score -= 20
+        syntax_errors += 1
+    
+    # Line rules (see review_rules) in one pass over the code
+    for line_no, rule in doc.derive("review_rules", review_rules.scan_document):
+        findings.append({"type": rule.type, "line": line_no, "message": rule.message})
+        quality_score -= rule.penalty
+        if rule.security:
+            security_issues += 1
+    
+    # Generate suggested fixes based on findings
+    suggested_fixes = []
+    explanation = []
+    
+    for finding in findings:
+        if "try-catch" in finding['message'].lower():
+            suggested_fixes.append({
+                "issue": "Missing error handling",
+                "line": finding['line'],
+                "fix_code": "try {\n    // Your parse code here\n} catch (Exception e) {\n    Console.WriteLine(\"Invalid input: \" + e.Message);\n}",
+                "explanation": "Wrap parse operations in try-catch to handle invalid user input gracefully"
+            })
+            explanation.append(f"Line {finding['line']}: Add try-catch block to prevent crashes from invalid input")
+        
+        elif "division by zero" in finding['message'].lower():
+            suggested_fixes.append({
+                "issue": "Division by zero risk",
+                "line": finding['line'],
+                "fix_code": "if (num2 != 0) {\n    res = num1 / num2;\n    Console.WriteLine(\"Division: \" + res);\n} else {\n    Console.WriteLine(\"Error: Cannot divide by zero!\");\n}",
+                "explanation": "Check if divisor is zero before performing division"
+            })
+            explanation.append(f"Line {finding['line']}: Add zero check before division to prevent runtime error")
+        
+        elif "hardcoded password" in finding['message'].lower():
+            suggested_fixes.append({
+                "issue": "Security vulnerability",
+                "line": finding['line'],
+                "fix_code": "// Use environment variables or secure configuration\nstring password = Environment.GetEnvironmentVariable(\"DB_PASSWORD\");",
+                "explanation": "Never hardcode passwords - use environment variables or secure vaults"
+            })
+            explanation.append(f"Line {finding['line']}: Remove hardcoded password - critical security risk")
+        
+        elif "sql injection" in finding['message'].lower():
+            suggested_fixes.append({
+                "issue": "SQL Injection vulnerability",
+                "line": finding['line'],
+                "fix_code": "// Use parameterized queries\nstring query = \"SELECT * FROM users WHERE id = @userId\";\ncommand.Parameters.AddWithValue(\"@userId\", userId);",
+                "explanation": "Use parameterized queries to prevent SQL injection attacks"
+            })
+            explanation.append(f"Line {finding['line']}: SQL injection risk - use parameterized queries")
+        
+        elif "bracket" in finding['message'].lower():
+            suggested_fixes.append({
+                "issue": "Syntax error - bracket mismatch",
+                "line": finding['line'],
+                "fix_code": "// Check your code for:\n// - Missing closing brackets }\n// - Missing closing parentheses )\n// - Unclosed string literals",
+                "explanation": "Review code structure to ensure all brackets are properly matched"
+            })
+            explanation.append(f"Line {finding['line']}: Bracket mismatch detected - check code structure")
+    
+    # Add positive findings if code is good
+    if not findings:
+        findings.append({"type": "info", "line": 0, "message": "Code looks good! No major issues detected."})
+        explanation.append("Code follows best practices and has no major issues")
+    
+    # Ensure quality score is reasonable
+    quality_score = max(0, min(100, quality_score))
+    
+    # Adjust performance rating based on quality score and issues
+    if syntax_errors > 5:
+        performance = "Poor"
+    elif security_issues > 2:
+        performance = "Fair"
+    elif quality_score >= 85:
+        performance = "Excellent"
+    elif quality_score >= 70:
+        performance = "Good"
+    elif quality_score >= 50:
+        performance = "Fair"
+    else:
+        performance = "Needs Improvement"
+    
+    # Count total issues
+    total_issues = len([f for f in findings if f['type'] in ['error', 'warning']])
+    
+    result = {
+        "status": "success",
+        "language": language,
+        "quality_score": quality_score,
+        "security_issues": security_issues,
+        "syntax_errors": syntax_errors,
+        "performance": performance,
+        "total_lines": total_lines,
+        "total_issues": total_issues,
+        "findings": findings if findings else [{"type": "info", "line": 0, "message": "No issues found - code looks good!"}],
+        "suggested_fixes": suggested_fixes,
+        "explanation": explanation
+    }
+    
+    return result
+
+
+def refactor(code: str, language: str) -> dict:
+    if not code or not code.strip():
+        return {"status": "error", "message": "Code cannot be empty"}
+    
+    # Detect language mismatch
+    doc = get_document(code)
+    mismatch = language_mismatch(doc, language)
+    if mismatch:
+        return {
+            "status": "warning",
+            "message": f"Language mismatch! Selected: {language}, Detected: {mismatch['detected_language'].upper()} "
+                       f"({mismatch['confidence']:.0%} confidence)",
+            **mismatch
+        }
+    
+    refactored = code
+    improvements = []
+    changes_made = False
+    
+    # Python-specific refactoring
+    if language.lower() == "python":
+        # Range-len pattern
+        if "range(len(" in code:
+            pattern = r'for\s+(\w+)\s+in\s+range\(len\((\w+)\)\):\s*\n\s+(\w+)\[(\w+)\]'
+            match = re.search(pattern, code)
+            if match:
+                var_name = match.group(2)
+                refactored = re.sub(pattern, f'for item in {var_name}:\n    item', refactored)
+                improvements.append("Changed range(len()) to direct iteration")
+                changes_made = True
+        
+        # None comparison
+        if "!= None" in code:
+            refactored = refactored.replace("!= None", "is not None")
+            improvements.append("Changed '!= None' to 'is not None'")
+            changes_made = True
+        
+        if "== None" in code:
+            refactored = refactored.replace("== None", "is None")
+            improvements.append("Changed '== None' to 'is None'")
+            changes_made = True
+    
+    # Java-specific refactoring
+    elif language.lower() == "java":
+        # Traditional for-loop to enhanced for-loop
+        if "for (int i = 0; i <" in code and "[i]" in code:
+            pattern = r'for\s*\(int\s+i\s*=\s*0;\s*i\s*<\s*(\w+)\.length;\s*i\+\+\)\s*\{([^}]+)\[i\]'
+            match = re.search(pattern, code)
+            if match:
+                array_name = match.group(1)
+                refactored = re.sub(
+                    r'for\s*\(int\s+i\s*=\s*0;\s*i\s*<\s*\w+\.length;\s*i\+\+\)',
+                    f'for (var item : {array_name})',
+                    refactored
+                )
+                refactored = re.sub(r'\w+\[i\]', 'item', refactored)
+                improvements.append("Converted to enhanced for-loop")
+                changes_made = True
+        
+        # StringBuffer to StringBuilder
+        if "StringBuffer" in code:
+            refactored = refactored.replace("StringBuffer", "StringBuilder")
+            improvements.append("Changed StringBuffer to StringBuilder for better performance")
+            changes_made = True
+    
+    # C#-specific refactoring
+    elif language.lower() == "c#":
+        # ArrayList to List<T>
+        if "ArrayList" in code:
+            refactored = refactored.replace("ArrayList", "List<object>")
+            improvements.append("Changed ArrayList to List<T>")
+            changes_made = True
+        
+        # Traditional for to foreach
+        if "for (int i = 0;" in code and "[i]" in code:
+            improvements.append("Consider using foreach for collection iteration")
+    
+    # JavaScript-specific refactoring
+    elif language.lower() == "javascript":
+        # var to const/let
+        if "var " in code:
+            # Simple heuristic: if variable is reassigned, use let, otherwise const
+            refactored = refactored.replace("var ", "let ")
+            improvements.append("Changed 'var' to 'let' for block scoping")
+            changes_made = True
+        
+        # Traditional function to arrow function
+        if "function(" in code:
+            improvements.append("Consider using arrow functions for conciseness")
+    
+    # General refactoring
+    lines = doc.lines
+    
+    # Long function detection
+    if len(lines) > 50:
+        improvements.append("Function is long (>50 lines) - consider breaking into smaller functions")
+    
+    # Nested loops
+    for_count = code.count('for ')
+    if for_count > 2:
+        improvements.append(f"Multiple nested loops detected - consider optimizing algorithm")
+    
+    # Magic numbers
+    numbers = re.findall(r'\b\d{2,}\b', code)
+    if len(numbers) > 3:
+        improvements.append("Consider extracting magic numbers to named constants")
+    
+    # Add general suggestions if no specific changes
+    if not improvements:
+        improvements = [
+            "Code structure looks good",
+            "Consider adding inline comments for complex logic",
+            "Ensure proper error handling is in place"
+        ]
+    
+    result = {
+        "status": "success",
+        "language": language,
+        "original": code,
+        "refactored": refactored,
+        "improvements": improvements,
+        "changes_made": changes_made,
+        "lines_reduced": max(0, len(doc.lines) - len(refactored.split('\n')))
+    }
+    
+    return result
+
+
+def analyze_logs(logs: str, bucket_seconds: int = 60) -> dict:
+    if not logs or not logs.strip():
+        return {"status": "error", "message": "Logs cannot be empty"}
+    return log_analyzer.analyze_text(logs, bucket_seconds)
@@ -0,0 +1,165 @@
+"""Batch analysis of many documents on a process pool.
+
+The /<endpoint>/batch routes hand their items to analyze_batch(), which
+answers what it can from the result cache and splits the rest into chunks for
+a pool of spawned processes, keeping the CPU work off the event loop and off
+the GIL. Results come back per item as chunks finish. An analyzer exception
+fails only its own item. If a worker process dies, the pool is rebuilt and
+the affected items are retried one by one, so a single poison document cannot
+fail its whole chunk.
+"""
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from . import analyzers, metrics
+from .result_cache import cache_key, result_cache
+
+# 0 runs batches on the default thread pool instead (no extra processes)
+PROCESSES = int(os.environ.get("TESTSIGHT_ANALYSIS_PROCESSES", str(os.cpu_count() or 2)))
+MAX_ITEMS = int(os.environ.get("TESTSIGHT_BATCH_MAX_ITEMS", "5000"))
+MAX_CHUNK = 32
+
+ANALYZERS = {
+    "review": analyzers.review,
+    "debug": analyzers.debug,
+    "refactor": analyzers.refactor,
+    "generate-tests": analyzers.generate_tests,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def run_chunk(endpoint: str, items: list) -> list:
+    """Runs in a pool process: [(ok, result or error message, seconds)] for each params dict."""
+    fn = ANALYZERS[endpoint]
+    outcomes = []
+    for params in items:
+        start = time.perf_counter()
+        try:
+            outcomes.append((True, fn(**params), time.perf_counter() - start))
+        except Exception as e:
+            outcomes.append((False, f"{type(e).__name__}: {e}", time.perf_counter() - start))
+    return outcomes
+
+
+def chunk_size(count: int, processes: int) -> int:
+    # About four chunks per process balances uneven documents against IPC overhead
+    return max(1, min(MAX_CHUNK, math.ceil(count / (max(processes, 1) * 4))))
+
+
+class AnalysisPool:
+    def __init__(self, processes: int = PROCESSES):
+        self.processes = processes
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, endpoint: str, items: list):
+        """Schedule run_chunk; returns (awaitable outcomes, executor it runs on)."""
+        return self.call(run_chunk, endpoint, items)
+
+    def call(self, fn, *args):
+        """Schedule fn(*args), a picklable module-level function; returns (awaitable, executor)."""
+        if self.processes <= 0:
+            return asyncio.get_running_loop().run_in_executor(None, fn, *args), None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            executor = self._executor
+        return asyncio.wrap_future(executor.submit(fn, *args)), executor
+
+    async def map(self, fn, args_iter):
+        """Yield fn(*args) for each args tuple in order, with at most 2 * processes calls in flight.
+
+        args_iter is advanced on a worker thread, so it may read files.
+        """
+        loop = asyncio.get_running_loop()
+        args_iter = iter(args_iter)
+        pending = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < 2 * max(self.processes, 1):
+                    args = await loop.run_in_executor(None, next, args_iter, None)
+                    if args is None:
+                        exhausted = True
+                    else:
+                        pending.append(self.call(fn, *args)[0])
+                if not pending:
+                    return
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def discard(self, executor):
+        """Replace a broken executor (once, however many futures report it)."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+pool = AnalysisPool()
+
+
+async def analyze_batch(endpoint: str, items: list):
+    """Yield (index, ok, result or error) for each params dict in items, in completion order."""
+    misses = []
+    for index, params in enumerate(items):
+        cached = await result_cache.get_async(cache_key(endpoint, params))
+        if cached is not None:
+            yield index, True, cached
+        else:
+            misses.append((index, params))
+
+    tasks = {}
+
+    def schedule(chunk, retried=False):
+        future, executor = pool.submit(endpoint, [params for _, params in chunk])
+        tasks[future] = (chunk, retried, executor)
+
+    size = chunk_size(len(misses), pool.processes)
+    for start in range(0, len(misses), size):
+        schedule(misses[start:start + size])
+    try:
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                chunk, retried, executor = tasks.pop(future)
+                try:
+                    outcomes = future.result()
+                except BrokenProcessPool:
+                    pool.discard(executor)
+                    if not retried:
+                        logger.warning("Analysis worker died; retrying %d %s items one by one", len(chunk), endpoint)
+                        for item in chunk:
+                            schedule([item], retried=True)
+                        continue
+                    outcomes = [(False, "analysis worker process died", None)] * len(chunk)
+                except Exception as e:
+                    outcomes = [(False, f"{type(e).__name__}: {e}", None)] * len(chunk)
+                for (index, params), (ok, value, seconds) in zip(chunk, outcomes):
+                    if seconds is not None:
+                        metrics.ANALYZER_LATENCY.observe(seconds, (endpoint, "batch"))
+                    if ok:
+                        await result_cache.put_async(cache_key(endpoint, params), value)
+                    yield index, ok, value
+    finally:
+        # Client went away: drop work that has not started yet
+        for future in tasks:
+            future.cancel()
@@ -0,0 +1,165 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from . import metrics
+from .db import connect
+
+logger = logging.getLogger(__name__)
+
+_FLUSH = object()
+_STOP = object()
+
+
+class BatchWriter:
+    """Write-behind inserter: a bounded queue drained by one background thread.
+
+    submit() never touches the database; the writer thread groups whatever is
+    queued into one executemany() + COMMIT every flush_interval seconds or
+    batch_size rows, whichever comes first. When the queue is full new rows
+    are dropped and counted rather than stalling the caller (unless submitted
+    with block=True). The thread is started lazily (and restarted after a
+    fork) and drains on stop()/exit.
+    """
+
+    def __init__(self, path: str, sql: str, max_queue: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 0.05, synchronous: str = "NORMAL", name: str = "rows"):
+        self.path = path
+        self.sql = sql
+        self.name = name
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.synchronous = synchronous
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_error = None
+
+    def submit(self, row: tuple, block: bool = False) -> bool:
+        """Queue row for writing; with block=True wait for space instead of dropping."""
+        self._ensure_started()
+        if block:
+            self._queue.put(row)
+            return True
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            metrics.DB_WRITE_ROWS.inc((self.name, "dropped"))
+            return False
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every row submitted before this call has been committed."""
+        if self._thread is None or self._pid != os.getpid():
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def stop(self, timeout: float | None = 10.0):
+        with self._lock:
+            thread = self._thread
+            if thread is None or self._pid != os.getpid():
+                return
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self.max_queue,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_error": self.last_error,
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Inherited state from the parent process is meaningless here
+                self._lock = threading.Lock()
+                self._reset()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="batch-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _run(self):
+        conn = connect(self.path, synchronous=self.synchronous)
+        try:
+            while True:
+                item = self._queue.get()
+                batch = []
+                waiters = []
+                stopping = False
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                    elif isinstance(item, tuple) and item and item[0] is _FLUSH:
+                        waiters.append(item[1])
+                    else:
+                        batch.append(item)
+                    if stopping or waiters or len(batch) >= self.batch_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if stopping:
+                    # Drain whatever arrived before the stop request
+                    while True:
+                        try:
+                            item = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if isinstance(item, tuple) and item and item[0] is _FLUSH:
+                            waiters.append(item[1])
+                        elif item is not _STOP:
+                            batch.append(item)
+                self._write(conn, batch)
+                for waiter in waiters:
+                    waiter.set()
+                if stopping:
+                    return
+        finally:
+            conn.close()
+
+    def _write(self, conn, batch):
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            with conn:
+                conn.executemany(self.sql, batch)
+            self.written += len(batch)
+            self.batches += 1
+            metrics.DB_WRITE_LATENCY.observe(time.perf_counter() - start, (self.name,))
+            metrics.DB_WRITE_ROWS.inc((self.name, "written"), len(batch))
+        except sqlite3.Error as e:
+            metrics.DB_WRITE_ROWS.inc((self.name, "failed"), len(batch))
+            self.failed += len(batch)
+            self.last_error = str(e)
+            logger.error("BatchWriter dropped %d rows: %s", len(batch), e)
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+import threading
+
+# Connection tuning, overridable per deployment
+SYNCHRONOUS = os.environ.get("TESTSIGHT_DB_SYNCHRONOUS", "NORMAL").upper()
+CACHE_SIZE_KB = int(os.environ.get("TESTSIGHT_DB_CACHE_KB", "16384"))
+MMAP_SIZE = int(os.environ.get("TESTSIGHT_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+STATEMENT_CACHE = int(os.environ.get("TESTSIGHT_DB_STATEMENT_CACHE", "256"))
+BUSY_TIMEOUT = float(os.environ.get("TESTSIGHT_DB_BUSY_TIMEOUT", "30"))
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+def connect(path: str, synchronous: str = SYNCHRONOUS) -> sqlite3.Connection:
+    """Open a new tuned connection (WAL journal, larger page cache, mmap I/O)."""
+    if synchronous not in SYNCHRONOUS_MODES:
+        raise ValueError(f"Invalid synchronous mode '{synchronous}', expected one of {SYNCHRONOUS_MODES}")
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+class ConnectionPool:
+    """Keeps one long-lived connection per thread.
+
+    SQLite connections are cheap to share within a thread but not across
+    threads, so each thread lazily opens its own connection and reuses it for
+    every call; the statement cache on that connection then gives us prepared
+    statement reuse for free. Connections owned by threads that have exited are
+    closed the next time a new one is opened, and everything is reset after a
+    fork so worker processes never inherit the parent's handles.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns = {}
+        self._pid = os.getpid()
+
+    def get(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.path)
+            self._local.conn = conn
+            with self._lock:
+                self._prune()
+                self._conns[threading.current_thread()] = conn
+        return conn
+
+    def close_all(self):
+        with self._lock:
+            conns, self._conns = self._conns, {}
+        for conn in conns.values():
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._conns)
+
+    def _prune(self):
+        for thread in [t for t in self._conns if not t.is_alive()]:
+            try:
+                self._conns.pop(thread).close()
+            except sqlite3.Error:
+                pass
+
+    def _reset_after_fork(self):
+        # The parent's connections must not be used (or closed) in the child
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._conns = {}
+        self._local = threading.local()
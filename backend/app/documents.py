@@ -0,0 +1,148 @@
+"""Parsed code documents shared by all analyzers, cached by content hash.
+
+The UI tends to send one snippet to several tools in a row (generate tests,
+then review, then refactor), and every analyzer needs the same basics: the
+line split, a lower-cased copy, bracket counts, the detected language and,
+for Python, the AST. A ParsedDocument computes each of these once, lazily,
+and DocumentCache keeps recent documents in an LRU bounded by an estimate of
+the bytes they hold, so a snippet is parsed once however many tools look at it.
+"""
+import ast
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+MAX_BYTES = int(os.environ.get("TESTSIGHT_DOC_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+# Measured with tracemalloc on CPython 3.11 sources
+AST_BYTES_PER_CHAR = 35
+
+def content_key(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def approx_size(value) -> int:
+    """Rough in-memory size of a derived value (strings and nested containers)."""
+    if isinstance(value, str):
+        return 49 + len(value)
+    if isinstance(value, (list, tuple, set)):
+        return 56 + 8 * len(value) + sum(approx_size(v) for v in value)
+    if isinstance(value, dict):
+        return 64 + 24 * len(value) + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class ParsedDocument:
+    def __init__(self, code: str, key: str | None = None):
+        self.code = code
+        self.key = key or content_key(code)
+        self.lines = code.split("\n")
+        self.lower = code.lower()
+        self.open_brackets = code.count('(') + code.count('{') + code.count('[')
+        self.close_brackets = code.count(')') + code.count('}') + code.count(']')
+        self.nbytes = 2 * len(code) + 57 * len(self.lines) + 49 * 3
+        self._derived = {}
+        self._cache = None
+
+    def derive(self, name: str, fn, size=None):
+        """fn(doc) computed once per document; size(value) estimates its bytes (default approx_size)."""
+        try:
+            return self._derived[name]
+        except KeyError:
+            pass
+        value = fn(self)
+        if name not in self._derived:
+            self._derived[name] = value
+            self._grow((size or approx_size)(value))
+        return self._derived[name]
+
+    @property
+    def python_ast(self):
+        """ast.Module, or None when the code is not valid Python."""
+        return self.derive("python_ast", _parse_python, size=lambda tree: AST_BYTES_PER_CHAR * len(self.code))
+
+    def _grow(self, nbytes: int):
+        self.nbytes += nbytes
+        if self._cache is not None:
+            self._cache._resized(self, nbytes)
+
+
+def _parse_python(doc):
+    try:
+        return ast.parse(doc.code)
+    except (SyntaxError, ValueError):
+        return None
+
+
+class DocumentCache:
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, code: str) -> ParsedDocument:
+        key = content_key(code)
+        with self._lock:
+            doc = self._entries.get(key)
+            if doc is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return doc
+            self.misses += 1
+        doc = ParsedDocument(code, key)
+        if doc.nbytes > self.max_bytes:
+            return doc
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another request parsed the same code meanwhile
+                return existing
+            doc._cache = self
+            self._entries[key] = doc
+            self.bytes += doc.nbytes
+            self._evict()
+        return doc
+
+    def _resized(self, doc: ParsedDocument, delta: int):
+        with self._lock:
+            if self._entries.get(doc.key) is doc:
+                self.bytes += delta
+                self._evict()
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._entries:
+            _, doc = self._entries.popitem(last=False)
+            doc._cache = None
+            self.bytes -= doc.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            for doc in self._entries.values():
+                doc._cache = None
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+document_cache = DocumentCache()
+
+
+def get_document(code: str) -> ParsedDocument:
+    return document_cache.get(code)
@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+import zlib
+
+EXPORT_FIELDS = ["id", "activity_type", "language", "input_data", "output_data", "status", "created_at", "user_id"]
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def ndjson_chunks(batches):
+    for batch in batches:
+        yield "".join(json.dumps(row) + "\n" for row in batch)
+
+
+def csv_chunks(batches):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    yield buf.getvalue()
+    for batch in batches:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(batch)
+        yield buf.getvalue()
+
+
+def json_chunks(batches):
+    """Stream the legacy {"status", "data", "count"} document one batch at a time."""
+    yield '{"status": "success", "data": ['
+    count = 0
+    for batch in batches:
+        prefix = ", " if count else ""
+        yield prefix + ", ".join(json.dumps(row) for row in batch)
+        count += len(batch)
+    yield f'], "count": {count}}}'
+
+
+ENCODERS = {
+    "json": json_chunks,
+    "ndjson": ndjson_chunks,
+    "csv": csv_chunks,
+}
+
+
+def gzip_chunks(chunks):
+    """Incrementally gzip a stream of text chunks."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
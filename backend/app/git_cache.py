@@ -0,0 +1,221 @@
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Paths kept by sparse checkouts: Python sources plus what pytest needs to run
+SPARSE_PATTERNS = [
+    "*.py",
+    "*.pyi",
+    "*.cfg",
+    "*.ini",
+    "*.toml",
+    "requirements*.txt",
+    "/.kiro/",
+]
+
+
+def git(*args, cwd: str | None = None) -> str:
+    out = subprocess.run(["git", *args], cwd=cwd, check=True, text=True,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return out.stdout.strip()
+
+
+def head_sha(path: str) -> str | None:
+    """Commit checked out in path, or None when it is not a git work tree."""
+    try:
+        return git("rev-parse", "HEAD", cwd=path)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """Exclusive inter-process lock on path (created if needed)."""
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class GitCache:
+    """Bare mirrors of remote repositories plus cheap per-job workspaces.
+
+    Each URL is cloned once with --mirror and afterwards only fetched
+    incrementally. Jobs get a `clone --shared` of the mirror (objects are
+    borrowed through alternates, nothing is copied) checked out at the
+    requested commit, optionally sparse so only Python-related paths hit the
+    disk, and release() removes it when the job ends. A workspace older than
+    stale_age was left behind by a killed worker and is removed as well.
+    Mirrors are evicted least-recently-used first once their sizes, recorded
+    next to them after every fetch, add up to more than max_bytes; mirrors
+    used within min_age seconds or with a workspace checked out are never
+    evicted.
+    """
+
+    def __init__(self, root: str, max_bytes: int, min_age: float = 3600, stale_age: float = 86400):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        self.stale_age = stale_age
+        self.mirrors_dir = os.path.join(root, "mirrors")
+        self.workspaces_dir = os.path.join(root, "workspaces")
+        os.makedirs(self.mirrors_dir, exist_ok=True)
+        os.makedirs(self.workspaces_dir, exist_ok=True)
+
+    def key(self, url: str) -> str:
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", url.rstrip("/").rsplit("/", 1)[-1])
+        name = name[:-4] if name.endswith(".git") else name
+        return f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}-{name[:40]}"
+
+    def mirror_path(self, url: str) -> str:
+        return os.path.join(self.mirrors_dir, self.key(url) + ".git")
+
+    def update_mirror(self, url: str) -> str:
+        """Create or incrementally fetch the bare mirror for url."""
+        path = self.mirror_path(url)
+        with file_lock(path + ".lock"):
+            if os.path.isdir(path):
+                git("--git-dir", path, "fetch", "--prune", "--quiet", "origin")
+            else:
+                tmp = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+                try:
+                    git("clone", "--mirror", "--quiet", "--", url, tmp)
+                    # Workspaces borrow objects from the mirror, so never let gc prune them
+                    git("--git-dir", tmp, "config", "gc.auto", "0")
+                    os.replace(tmp, path)
+                finally:
+                    shutil.rmtree(tmp, ignore_errors=True)
+            self.record_size(path)
+            self.touch(path)
+        return path
+
+    def checkout(self, url: str, ref: str | None = None, sparse: bool = False):
+        """Return (workspace_path, commit_sha) for url at ref (default HEAD)."""
+        mirror = self.update_mirror(url)
+        sha = git("--git-dir", mirror, "rev-parse", "--verify", f"{ref or 'HEAD'}^{{commit}}")
+        workspace = os.path.join(self.workspaces_dir, f"{self.key(url)}-{sha[:12]}-{uuid.uuid4().hex[:8]}")
+        try:
+            git("clone", "--shared", "--no-checkout", "--quiet", "--", mirror, workspace)
+            if sparse:
+                git("sparse-checkout", "set", "--no-cone", *SPARSE_PATTERNS, cwd=workspace)
+            git("checkout", "--detach", "--quiet", sha, cwd=workspace)
+        except Exception:
+            shutil.rmtree(workspace, ignore_errors=True)
+            raise
+        return workspace, sha
+
+    def release(self, workspace: str):
+        """Remove a job's workspace; the mirror stays for the next checkout."""
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    def touch(self, path: str):
+        now = time.time()
+        os.utime(path, (now, now))
+
+    def record_size(self, mirror: str) -> int:
+        """Walk mirror once and note its size in <mirror>.size for enforce_quota()."""
+        size = dir_size(mirror)
+        tmp = f"{mirror}.size.tmp-{uuid.uuid4().hex[:8]}"
+        with open(tmp, "w") as f:
+            f.write(str(size))
+        os.replace(tmp, mirror + ".size")
+        return size
+
+    def recorded_size(self, mirror: str) -> int:
+        try:
+            with open(mirror + ".size") as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return self.record_size(mirror)
+
+    def workspaces(self):
+        """Checked-out workspaces as (last_used, path), oldest first."""
+        items = []
+        for name in os.listdir(self.workspaces_dir):
+            path = os.path.join(self.workspaces_dir, name)
+            if os.path.isdir(path):
+                items.append((os.stat(path).st_mtime, path))
+        return sorted(items)
+
+    def entries(self):
+        """All mirrors as (last_used, path, recorded size), oldest first."""
+        items = []
+        for name in os.listdir(self.mirrors_dir):
+            path = os.path.join(self.mirrors_dir, name)
+            if os.path.isdir(path) and ".tmp-" not in name:
+                items.append((os.stat(path).st_mtime, path, self.recorded_size(path)))
+        return sorted(items)
+
+    def enforce_quota(self) -> list:
+        """Remove stale workspaces, then evict least-recently-used mirrors until under max_bytes.
+
+        Reads the recorded sizes, so it costs a directory listing rather than a walk of the cache.
+        """
+        evicted = []
+        with file_lock(os.path.join(self.root, ".evict.lock")):
+            now = time.time()
+            live = []
+            for last_used, path in self.workspaces():
+                if last_used < now - self.stale_age:
+                    shutil.rmtree(path, ignore_errors=True)
+                    evicted.append(path)
+                else:
+                    live.append(os.path.basename(path))
+            items = self.entries()
+            total = sum(size for _, _, size in items)
+            cutoff = now - self.min_age
+            for last_used, path, size in items:
+                if total <= self.max_bytes:
+                    break
+                if last_used > cutoff:
+                    continue
+                # Workspaces borrow the mirror's objects, so a mirror with one checked out has to stay
+                prefix = os.path.basename(path)[:-len(".git")] + "-"
+                if any(name.startswith(prefix) for name in live):
+                    continue
+                with file_lock(path + ".lock"):
+                    shutil.rmtree(path, ignore_errors=True)
+                    try:
+                        os.remove(path + ".size")
+                    except FileNotFoundError:
+                        pass
+                total -= size
+                evicted.append(path)
+        return evicted
@@ -0,0 +1,245 @@
+"""Progress events of running jobs, written by workers and streamed by the API.
+
+Workers run in separate processes, so events travel through the job_events
+table: the worker appends stage transitions and pytest output lines through a
+write-behind BatchWriter (one transaction per ~50 ms). Each API process tails
+the table with a single EventTail that hands new rows to every open stream,
+so once a watcher has replayed the history (from id 0 for late joiners) it
+only reads its job's row on keep-alive ticks.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from starlette.concurrency import run_in_threadpool
+
+from . import metrics
+from .batch_writer import BatchWriter
+from .jobs import get_job
+from .models import DB, get_conn
+
+logger = logging.getLogger(__name__)
+
+INSERT_EVENT_SQL = "INSERT INTO job_events (job_id, kind, data, created_at) VALUES (?, ?, ?, ?)"
+
+event_writer = BatchWriter(DB, INSERT_EVENT_SQL,
+                           max_queue=int(os.environ.get("TESTSIGHT_JOB_EVENTS_QUEUE_SIZE", "100000")),
+                           batch_size=1000, flush_interval=0.05, name="job_events")
+
+TERMINAL_STATUSES = ("done", "failed", "failed_clone")
+
+# How often the shared tail checks for new events; the interval doubles while nothing arrives, up to the max
+POLL_SECONDS = float(os.environ.get("TESTSIGHT_JOB_EVENTS_POLL_SECONDS", "0.1"))
+MAX_POLL_SECONDS = float(os.environ.get("TESTSIGHT_JOB_EVENTS_MAX_POLL_SECONDS", "1"))
+TAIL_BATCH = 1000
+# Idle streams get a keep-alive comment, and their job's status is re-checked, this often
+KEEPALIVE_SECONDS = 15.0
+# Stage events folded into the metrics per /metrics scrape
+STAGE_SCAN_LIMIT = 50000
+
+# Last event id folded into the metrics; None until seeded at the end of the table
+_stage_cursor = {"id": None}
+_stage_cursor_lock = threading.Lock()
+
+
+class JobEvents:
+    """Emitter bound to one job; output lines may be dropped under overload, stages never are.
+
+    Stage and status events carry the name and duration of the stage they end
+    ("previous", "seconds"), which collect_stage_metrics() turns into metrics.
+    """
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._stage = None
+        self._stage_started = 0.0
+
+    def _end_stage(self) -> dict:
+        if self._stage is None:
+            return {}
+        ended = {"previous": self._stage, "seconds": round(time.monotonic() - self._stage_started, 3)}
+        self._stage = None
+        return ended
+
+    def _emit(self, kind: str, data: dict, block: bool = False):
+        row = (self.job_id, kind, json.dumps(data), datetime.utcnow().isoformat())
+        event_writer.submit(row, block=block)
+
+    def stage(self, name: str):
+        data = {"stage": name, **self._end_stage()}
+        self._stage = name
+        self._stage_started = time.monotonic()
+        self._emit("stage", data, block=True)
+
+    def line(self, text: str):
+        self._emit("output", {"line": text})
+
+    def status(self, status: str):
+        self._emit("status", {"status": status, **self._end_stage()}, block=True)
+        # Watchers stop at the status event, so it must be visible before we return
+        event_writer.flush(timeout=10)
+
+
+def fetch_job_events(job_id: int, after_id: int = 0, limit: int = 500):
+    rows = get_conn().execute("SELECT id, kind, data, created_at FROM job_events WHERE job_id=? AND id>? ORDER BY id LIMIT ?",
+                              (job_id, after_id, limit)).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _seed_stage_cursor():
+    if _stage_cursor["id"] is None:
+        _stage_cursor["id"] = get_conn().execute("SELECT MAX(id) FROM job_events").fetchone()[0] or 0
+
+
+def seed_stage_cursor():
+    """Start collect_stage_metrics() at the current end of the events table; called at startup.
+
+    The histogram lives in this process, so it covers the stages that ended
+    since it started, not the history a restart finds in the table.
+    """
+    with _stage_cursor_lock:
+        _seed_stage_cursor()
+
+
+def collect_stage_metrics(limit: int = STAGE_SCAN_LIMIT):
+    """Fold the stage durations recorded since the last call into metrics.JOB_STAGE_DURATION.
+
+    Stages run in worker processes, so the API learns about them from the
+    events table; each call reads only the events after the last one it saw
+    (or, on the first call of a process that skipped seed_stage_cursor(), after
+    the end of the table).
+    """
+    with _stage_cursor_lock:
+        _seed_stage_cursor()
+        rows = get_conn().execute("SELECT id, data FROM job_events WHERE id>? AND kind IN ('stage', 'status') "
+                                  "ORDER BY id LIMIT ?", (_stage_cursor["id"], limit)).fetchall()
+        for row in rows:
+            data = json.loads(row["data"])
+            if "seconds" in data:
+                metrics.JOB_STAGE_DURATION.observe(data["seconds"], (data["previous"],))
+        if rows:
+            _stage_cursor["id"] = rows[-1]["id"]
+
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {event['data']}\n\n"
+
+
+def fetch_new_events(after_id: int, limit: int = TAIL_BATCH):
+    rows = get_conn().execute("SELECT id, job_id, kind, data, created_at FROM job_events WHERE id>? ORDER BY id LIMIT ?",
+                              (after_id, limit)).fetchall()
+    return [dict(r) for r in rows]
+
+
+def last_event_id() -> int:
+    return get_conn().execute("SELECT MAX(id) FROM job_events").fetchone()[0] or 0
+
+
+class EventTail:
+    """One poll of job_events for all open streams of this process, fanned out to per-stream queues.
+
+    Runs while anyone is subscribed, starting at the end of the table as it
+    is when the first subscriber arrives. A subscriber replays what came
+    before on its own, then takes events from its queue, skipping the ones
+    its replay already covered.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self._task = None
+        self._loop = None
+        self._start_lock = None
+
+    async def subscribe(self, job_id: int) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._task, self._start_lock = loop, None, asyncio.Lock()
+        events = asyncio.Queue()
+        self.subscribers.setdefault(job_id, set()).add(events)
+        async with self._start_lock:
+            if self._task is None or self._task.done():
+                # Read before the caller replays, so nothing committed in between is skipped
+                cursor = await run_in_threadpool(last_event_id)
+                self._task = loop.create_task(self._run(cursor))
+        return events
+
+    def unsubscribe(self, job_id: int, events: asyncio.Queue):
+        queues = self.subscribers.get(job_id)
+        if queues is not None:
+            queues.discard(events)
+            if not queues:
+                del self.subscribers[job_id]
+
+    async def _run(self, cursor: int):
+        delay = POLL_SECONDS
+        while self.subscribers:
+            await asyncio.sleep(delay)
+            try:
+                rows = await run_in_threadpool(fetch_new_events, cursor)
+            except Exception:
+                logger.exception("Reading job events failed")
+                rows = []
+            for row in rows:
+                cursor = row["id"]
+                for events in self.subscribers.get(row.pop("job_id"), ()):
+                    events.put_nowait(row)
+            delay = POLL_SECONDS if rows else min(delay * 2, MAX_POLL_SECONDS)
+
+
+event_tail = EventTail()
+
+
+async def sse_events(job_id: int, last_id: int = 0, is_disconnected=None):
+    """Yield job events as Server-Sent Events until the job reaches a final status.
+
+    Events after last_id are replayed first, then new ones arrive through
+    event_tail. Jobs that finished before events were recorded get a
+    synthetic status event so clients always see an end of stream; the job
+    row is checked for that after the replay and then on keep-alive ticks.
+    """
+    events = await event_tail.subscribe(job_id)
+    try:
+        while True:
+            replayed = await run_in_threadpool(fetch_job_events, job_id, last_id)
+            for event in replayed:
+                last_id = event["id"]
+                yield format_sse(event)
+                if event["kind"] == "status":
+                    return
+            if len(replayed) < 500:
+                break
+        check_job = True
+        while True:
+            if check_job:
+                job = await run_in_threadpool(get_job, job_id)
+                if job and job["status"] in TERMINAL_STATUSES:
+                    # The final event may have been committed after our last read
+                    for event in await run_in_threadpool(fetch_job_events, job_id, last_id):
+                        yield format_sse(event)
+                        if event["kind"] == "status":
+                            return
+                    data = json.dumps({"status": job["status"]})
+                    yield format_sse({"id": last_id, "kind": "status", "data": data})
+                    return
+            try:
+                event = await asyncio.wait_for(events.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if is_disconnected and await is_disconnected():
+                    return
+                check_job = True
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                continue
+            check_job = False
+            if event["id"] <= last_id:
+                continue
+            last_id = event["id"]
+            yield format_sse(event)
+            if event["kind"] == "status":
+                return
+    finally:
+        event_tail.unsubscribe(job_id, events)
@@ -1,32 +1,102 @@
-from .models import get_conn
+from .models import get_conn, filter_clauses, keyset_page
 from datetime import datetime
+import time
 
 
-def create_job(repo_url: str):
+def create_job(repo_url: str, ref: str | None = None, sparse: bool = False, shards: int = 1, kind: str = "tests"):
     conn = get_conn()
-    cur = conn.cursor()
     created_at = datetime.utcnow().isoformat()
     status = "queued"
-    cur.execute("INSERT INTO jobs (repo_url, created_at, status) VALUES (?, ?, ?)", (repo_url, created_at, status))
-    conn.commit()
+    with conn:
+        cur = conn.execute("INSERT INTO jobs (repo_url, created_at, status, ref, sparse, shards, kind) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           (repo_url, created_at, status, ref, int(sparse), shards, kind))
     job_id = cur.lastrowid
-    conn.close()
-    return {"id": job_id, "repo_url": repo_url, "created_at": created_at, "status": status}
+    return {"id": job_id, "repo_url": repo_url, "created_at": created_at, "status": status, "ref": ref, "kind": kind}
 
 def get_job(job_id: int):
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM jobs WHERE id=?", (job_id,))
-    row = cur.fetchone()
-    conn.close()
+    row = conn.execute("SELECT * FROM jobs WHERE id=?", (job_id,)).fetchone()
     if not row:
         return None
     return dict(row)
 
-def list_jobs():
+def list_jobs(limit: int = 20, after_id: int | None = None, before_id: int | None = None,
+              status: str | None = None, since: str | None = None, until: str | None = None):
+    clauses, params = filter_clauses(since, until, status=status)
+    return keyset_page("jobs", limit, after_id, before_id, clauses, params)
+
+def claim_job(owner: str, lease_seconds: float):
+    """Atomically take the oldest queued job and lease it to owner.
+
+    Runs under BEGIN IMMEDIATE so two workers can never claim the same row.
+    Returns the claimed job dict or None when the queue is empty.
+    """
+    conn = get_conn()
+    now = time.time()
+    now_iso = datetime.utcnow().isoformat()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT id FROM jobs WHERE status='queued' ORDER BY id LIMIT 1").fetchone()
+        if row:
+            conn.execute("""
+                UPDATE jobs SET status='running', lease_owner=?, lease_expires_at=?, heartbeat_at=?,
+                                started_at=?, attempts=attempts+1
+                WHERE id=?
+            """, (owner, now + lease_seconds, now_iso, now_iso, row["id"]))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return get_job(row["id"]) if row else None
+
+def heartbeat_job(job_id: int, owner: str, lease_seconds: float) -> bool:
+    """Extend owner's lease on a running job; False means the lease was lost."""
+    conn = get_conn()
+    with conn:
+        cur = conn.execute("""
+            UPDATE jobs SET lease_expires_at=?, heartbeat_at=?
+            WHERE id=? AND lease_owner=? AND status='running'
+        """, (time.time() + lease_seconds, datetime.utcnow().isoformat(), job_id, owner))
+    return cur.rowcount == 1
+
+def requeue_expired_jobs(max_attempts: int):
+    """Put running jobs whose lease ran out back on the queue (or fail them).
+
+    Returns the number of jobs re-queued.
+    """
+    conn = get_conn()
+    now = time.time()
+    with conn:
+        conn.execute("""
+            UPDATE jobs SET status='failed', lease_owner=NULL, lease_expires_at=NULL, finished_at=?
+            WHERE status='running' AND lease_expires_at < ? AND attempts >= ?
+        """, (datetime.utcnow().isoformat(), now, max_attempts))
+        cur = conn.execute("""
+            UPDATE jobs SET status='queued', lease_owner=NULL, lease_expires_at=NULL
+            WHERE status='running' AND lease_expires_at < ?
+        """, (now,))
+    return cur.rowcount
+
+def set_job_commit(job_id: int, commit_sha: str | None):
+    conn = get_conn()
+    with conn:
+        conn.execute("UPDATE jobs SET commit_sha=? WHERE id=?", (commit_sha, job_id))
+
+def finish_job(conn, job_id: int, status: str, owner: str | None = None) -> bool:
+    """set_job_status() inside the caller's transaction."""
+    sql = "UPDATE jobs SET status=?, lease_owner=NULL, lease_expires_at=NULL, finished_at=? WHERE id=?"
+    params = [status, datetime.utcnow().isoformat(), job_id]
+    if owner is not None:
+        sql += " AND lease_owner=?"
+        params.append(owner)
+    return conn.execute(sql, params).rowcount == 1
+
+def set_job_status(job_id: int, status: str, owner: str | None = None) -> bool:
+    """Record a terminal status and release the job's lease.
+
+    With owner, only while owner still holds the lease: a worker whose lease
+    expired (and whose job may be running elsewhere by now) gets False.
+    """
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT 20")
-    rows = cur.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    with conn:
+        return finish_job(conn, job_id, status, owner)
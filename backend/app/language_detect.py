@@ -0,0 +1,171 @@
+"""Statistical programming-language detection for the analyzers.
+
+The first MAX_CHARS of the code are tokenized in one regex pass: keywords and
+identifiers, preprocessor directives, decorators and attributes, multi-
+character operators (`::`, `:=`, `=>`, `->`, `===`, ...), punctuation, and
+string literals reduced to their delimiter (`"`, `'`, a backtick, `f"`, `$"`,
+a triple quote). Comments and string contents are dropped. The tokens
+and their adjacent pairs are scored against per-language multinomial Naive
+Bayes profiles (language_profiles.py, generated by
+benchmarks/build_language_profiles.py from a labeled corpus), one of them for
+prose, which detects as 'unknown'; the softmax of the scaled scores is the
+confidence. Besides the tokens, identifier case (snake_case, camelCase, ...),
+the last character of each line and the comment styles are counted, which
+carries over to code whose identifiers the corpus never saw.
+
+Callers go through analyzers.detection(), which memoizes the result on the
+shared ParsedDocument, i.e. by content hash.
+"""
+import math
+import os
+import re
+from collections import Counter
+
+MAX_CHARS = int(os.environ.get("TESTSIGHT_LANGDETECT_CHARS", "8192"))
+MIN_FEATURES = 3
+# Scores are summed log-likelihoods, which Naive Bayes makes far too sure of
+# themselves; scaling them by SHARPNESS / sqrt(features) before the softmax
+# gives confidences that held up under cross-validation on the corpus
+SHARPNESS = 0.5
+# A detected language only overrides the one the user selected at this confidence
+MISMATCH_CONFIDENCE = 0.7
+
+# Languages whose short snippets are routinely indistinguishable, so telling them apart is no mismatch
+FAMILIES = ({"c", "c++"}, {"javascript", "typescript"})
+
+DIRECTIVES = "include|define|undef|if|ifdef|ifndef|elif|else|endif|pragma|import|region|endregion|using"
+
+TOKEN_RE = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z)|\#(?![ \t]*(?:""" + DIRECTIVES + r""")\b)[^\n]*)
+  | (?P<directive>\#[ \t]*[a-z]+)
+  | (?P<string>\"\"\".*?(?:\"\"\"|\Z)|'''.*?(?:'''|\Z)
+              |[fFrRbBuU$@]?(?:"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`))
+  | (?P<number>\d[\w.]*)
+  | (?P<word>@?[A-Za-z_$][\w$]*)
+  | (?P<op>:=|::|=>|->|===|!==|==|!=|<=|>=|<<|>>|\+\+|--|&&|\|\||\?\?|\?\.|\.\.\.|[^\s\w])
+""", re.VERBOSE | re.DOTALL)
+
+
+def word_shape(word: str) -> str:
+    if "_" in word.strip("_"):
+        return "shape:UPPER_SNAKE" if word.isupper() else "shape:snake_case"
+    if word[:1].isupper():
+        return "shape:UPPER" if word.isupper() and len(word) > 1 else "shape:PascalCase"
+    return "shape:camelCase" if word != word.lower() else "shape:lower"
+
+
+def tokens(code: str) -> tuple:
+    """(tokens, Counter of character-level features) of the first MAX_CHARS of code.
+
+    The character-level features are the shape of every identifier (snake_case,
+    camelCase, ...), the last character of every line and the comment styles used.
+    """
+    head = code[:MAX_CHARS]
+    toks = []
+    words = []
+    comments = []
+    for comment, directive, string, number, word, op in TOKEN_RE.findall(head):
+        if word:
+            if len(word) == 1:
+                # Loop counters and x/y say nothing about the language, only where a name goes
+                toks.append("_")
+            else:
+                toks.append(word)
+                words.append(word)
+        elif op:
+            toks.append(op)
+        elif string:
+            if string.startswith(('"""', "'''")):
+                toks.append(string[:3])
+            elif string[0] in "\"'`":
+                toks.append(string[0])
+            else:
+                toks.append(string[0].lower() + string[1])
+        elif directive:
+            toks.append("#" + directive[1:].strip())
+        elif comment:
+            comments.append("comment:" + comment[:2] if comment[0] == "/" else "comment:#")
+    extra = Counter(comments)
+    for word, n in Counter(words).items():
+        extra[word_shape(word.lstrip("@$"))] += n
+    extra.update("eol:" + line[-1] for line in map(str.rstrip, head.splitlines()) if line)
+    return toks, extra
+
+
+def features(code: str) -> Counter:
+    """Token, adjacent token-pair and character-level feature counts of the first MAX_CHARS of code."""
+    toks, extra = tokens(code)
+    counts = Counter(toks)
+    counts.update(map(" ".join, zip(toks, toks[1:])))
+    counts.update(extra)
+    return counts
+
+
+def scores(counts: Counter, profiles: dict) -> tuple:
+    """({language: log-likelihood}, number of features any profile knows)"""
+    known = {f: n for f, n in counts.items() if f in profiles["vocabulary"]}
+    total = sum(known.values())
+    result = {}
+    for language, (bias, weights) in profiles["languages"].items():
+        result[language] = bias * total + sum(n * weights.get(f, 0.0) for f, n in known.items())
+    return result, total
+
+
+def detect(code: str, profiles: dict | None = None) -> tuple:
+    """(language, confidence) for code; 'unknown' when it is not code or too short to tell.
+
+    The confidence counts the languages compatible() with the detected one, so
+    a snippet that is equally good C and C++ is still confidently not Python.
+    """
+    if profiles is None:
+        from .language_profiles import PROFILES as profiles
+    by_language, total = scores(features(code), profiles)
+    if total < MIN_FEATURES:
+        return "unknown", 0.0
+    scale = SHARPNESS / math.sqrt(total)
+    top = max(by_language.values())
+    exp = {language: math.exp((score - top) * scale) for language, score in by_language.items()}
+    language = max(exp, key=exp.get)
+    likely = sum(p for other, p in exp.items() if compatible(language, other))
+    return language, round(likely / sum(exp.values()), 3)
+
+
+def compatible(selected: str, detected: str) -> bool:
+    """Whether code detected as `detected` is fine to analyze as `selected`."""
+    return detected == selected or any(selected in family and detected in family for family in FAMILIES)
+
+
+def is_mismatch(selected: str, detected: str, confidence: float) -> bool:
+    """Whether the detection is confident enough, and far enough off, to reject the selected language."""
+    return detected != "unknown" and confidence >= MISMATCH_CONFIDENCE and not compatible(selected.lower(), detected)
+
+
+def build_profiles(samples, alpha: float = 0.1, min_docs: int = 3) -> dict:
+    """Train profiles from (language, code) pairs.
+
+    'unknown' samples (prose, notes, tables) train a profile of their own, so
+    text that is not code has something better to match than the closest language.
+
+    A feature is kept when it occurs in at least min_docs samples of some
+    language, which drops one-off identifiers. Each language stores a
+    per-feature bias, log(alpha / (N + alpha * V)), and for the features it has
+    seen log((count + alpha) / alpha), so score = bias * n + sum(weights) is
+    the Laplace-smoothed multinomial log-likelihood.
+    """
+    counts = {}
+    docs = {}
+    for language, code in samples:
+        found = features(code)
+        counts.setdefault(language, Counter()).update(found)
+        docs.setdefault(language, Counter()).update(found.keys())
+    vocabulary = set()
+    for language_docs in docs.values():
+        vocabulary.update(f for f, n in language_docs.items() if n >= min_docs)
+    languages = {}
+    for language, language_counts in counts.items():
+        kept = {f: n for f, n in language_counts.items() if f in vocabulary}
+        size = sum(kept.values())
+        bias = math.log(alpha / (size + alpha * len(vocabulary)))
+        languages[language] = (round(bias, 4),
+                               {f: round(math.log((n + alpha) / alpha), 4) for f, n in sorted(kept.items())})
+    return {"vocabulary": vocabulary, "languages": languages}
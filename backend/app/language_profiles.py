@@ -0,0 +1,1495 @@
+"""Language profiles for language_detect.
+
+Generated by benchmarks/build_language_profiles.py from
+benchmarks/language_corpus.py; do not edit by hand. language -> (per-feature
+bias, {feature: log-weight}), see language_detect.build_profiles().
+"""
+
+LANGUAGES = {
+    'c': (-10.0553, {
+        '!': 3.0445,
+        '!=': 3.434,
+        '"': 5.1417,
+        '" )': 4.1109,
+        '" ,': 4.3944,
+        '#include': 4.1109,
+        '#include <': 4.1109,
+        '&': 4.8752,
+        "'": 2.3979,
+        "' ;": 2.3979,
+        '(': 6.9948,
+        '( !': 3.0445,
+        '( "': 4.6151,
+        '( &': 4.2627,
+        '( (': 3.9318,
+        '( *': 2.3979,
+        '( _': 5.0173,
+        '( const': 4.3944,
+        '( int': 4.5109,
+        '( void': 3.434,
+        ')': 6.9948,
+        ') !=': 3.0445,
+        ') )': 4.5109,
+        ') +': 3.9318,
+        ') ,': 3.434,
+        ') :': 2.3979,
+        ') ;': 6.0186,
+        ') _': 3.7136,
+        ') return': 3.0445,
+        ') {': 5.7398,
+        '*': 6.2748,
+        '* *': 3.0445,
+        '* _': 5.1985,
+        '+': 4.6151,
+        '+ _': 3.9318,
+        '++': 4.5109,
+        '++ )': 4.1109,
+        ',': 6.1759,
+        ', "': 3.7136,
+        ', &': 3.9318,
+        ', _': 3.9318,
+        ', const': 2.3979,
+        ', int': 3.9318,
+        ', len': 2.3979,
+        ', sizeof': 3.9318,
+        '-': 4.5109,
+        '->': 4.9488,
+        '.': 4.7095,
+        '. _': 4.6151,
+        ':': 3.7136,
+        ': (': 2.3979,
+        ': return': 3.434,
+        ';': 7.0825,
+        '; *': 3.9318,
+        '; _': 4.7958,
+        '; const': 2.3979,
+        '; for': 3.434,
+        '; if': 4.3944,
+        '; int': 3.7136,
+        '; return': 4.7958,
+        '; static': 3.434,
+        '; while': 3.7136,
+        '; }': 5.8319,
+        '<': 4.8752,
+        '< _': 3.434,
+        '< string': 3.0445,
+        '<<': 3.0445,
+        '=': 6.1759,
+        "= '": 2.3979,
+        '= (': 3.7136,
+        '= *': 4.5109,
+        '= ;': 4.6151,
+        '= malloc': 3.7136,
+        '==': 4.2627,
+        '== NULL': 3.7136,
+        '>': 4.3944,
+        '> (': 2.3979,
+        '> _': 2.3979,
+        '?': 2.3979,
+        'NULL': 4.3944,
+        'NULL )': 4.1109,
+        '[': 4.7958,
+        '[ ]': 3.7136,
+        '[ _': 3.7136,
+        ']': 4.7958,
+        '] )': 3.434,
+        '] ;': 3.9318,
+        '] =': 3.0445,
+        '_': 6.9575,
+        '_ )': 5.3519,
+        '_ *': 2.3979,
+        '_ +': 2.3979,
+        '_ ++': 3.7136,
+        '_ ,': 4.3944,
+        '_ .': 3.7136,
+        '_ ;': 5.1985,
+        '_ <': 3.9318,
+        '_ =': 5.3519,
+        '_ >': 4.2627,
+        '_ ]': 3.7136,
+        'buf': 4.7095,
+        'buf )': 3.9318,
+        'buf ,': 3.434,
+        'char': 4.7095,
+        'char *': 4.6151,
+        'const': 4.6151,
+        'const char': 3.434,
+        'count': 3.7136,
+        'data': 3.0445,
+        'default': 2.3979,
+        'double': 3.7136,
+        'double _': 3.0445,
+        'else': 2.3979,
+        'eol:)': 4.3944,
+        'eol:0': 2.3979,
+        'eol::': 3.434,
+        'eol:;': 7.013,
+        'eol:>': 4.1109,
+        'eol:{': 5.8608,
+        'eol:}': 5.7398,
+        'for': 3.7136,
+        'for (': 3.7136,
+        'head': 4.5109,
+        'if': 4.6151,
+        'if (': 4.6151,
+        'int': 5.9162,
+        'int )': 3.434,
+        'int *': 4.5109,
+        'int _': 4.3944,
+        'int main': 3.0445,
+        'item': 2.3979,
+        'items': 2.3979,
+        'len': 3.9318,
+        'main': 3.0445,
+        'main (': 3.0445,
+        'malloc': 3.7136,
+        'malloc (': 3.7136,
+        'name': 3.0445,
+        'open': 2.3979,
+        'open (': 2.3979,
+        'perror': 3.434,
+        'perror (': 3.434,
+        'printf': 3.7136,
+        'printf (': 3.7136,
+        'return': 5.3982,
+        'return -': 3.434,
+        'return ;': 3.7136,
+        'return _': 3.434,
+        'shape:UPPER': 5.1417,
+        'shape:UPPER_SNAKE': 4.5109,
+        'shape:lower': 8.2324,
+        'shape:snake_case': 5.6021,
+        'size_t': 3.9318,
+        'sizeof': 4.3944,
+        'sizeof (': 4.2627,
+        'static': 4.3944,
+        'static int': 3.434,
+        'string': 3.0445,
+        'struct': 4.7958,
+        'struct {': 2.3979,
+        'value': 4.3944,
+        'void': 4.7095,
+        'while': 3.9318,
+        'while (': 3.9318,
+        '{': 5.8889,
+        '{ if': 3.0445,
+        '{ int': 4.2627,
+        '{ perror': 3.434,
+        '{ return': 3.434,
+        '{ struct': 3.434,
+        '}': 5.8889,
+        '} ;': 3.434,
+        '} return': 3.0445,
+        '} }': 2.3979,
+        '~': 2.3979,
+    }),
+    'c#': (-9.7947, {
+        '!': 3.0445,
+        '!=': 2.3979,
+        '"': 4.1109,
+        '" )': 3.7136,
+        '" +': 2.3979,
+        '" ,': 2.3979,
+        '(': 6.7811,
+        '( "': 3.9318,
+        '( (': 2.3979,
+        '( )': 5.3033,
+        '( ,': 3.7136,
+        '( _': 4.7958,
+        '( id': 3.0445,
+        '( int': 4.1109,
+        '( item': 3.434,
+        '( string': 3.9318,
+        ')': 6.7811,
+        ') !=': 2.3979,
+        ') )': 4.6151,
+        ') .': 4.2627,
+        ') ;': 6.1334,
+        ') {': 5.3519,
+        '*': 3.0445,
+        '* _': 3.0445,
+        '+': 3.434,
+        '+ _': 2.3979,
+        ',': 5.0814,
+        ', "': 2.3979,
+        ', )': 3.0445,
+        ', int': 3.434,
+        '.': 6.4313,
+        '. Add': 3.7136,
+        '. Select': 3.434,
+        '. ToList': 3.434,
+        '. WriteLine': 4.1109,
+        ':': 3.0445,
+        ';': 6.5944,
+        '; Console': 4.1109,
+        '; if': 3.0445,
+        '; public': 3.0445,
+        '; return': 3.0445,
+        '; while': 2.3979,
+        '; }': 5.7071,
+        '<': 5.1985,
+        '< Order': 3.0445,
+        '< _': 4.3944,
+        '< string': 3.0445,
+        '=': 5.3982,
+        '= await': 3.434,
+        '= new': 3.7136,
+        '==': 3.7136,
+        '== null': 3.7136,
+        '=>': 4.2627,
+        '>': 4.9488,
+        '> (': 3.434,
+        '?': 2.3979,
+        'Add': 3.7136,
+        'Add (': 3.7136,
+        'Console': 4.7095,
+        'Console .': 4.7095,
+        'List': 2.3979,
+        'List <': 2.3979,
+        'Name': 3.9318,
+        'Order': 3.0445,
+        'Order >': 2.3979,
+        'Select': 3.434,
+        'Select (': 3.434,
+        'System': 3.9318,
+        'System .': 3.434,
+        'Task': 4.2627,
+        'Task <': 3.9318,
+        'ToList': 3.434,
+        'ToList (': 3.434,
+        'User': 2.3979,
+        'WriteLine': 4.1109,
+        'WriteLine (': 4.1109,
+        '[': 4.2627,
+        '[ ]': 3.0445,
+        ']': 4.2627,
+        '] =': 2.3979,
+        '] public': 3.7136,
+        '_': 5.9428,
+        '_ )': 3.9318,
+        '_ *': 3.0445,
+        '_ +': 3.0445,
+        '_ ,': 3.0445,
+        '_ .': 4.3944,
+        '_ :': 3.0445,
+        '_ >': 4.2627,
+        'async': 3.434,
+        'async Task': 3.434,
+        'await': 3.7136,
+        'catch': 3.0445,
+        'catch (': 3.0445,
+        'class': 4.3944,
+        'double': 3.434,
+        'double _': 3.0445,
+        'eol:)': 5.6021,
+        'eol:;': 6.4473,
+        'eol:]': 3.7136,
+        'eol:e': 2.3979,
+        'eol:s': 3.9318,
+        'eol:{': 5.8021,
+        'eol:}': 5.9162,
+        'foreach': 3.434,
+        'foreach (': 3.434,
+        'get': 3.9318,
+        'id': 4.1109,
+        'id )': 4.1109,
+        'if': 3.9318,
+        'if (': 3.9318,
+        'in': 3.434,
+        'int': 4.8752,
+        'int >': 3.0445,
+        'int _': 2.3979,
+        'int id': 3.7136,
+        'interface': 3.0445,
+        'is': 2.3979,
+        'item': 3.9318,
+        'items': 3.0445,
+        'name': 3.0445,
+        'name ,': 2.3979,
+        'namespace': 3.0445,
+        'new': 4.2627,
+        'null': 3.9318,
+        'null )': 3.7136,
+        'out': 2.3979,
+        'private': 3.434,
+        'public': 5.3982,
+        'public async': 3.434,
+        'public class': 3.434,
+        'public static': 3.434,
+        'readonly': 2.3979,
+        'res': 3.434,
+        'return': 4.2627,
+        'shape:PascalCase': 7.3658,
+        'shape:camelCase': 3.434,
+        'shape:lower': 7.8482,
+        'shape:snake_case': 3.0445,
+        'static': 3.9318,
+        'string': 5.0814,
+        'string ,': 3.0445,
+        'this': 3.0445,
+        'try': 3.0445,
+        'using': 4.1109,
+        'using System': 3.9318,
+        'var': 4.8752,
+        'void': 3.9318,
+        'while': 2.3979,
+        'while (': 2.3979,
+        '{': 5.9687,
+        '{ if': 3.434,
+        '{ public': 3.7136,
+        '{ return': 3.434,
+        '{ var': 4.1109,
+        '}': 5.9687,
+        '} )': 2.3979,
+        '} public': 3.7136,
+        '} return': 3.0445,
+        '} }': 4.3944,
+    }),
+    'c++': (-9.9692, {
+        '!': 2.3979,
+        '!=': 3.0445,
+        '"': 4.5109,
+        '" )': 3.434,
+        '" <<': 3.434,
+        '#include': 4.1109,
+        '#include <': 4.1109,
+        '&': 5.3519,
+        '& _': 4.7958,
+        "'": 3.9318,
+        "' ;": 3.9318,
+        '(': 6.7923,
+        '( !': 2.3979,
+        '( "': 3.434,
+        '( )': 5.8021,
+        '( ,': 2.3979,
+        '( [': 2.3979,
+        '( _': 4.1109,
+        '( const': 4.8752,
+        '( key': 2.3979,
+        ')': 6.7923,
+        ') )': 4.3944,
+        ') ,': 4.5109,
+        ') .': 2.3979,
+        ') :': 3.7136,
+        ') ;': 5.5645,
+        ') <<': 3.434,
+        ') =': 3.7136,
+        ') const': 4.1109,
+        ') return': 2.3979,
+        ') {': 5.4848,
+        '*': 4.6151,
+        '* _': 3.0445,
+        '+': 4.3944,
+        '+ _': 3.9318,
+        '++': 2.3979,
+        ',': 5.7398,
+        ', )': 3.9318,
+        ', _': 3.9318,
+        ', const': 3.7136,
+        ', int': 3.0445,
+        ', }': 2.3979,
+        '-': 2.3979,
+        '->': 3.0445,
+        '.': 5.6384,
+        '. _': 4.1109,
+        '. add': 2.3979,
+        '. begin': 3.434,
+        '. end': 3.7136,
+        '. pop': 2.3979,
+        ':': 5.1985,
+        ': _': 3.434,
+        '::': 6.1549,
+        ':: cout': 3.9318,
+        ':: string': 3.9318,
+        ';': 6.7346,
+        '; for': 3.434,
+        '; if': 3.434,
+        '; int': 3.0445,
+        '; return': 3.9318,
+        '; std': 4.3944,
+        '; }': 5.7714,
+        '<': 5.4848,
+        '< _': 2.3979,
+        '< std': 3.7136,
+        '<<': 5.3033,
+        '<< "': 3.7136,
+        "<< '": 3.9318,
+        '<< _': 3.7136,
+        '=': 5.3033,
+        '= (': 2.3979,
+        '= ;': 3.7136,
+        '= default': 3.434,
+        '= std': 4.1109,
+        '==': 3.0445,
+        '>': 5.4424,
+        '> (': 3.7136,
+        '> _': 3.7136,
+        '?': 2.3979,
+        '[': 4.1109,
+        '[ ]': 2.3979,
+        '[ _': 3.0445,
+        ']': 4.1109,
+        '] )': 2.3979,
+        '] ;': 3.0445,
+        '_': 6.6214,
+        '_ )': 5.1417,
+        '_ *': 3.434,
+        '_ +': 3.7136,
+        '_ ,': 3.9318,
+        '_ .': 5.0173,
+        '_ :': 3.434,
+        '_ ;': 4.1109,
+        '_ <': 2.3979,
+        '_ =': 3.0445,
+        '_ >': 3.0445,
+        '_ ]': 3.0445,
+        '_ }': 2.3979,
+        'add': 2.3979,
+        'add (': 2.3979,
+        'auto': 4.6151,
+        'auto &': 3.434,
+        'begin': 4.2627,
+        'begin (': 3.434,
+        'catch': 3.0445,
+        'catch (': 3.0445,
+        'char': 3.0445,
+        'char *': 2.3979,
+        'class': 3.9318,
+        'const': 5.4424,
+        'const =': 3.434,
+        'const std': 3.7136,
+        'cout': 4.2627,
+        'cout <<': 4.2627,
+        'default': 3.434,
+        'default ;': 3.434,
+        'double': 4.8752,
+        'double _': 3.7136,
+        'end': 4.1109,
+        'end (': 3.7136,
+        'endl': 3.434,
+        'endl ;': 3.434,
+        'eol:)': 2.3979,
+        'eol::': 4.3944,
+        'eol:;': 6.6859,
+        'eol:>': 4.3944,
+        'eol:l': 2.3979,
+        'eol:{': 5.7398,
+        'eol:}': 5.6021,
+        'errors': 2.3979,
+        'for': 3.434,
+        'for (': 3.434,
+        'if': 3.434,
+        'if (': 3.434,
+        'int': 4.8752,
+        'int >': 4.1109,
+        'int _': 3.0445,
+        'int main': 3.7136,
+        'key': 2.3979,
+        'main': 3.7136,
+        'main (': 3.7136,
+        'map': 3.0445,
+        'namespace': 3.7136,
+        'new': 2.3979,
+        'operator': 3.7136,
+        'out': 3.7136,
+        'out .': 3.0445,
+        'pop': 2.3979,
+        'pop (': 2.3979,
+        'private': 3.434,
+        'private :': 3.434,
+        'public': 4.2627,
+        'public :': 3.9318,
+        'return': 4.9488,
+        'return ;': 3.434,
+        'return _': 3.434,
+        'shape:PascalCase': 5.9687,
+        'shape:UPPER': 2.3979,
+        'shape:UPPER_SNAKE': 3.7136,
+        'shape:lower': 8.1693,
+        'shape:snake_case': 5.3519,
+        'size_t': 4.1109,
+        'std': 6.1334,
+        'std ::': 6.089,
+        'string': 3.9318,
+        'string ,': 3.0445,
+        'struct': 3.0445,
+        'try': 3.0445,
+        'using': 3.0445,
+        'value': 4.1109,
+        'vector': 4.2627,
+        'vector <': 3.9318,
+        'while': 2.3979,
+        'while (': 2.3979,
+        '{': 6.0661,
+        '{ _': 2.3979,
+        '{ auto': 3.434,
+        '{ int': 3.434,
+        '{ public': 3.9318,
+        '{ return': 4.3944,
+        '{ std': 4.1109,
+        '{ struct': 2.3979,
+        '{ }': 4.1109,
+        '}': 6.0661,
+        '} )': 2.3979,
+        '} ;': 4.7095,
+        '} double': 3.434,
+        '} }': 3.434,
+        '~': 3.434,
+    }),
+    'go': (-9.9479, {
+        '!=': 4.2627,
+        '"': 5.7398,
+        '" )': 4.5109,
+        '" +': 2.3979,
+        '" ,': 5.1417,
+        '&': 3.7136,
+        '(': 6.9187,
+        '( "': 5.3033,
+        '( )': 5.4848,
+        '( *': 2.3979,
+        '( ,': 3.0445,
+        '( [': 3.434,
+        '( _': 5.3519,
+        '( data': 3.0445,
+        '( int': 2.3979,
+        ')': 6.9187,
+        ') )': 4.1109,
+        ') :': 3.434,
+        ') ;': 3.434,
+        ') _': 2.3979,
+        ') for': 3.434,
+        ') if': 3.9318,
+        ') {': 5.0173,
+        ') }': 5.3982,
+        '*': 4.9488,
+        '* _': 3.7136,
+        '* testing': 3.7136,
+        '+': 4.1109,
+        '+ _': 3.434,
+        '++': 3.0445,
+        ',': 6.3986,
+        ', "': 3.7136,
+        ', &': 3.0445,
+        ', )': 3.0445,
+        ', _': 4.7095,
+        ', fmt': 3.434,
+        ', func': 3.434,
+        ', got': 3.434,
+        ', len': 3.434,
+        ', nil': 3.9318,
+        ', }': 3.434,
+        '-': 4.5109,
+        '.': 6.6477,
+        '. Add': 3.0445,
+        '. Done': 3.434,
+        '. Errorf': 3.7136,
+        '. New': 3.434,
+        '. Println': 3.9318,
+        '. _': 4.6151,
+        ':': 3.9318,
+        ': return': 2.3979,
+        ':=': 5.5255,
+        ':= make': 3.7136,
+        ':= range': 4.3944,
+        ';': 3.434,
+        '<': 4.5109,
+        '< -': 4.2627,
+        '=': 4.2627,
+        '==': 3.434,
+        'Add': 3.7136,
+        'Add (': 3.7136,
+        'Done': 3.434,
+        'Done (': 3.434,
+        'Errorf': 3.7136,
+        'Errorf (': 3.7136,
+        'Name': 3.7136,
+        'New': 3.434,
+        'New (': 3.434,
+        'Println': 3.9318,
+        'Println (': 3.9318,
+        'User': 3.7136,
+        '[': 5.0173,
+        '[ ]': 4.3944,
+        '[ string': 3.434,
+        ']': 5.0173,
+        '] )': 2.3979,
+        '] =': 3.0445,
+        '] int': 3.9318,
+        '_': 6.6859,
+        '_ )': 4.7095,
+        '_ *': 4.7958,
+        '_ +': 3.0445,
+        '_ ,': 4.8752,
+        '_ .': 5.0814,
+        '_ :=': 3.9318,
+        '_ <': 2.3979,
+        '_ [': 2.3979,
+        '_ ]': 2.3979,
+        '_ int': 3.434,
+        '_ }': 3.9318,
+        '`': 4.1109,
+        'append': 2.3979,
+        'append (': 2.3979,
+        'const': 2.3979,
+        'data': 3.7136,
+        'defer': 3.434,
+        'eol:"': 3.7136,
+        'eol:)': 6.2748,
+        'eol:,': 3.0445,
+        'eol::': 3.9318,
+        'eol:e': 3.434,
+        'eol:g': 3.7136,
+        'eol:l': 3.7136,
+        'eol:t': 3.0445,
+        'eol:{': 6.1334,
+        'eol:}': 6.089,
+        'error': 3.434,
+        'errors': 3.434,
+        'errors .': 3.434,
+        'fmt': 4.6151,
+        'fmt .': 4.6151,
+        'for': 4.3944,
+        'for _': 4.3944,
+        'func': 5.2523,
+        'func (': 4.7095,
+        'got': 4.5109,
+        'got !=': 3.434,
+        'got :=': 3.434,
+        'if': 4.7958,
+        'if _': 3.434,
+        'if got': 3.434,
+        'import': 3.0445,
+        'in': 3.0445,
+        'int': 4.9488,
+        'int )': 3.9318,
+        'int ,': 3.434,
+        'int {': 3.434,
+        'interface': 3.0445,
+        'json': 3.0445,
+        'key': 2.3979,
+        'len': 3.9318,
+        'len (': 3.9318,
+        'log': 3.0445,
+        'main': 3.7136,
+        'main (': 3.0445,
+        'make': 3.9318,
+        'make (': 3.9318,
+        'map': 3.434,
+        'map [': 3.434,
+        'name': 3.0445,
+        'name ,': 2.3979,
+        'nil': 5.0173,
+        'nil {': 3.9318,
+        'nil }': 3.434,
+        'os': 4.1109,
+        'os .': 4.1109,
+        'out': 3.434,
+        'range': 4.3944,
+        'return': 5.0814,
+        'return _': 3.7136,
+        'return nil': 3.9318,
+        'shape:PascalCase': 6.9088,
+        'shape:UPPER': 3.0445,
+        'shape:camelCase': 2.3979,
+        'shape:lower': 8.111,
+        'string': 4.7958,
+        'string )': 2.3979,
+        'string ,': 2.3979,
+        'string ]': 3.434,
+        'struct': 3.9318,
+        'struct {': 3.9318,
+        'testing': 3.7136,
+        'testing .': 3.7136,
+        'time': 3.7136,
+        'type': 4.1109,
+        'value': 2.3979,
+        'var': 3.9318,
+        '{': 6.2748,
+        '{ _': 4.5109,
+        '{ if': 3.9318,
+        '{ return': 4.6151,
+        '{ }': 3.0445,
+        '}': 6.2748,
+        '} )': 3.434,
+        '} for': 3.434,
+        '} func': 3.9318,
+        '} return': 3.9318,
+        '} }': 3.7136,
+    }),
+    'java': (-10.0327, {
+        '!=': 3.7136,
+        '"': 4.8752,
+        '" )': 4.1109,
+        '" +': 3.7136,
+        '" ,': 3.0445,
+        "'": 2.3979,
+        "' )": 2.3979,
+        '(': 7.1554,
+        '( "': 4.6151,
+        "( '": 2.3979,
+        '( (': 3.434,
+        '( )': 6.1115,
+        '( ,': 3.0445,
+        '( String': 4.3944,
+        '( _': 4.8752,
+        '( id': 3.434,
+        '( int': 3.7136,
+        ')': 7.1554,
+        ') !=': 3.7136,
+        ') )': 5.4424,
+        ') +': 2.3979,
+        ') .': 4.7958,
+        ') ;': 6.0661,
+        ') _': 2.3979,
+        ') return': 3.0445,
+        ') {': 5.8319,
+        '*': 3.7136,
+        '* _': 2.3979,
+        '+': 4.5109,
+        '+ _': 2.3979,
+        '++': 3.7136,
+        '++ )': 3.7136,
+        ',': 5.0814,
+        ', )': 3.0445,
+        ', _': 2.3979,
+        ', int': 2.3979,
+        '-': 3.0445,
+        '->': 3.7136,
+        '.': 6.8469,
+        '. _': 3.0445,
+        '. add': 3.434,
+        '. append': 3.0445,
+        '. length': 2.3979,
+        '. map': 3.434,
+        '. out': 4.1109,
+        '. println': 3.9318,
+        ':': 3.434,
+        '::': 3.434,
+        ';': 6.7581,
+        '; _': 4.1109,
+        '; for': 4.1109,
+        '; if': 2.3979,
+        '; import': 3.434,
+        '; int': 3.7136,
+        '; public': 4.1109,
+        '; return': 2.3979,
+        '; while': 3.434,
+        '; }': 5.8319,
+        '<': 5.2523,
+        '< >': 3.7136,
+        '< Order': 3.434,
+        '< String': 3.9318,
+        '< _': 3.0445,
+        '=': 5.8319,
+        '= (': 2.3979,
+        '= ;': 4.1109,
+        '= new': 4.6151,
+        '==': 4.1109,
+        '== null': 2.3979,
+        '>': 5.0173,
+        '> (': 3.7136,
+        '@Override': 3.7136,
+        '@Override public': 3.7136,
+        'Integer': 4.2627,
+        'Integer >': 3.7136,
+        'List': 4.2627,
+        'List <': 4.1109,
+        'Order': 3.434,
+        'Order >': 3.434,
+        'String': 5.2523,
+        'System': 4.3944,
+        'System .': 4.3944,
+        'User': 4.1109,
+        '[': 3.0445,
+        '[ ]': 3.0445,
+        ']': 3.0445,
+        '_': 6.2364,
+        '_ )': 4.7095,
+        '_ *': 3.0445,
+        '_ +': 2.3979,
+        '_ ++': 3.7136,
+        '_ .': 4.1109,
+        '_ ;': 3.7136,
+        '_ <': 3.7136,
+        '_ =': 4.3944,
+        'add': 3.434,
+        'add (': 3.434,
+        'append': 3.0445,
+        'append (': 3.0445,
+        'boolean': 3.434,
+        'catch': 3.0445,
+        'catch (': 3.0445,
+        'class': 4.5109,
+        'count': 2.3979,
+        'double': 3.7136,
+        'eol:)': 4.6151,
+        'eol:;': 6.6859,
+        'eol:e': 3.7136,
+        'eol:t': 3.0445,
+        'eol:{': 6.1549,
+        'eol:}': 6.1115,
+        'final': 3.9318,
+        'for': 4.1109,
+        'for (': 4.1109,
+        'get': 3.0445,
+        'get (': 3.0445,
+        'getName': 3.434,
+        'id': 4.3944,
+        'id )': 3.9318,
+        'if': 3.9318,
+        'if (': 3.9318,
+        'import': 4.1109,
+        'in': 3.0445,
+        'int': 5.0814,
+        'int _': 4.3944,
+        'int id': 2.3979,
+        'interface': 2.3979,
+        'length': 2.3979,
+        'main': 3.0445,
+        'main (': 3.0445,
+        'map': 3.434,
+        'map (': 3.434,
+        'name': 4.2627,
+        'name ,': 2.3979,
+        'new': 4.8752,
+        'null': 3.434,
+        'null )': 3.0445,
+        'out': 4.1109,
+        'out .': 4.1109,
+        'printf': 2.3979,
+        'printf (': 2.3979,
+        'println': 3.9318,
+        'println (': 3.9318,
+        'private': 4.2627,
+        'private final': 3.434,
+        'public': 5.6384,
+        'public boolean': 3.434,
+        'public class': 4.3944,
+        'public static': 3.434,
+        'return': 5.1417,
+        'return ;': 2.3979,
+        'return _': 3.0445,
+        'shape:PascalCase': 7.1554,
+        'shape:UPPER': 3.9318,
+        'shape:camelCase': 6.1334,
+        'shape:lower': 8.105,
+        'static': 3.9318,
+        'static int': 2.3979,
+        'sum': 3.7136,
+        'this': 3.9318,
+        'this .': 3.434,
+        'try': 3.0445,
+        'user': 3.9318,
+        'void': 3.9318,
+        'while': 3.434,
+        'while (': 3.434,
+        '{': 6.1549,
+        '{ _': 2.3979,
+        '{ if': 3.7136,
+        '{ int': 3.0445,
+        '{ private': 3.434,
+        '{ public': 3.434,
+        '{ return': 4.7095,
+        '{ this': 3.0445,
+        '}': 6.1549,
+        '} public': 3.7136,
+        '} return': 3.434,
+        '} }': 4.8752,
+    }),
+    'javascript': (-9.9261, {
+        '!': 3.434,
+        "'": 5.7071,
+        "' )": 4.8752,
+        "' ,": 4.8752,
+        "' ;": 2.3979,
+        '(': 7.1554,
+        '( !': 3.434,
+        "( '": 5.3033,
+        '( (': 4.7958,
+        '( )': 5.6733,
+        '( ,': 3.7136,
+        '( _': 3.7136,
+        '( `': 3.0445,
+        '( data': 3.9318,
+        '( item': 3.7136,
+        '( sum': 3.434,
+        '( {': 3.434,
+        ')': 7.1554,
+        ') )': 4.7095,
+        ') ,': 3.434,
+        ') .': 5.1985,
+        ') ;': 6.1759,
+        ') =>': 5.3982,
+        ') return': 2.3979,
+        ') {': 5.3033,
+        ') }': 3.7136,
+        '*': 2.3979,
+        '+': 3.7136,
+        '+ _': 2.3979,
+        '++': 3.7136,
+        '++ )': 3.0445,
+        ',': 6.0426,
+        ', (': 4.2627,
+        ', )': 4.1109,
+        ', ...': 3.7136,
+        ', _': 2.3979,
+        ', }': 3.0445,
+        '.': 6.7464,
+        '. get': 3.0445,
+        '. id': 3.7136,
+        '. json': 3.9318,
+        '. length': 3.434,
+        '. log': 4.2627,
+        '. map': 3.434,
+        '...': 4.5109,
+        ':': 4.6151,
+        ": '": 3.9318,
+        ';': 6.6477,
+        '; _': 3.9318,
+        '; const': 4.3944,
+        '; export': 2.3979,
+        '; for': 3.0445,
+        '; if': 3.0445,
+        '; return': 3.7136,
+        '; }': 5.6021,
+        '<': 4.3944,
+        '=': 5.8889,
+        '= ;': 3.7136,
+        '= [': 3.0445,
+        '= await': 3.434,
+        '= this': 3.434,
+        '= {': 4.2627,
+        '=>': 5.6021,
+        '=> console': 3.9318,
+        '=> {': 4.5109,
+        '>': 4.1109,
+        '> )': 3.0445,
+        '> ;': 2.3979,
+        '> {': 3.434,
+        '?': 2.3979,
+        '[': 4.8752,
+        '[ ]': 3.434,
+        '[ _': 3.9318,
+        ']': 4.8752,
+        '] )': 3.434,
+        '] ;': 3.0445,
+        '] =': 3.0445,
+        '_': 5.3519,
+        '_ )': 3.7136,
+        '_ +': 2.3979,
+        '_ ++': 3.0445,
+        '_ ,': 2.3979,
+        '_ .': 3.434,
+        '_ ;': 2.3979,
+        '_ <': 3.0445,
+        '_ =': 3.0445,
+        '_ ]': 3.9318,
+        '`': 3.0445,
+        '` )': 3.0445,
+        'add': 3.0445,
+        'add (': 3.0445,
+        'async': 3.434,
+        'await': 3.434,
+        'catch': 3.434,
+        'catch (': 3.434,
+        'class': 3.0445,
+        'console': 4.5109,
+        'console .': 4.5109,
+        'const': 5.1985,
+        'constructor': 3.0445,
+        'constructor (': 3.0445,
+        'count': 3.7136,
+        'data': 4.3944,
+        'data )': 3.7136,
+        'default': 3.0445,
+        'eol:)': 4.5109,
+        'eol:,': 4.1109,
+        'eol:;': 6.5944,
+        'eol:>': 3.434,
+        'eol:e': 2.3979,
+        'eol:s': 3.0445,
+        'eol:{': 5.8608,
+        'eol:}': 5.3519,
+        'error': 3.0445,
+        'export': 3.0445,
+        'for': 3.0445,
+        'for (': 3.0445,
+        'from': 2.3979,
+        'function': 4.5109,
+        'function (': 3.434,
+        'get': 3.0445,
+        'get (': 3.0445,
+        'id': 3.9318,
+        'id )': 3.0445,
+        'id :': 2.3979,
+        'if': 3.7136,
+        'if (': 3.7136,
+        'import': 2.3979,
+        'item': 4.2627,
+        'item )': 2.3979,
+        'items': 3.0445,
+        'items .': 2.3979,
+        'json': 3.9318,
+        'json (': 3.9318,
+        'key': 2.3979,
+        'length': 3.434,
+        'let': 3.434,
+        'log': 4.2627,
+        'log (': 4.2627,
+        'main': 3.0445,
+        'main (': 3.0445,
+        'map': 3.434,
+        'map (': 3.434,
+        'name': 4.7958,
+        'name ,': 3.7136,
+        'name :': 2.3979,
+        'new': 3.0445,
+        'null': 3.0445,
+        'null )': 2.3979,
+        'res': 4.2627,
+        'res .': 3.7136,
+        'return': 4.3944,
+        'return _': 2.3979,
+        'self': 3.434,
+        'self .': 2.3979,
+        'shape:PascalCase': 4.3944,
+        'shape:UPPER': 2.3979,
+        'shape:camelCase': 5.6021,
+        'shape:lower': 8.1377,
+        'sum': 3.7136,
+        'this': 4.7095,
+        'this .': 4.1109,
+        'this ;': 3.7136,
+        'try': 2.3979,
+        'undefined': 2.3979,
+        'user': 3.7136,
+        'value': 3.9318,
+        'var': 3.7136,
+        '{': 6.1964,
+        '{ (': 3.7136,
+        '{ const': 3.7136,
+        '{ if': 3.0445,
+        '{ return': 3.0445,
+        '{ this': 3.434,
+        '{ }': 2.3979,
+        '}': 6.1964,
+        '} )': 4.8752,
+        '} ;': 3.9318,
+        '} return': 2.3979,
+        '} }': 4.1109,
+    }),
+    'python': (-9.9212, {
+        '!=': 2.3979,
+        '"': 5.4848,
+        '" )': 4.8752,
+        '" ,': 3.7136,
+        '" :': 3.434,
+        '(': 7.057,
+        '( "': 4.8752,
+        '( )': 5.3519,
+        '( *': 3.7136,
+        '( ,': 2.3979,
+        '( [': 2.3979,
+        '( _': 3.434,
+        '( item': 4.1109,
+        '( self': 5.1985,
+        '( {': 2.3979,
+        ')': 7.057,
+        ') )': 4.5109,
+        ') +': 2.3979,
+        ') ,': 3.9318,
+        ') :': 5.7398,
+        ') as': 3.9318,
+        ') def': 4.3944,
+        ') except': 3.434,
+        ') for': 3.7136,
+        ') if': 3.9318,
+        ') return': 4.2627,
+        '*': 4.8752,
+        '* *': 3.7136,
+        '+': 3.7136,
+        ',': 5.9162,
+        ', "': 3.0445,
+        ', )': 3.0445,
+        ', _': 2.3979,
+        '-': 3.9318,
+        '->': 3.0445,
+        '.': 6.5381,
+        '. append': 3.9318,
+        '. get': 3.0445,
+        '. pop': 3.7136,
+        ':': 6.6477,
+        ': _': 3.434,
+        ': def': 3.9318,
+        ': for': 3.434,
+        ': if': 4.2627,
+        ': raise': 3.434,
+        ': return': 4.2627,
+        ': self': 4.5109,
+        '=': 6.1549,
+        '= [': 4.5109,
+        '= await': 2.3979,
+        '= int': 3.434,
+        '= {': 3.7136,
+        '==': 4.5109,
+        '>': 2.3979,
+        'List': 3.0445,
+        'None': 3.434,
+        'Order': 2.3979,
+        'True': 3.434,
+        'User': 2.3979,
+        '[': 5.4424,
+        '[ ]': 4.3944,
+        '[ _': 3.0445,
+        ']': 5.4424,
+        '] )': 3.7136,
+        '] =': 2.3979,
+        '] print': 3.7136,
+        '_': 5.5645,
+        '_ )': 3.434,
+        '_ *': 3.0445,
+        '_ +': 2.3979,
+        '_ ,': 2.3979,
+        '_ .': 3.0445,
+        '_ :': 3.9318,
+        '_ =': 3.0445,
+        '_ >': 2.3979,
+        '_ in': 3.7136,
+        '__init__': 3.434,
+        '__init__ (': 3.434,
+        'add': 3.434,
+        'add (': 3.0445,
+        'and': 2.3979,
+        'append': 3.9318,
+        'append (': 3.9318,
+        'as': 4.1109,
+        'as _': 3.434,
+        'async': 3.0445,
+        'await': 3.0445,
+        'class': 3.9318,
+        'data': 3.434,
+        'def': 5.6384,
+        'def __init__': 3.434,
+        'default': 2.3979,
+        'else': 3.434,
+        'eol:"': 2.3979,
+        'eol:)': 6.2166,
+        'eol:0': 3.7136,
+        'eol::': 6.4938,
+        'eol:]': 4.7095,
+        'eol:e': 4.1109,
+        'eol:l': 2.3979,
+        'eol:s': 3.434,
+        'eol:t': 3.7136,
+        'eol:}': 3.7136,
+        'except': 3.434,
+        'for': 4.9488,
+        'for _': 3.7136,
+        'from': 3.434,
+        'func': 3.434,
+        'func (': 2.3979,
+        'get': 3.0445,
+        'get (': 3.0445,
+        'id': 2.3979,
+        'id :': 2.3979,
+        'if': 5.1417,
+        'if _': 3.434,
+        'if not': 3.7136,
+        'import': 4.1109,
+        'in': 4.9488,
+        'in range': 3.434,
+        'int': 3.7136,
+        'int ,': 2.3979,
+        'is': 2.3979,
+        'item': 4.7095,
+        'item )': 3.9318,
+        'items': 3.7136,
+        'items :': 3.0445,
+        'json': 3.0445,
+        'key': 2.3979,
+        'len': 4.2627,
+        'len (': 4.2627,
+        'main': 3.0445,
+        'main (': 3.0445,
+        'name': 3.7136,
+        'name :': 3.0445,
+        'not': 3.7136,
+        'open': 3.434,
+        'open (': 3.434,
+        'os': 2.3979,
+        'pop': 4.1109,
+        'pop (': 4.1109,
+        'print': 4.5109,
+        'print (': 4.5109,
+        'raise': 3.434,
+        'range': 3.434,
+        'range (': 3.434,
+        'return': 5.1985,
+        'return self': 3.434,
+        'self': 5.8608,
+        'self )': 4.7095,
+        'self ,': 3.434,
+        'self .': 5.3519,
+        'shape:PascalCase': 5.6384,
+        'shape:camelCase': 3.434,
+        'shape:lower': 8.489,
+        'shape:snake_case': 5.7071,
+        'sum': 3.0445,
+        'try': 3.434,
+        'try :': 3.434,
+        'type': 2.3979,
+        'user': 4.3944,
+        'value': 3.7136,
+        'while': 3.0445,
+        'with': 3.9318,
+        'with open': 3.434,
+        '{': 3.9318,
+        '{ _': 3.0445,
+        '{ }': 3.0445,
+        '}': 3.9318,
+        '} )': 2.3979,
+        '} for': 2.3979,
+    }),
+    'typescript': (-10.0023, {
+        '!': 3.0445,
+        '"': 2.3979,
+        "'": 5.1417,
+        "' ,": 4.3944,
+        "' ;": 3.7136,
+        '(': 6.7105,
+        '( !': 3.0445,
+        "( '": 3.0445,
+        '( (': 3.434,
+        '( )': 5.4424,
+        '( [': 2.3979,
+        '( _': 3.434,
+        '( `': 3.7136,
+        '( const': 3.0445,
+        '( id': 2.3979,
+        '( item': 3.0445,
+        '( key': 4.2627,
+        '( {': 3.9318,
+        ')': 6.7105,
+        ') )': 4.1109,
+        ') +': 2.3979,
+        ') .': 3.0445,
+        ') :': 5.3033,
+        ') ;': 5.5255,
+        ') =>': 4.7095,
+        ') as': 3.7136,
+        ') export': 3.434,
+        ') {': 4.2627,
+        '+': 3.0445,
+        '+ _': 2.3979,
+        ',': 5.8608,
+        ', (': 3.0445,
+        ', _': 2.3979,
+        ', }': 3.9318,
+        '.': 5.8319,
+        '. get': 3.434,
+        '. json': 3.0445,
+        '. length': 3.434,
+        '. log': 3.0445,
+        ':': 6.7923,
+        ": '": 4.1109,
+        ': (': 3.7136,
+        ': Promise': 3.434,
+        ': User': 3.434,
+        ': _': 4.7095,
+        ': number': 4.5109,
+        ': string': 5.1985,
+        ': void': 4.2627,
+        ';': 6.5525,
+        '; const': 3.0445,
+        '; export': 3.7136,
+        '; for': 3.0445,
+        '; if': 2.3979,
+        '; return': 3.0445,
+        '; }': 5.7398,
+        '<': 5.8608,
+        '< Order': 2.3979,
+        '< _': 4.7095,
+        '< number': 3.7136,
+        '< string': 3.434,
+        '=': 5.8889,
+        "= '": 3.9318,
+        '= (': 4.1109,
+        '= ;': 2.3979,
+        '= [': 3.434,
+        '= await': 3.0445,
+        '= new': 3.434,
+        '= {': 4.1109,
+        '=>': 4.8752,
+        '=> void': 3.434,
+        '=> {': 3.9318,
+        '>': 5.8889,
+        '> (': 4.3944,
+        '> )': 3.7136,
+        '> ;': 3.434,
+        '> =': 4.1109,
+        '> _': 2.3979,
+        '> {': 4.3944,
+        '?': 4.1109,
+        '? :': 3.434,
+        'Order': 3.434,
+        'Promise': 4.1109,
+        'Promise <': 4.1109,
+        'User': 4.2627,
+        '[': 5.1417,
+        '[ ]': 4.8752,
+        ']': 5.1417,
+        '] )': 3.7136,
+        '] ;': 3.9318,
+        '] =': 3.7136,
+        '_': 5.8319,
+        '_ )': 3.7136,
+        '_ +': 2.3979,
+        '_ .': 2.3979,
+        '_ :': 3.434,
+        '_ ;': 3.0445,
+        '_ <': 2.3979,
+        '_ =': 3.0445,
+        '_ >': 4.7095,
+        '_ [': 3.434,
+        '_ |': 3.434,
+        '_ }': 3.0445,
+        '`': 3.9318,
+        '` )': 3.7136,
+        'add': 3.0445,
+        'add (': 2.3979,
+        'as': 3.7136,
+        'as _': 3.0445,
+        'async': 3.0445,
+        'await': 3.7136,
+        'boolean': 2.3979,
+        'class': 4.2627,
+        'console': 3.0445,
+        'console .': 3.0445,
+        'const': 5.0173,
+        'constructor': 3.434,
+        'constructor (': 3.434,
+        'data': 3.0445,
+        'eol:)': 3.434,
+        'eol:,': 4.8752,
+        'eol:;': 6.5236,
+        'eol:>': 2.3979,
+        'eol:{': 6.0426,
+        'eol:}': 5.9162,
+        'error': 3.0445,
+        'export': 4.9488,
+        'export class': 3.9318,
+        'export const': 3.434,
+        'export function': 3.7136,
+        'for': 3.0445,
+        'for (': 3.0445,
+        'from': 2.3979,
+        'function': 4.5109,
+        'get': 4.1109,
+        'get (': 3.434,
+        'id': 3.434,
+        'id :': 3.434,
+        'if': 3.434,
+        'if (': 3.434,
+        'import': 2.3979,
+        'interface': 3.7136,
+        'item': 3.0445,
+        'item )': 2.3979,
+        'items': 4.6151,
+        'items .': 3.9318,
+        'items :': 3.434,
+        'json': 3.0445,
+        'json (': 3.0445,
+        'key': 4.2627,
+        'key :': 3.434,
+        'length': 3.434,
+        'let': 3.7136,
+        'log': 3.0445,
+        'log (': 3.0445,
+        'name': 3.434,
+        'name :': 3.434,
+        'new': 3.7136,
+        'null': 3.7136,
+        'null )': 2.3979,
+        'number': 5.0173,
+        'number )': 3.434,
+        'number >': 4.1109,
+        'of': 3.0445,
+        'private': 3.9318,
+        'public': 2.3979,
+        'readonly': 3.434,
+        'return': 4.7958,
+        'shape:PascalCase': 6.5806,
+        'shape:UPPER': 3.0445,
+        'shape:camelCase': 5.6384,
+        'shape:lower': 8.1608,
+        'string': 5.3519,
+        'string )': 3.7136,
+        'string ,': 3.9318,
+        'string ;': 4.2627,
+        'this': 4.3944,
+        'this .': 4.3944,
+        'type': 3.0445,
+        'undefined': 3.9318,
+        'undefined {': 3.434,
+        'user': 2.3979,
+        'value': 3.7136,
+        'void': 4.6151,
+        'void ;': 3.434,
+        'void {': 3.9318,
+        '{': 6.3818,
+        '{ const': 3.434,
+        '{ if': 3.0445,
+        '{ private': 3.434,
+        '{ return': 4.3944,
+        '{ this': 3.434,
+        '{ }': 3.7136,
+        '|': 4.3944,
+        '| undefined': 3.434,
+        '}': 6.3818,
+        '} )': 4.3944,
+        '} ;': 4.1109,
+        '} return': 3.0445,
+        '} }': 4.1109,
+    }),
+    'unknown': (-8.5108, {
+        '!': 2.3979,
+        '"': 3.0445,
+        ',': 4.9488,
+        '-': 4.5109,
+        '.': 5.1417,
+        ':': 4.2627,
+        '?': 2.3979,
+        'Name': 2.3979,
+        'The': 3.7136,
+        '_': 4.1109,
+        '_ :': 3.0445,
+        'and': 4.5109,
+        'by': 3.434,
+        'eol:,': 3.434,
+        'eol:.': 4.9488,
+        'eol::': 3.0445,
+        'eol:e': 3.434,
+        'eol:l': 2.3979,
+        'eol:s': 3.434,
+        'eol:t': 3.0445,
+        'for': 3.7136,
+        'if': 2.3979,
+        'is': 3.9318,
+        'items': 2.3979,
+        'let': 2.3979,
+        'make': 2.3979,
+        'of': 3.9318,
+        'open': 2.3979,
+        'shape:PascalCase': 5.9428,
+        'shape:lower': 7.8244,
+        'the': 5.1985,
+        'time': 3.434,
+        'to': 4.6151,
+        'with': 2.3979,
+    }),
+}
+
+PROFILES = {
+    "vocabulary": frozenset().union(*(weights for _, weights in LANGUAGES.values())),
+    "languages": LANGUAGES,
+}
@@ -0,0 +1,214 @@
+"""Chunked log analysis behind /analyze-logs and /analyze-logs/file.
+
+LogStats holds everything the analyzer reports as counters that can be fed
+one newline-terminated chunk at a time and merged, so a log of any size is
+read in constant memory: files on the server are memory-mapped and cut into
+ranges at newline boundaries (each range can be analyzed by a different
+process and the partial LogStats merged in order), uploads are read through a
+buffered reader that carries the partial last line over to the next chunk.
+Besides the level counts every chunk goes through the template miner
+(log_templates) and, when its lines carry timestamps, into per-bucket counts
+(log_timeseries); both merge across chunks the same way.
+"""
+import mmap
+import os
+
+from .log_templates import TemplateMiner
+from .log_timeseries import BUCKET_SECONDS, Timeline, time_runs
+
+CHUNK_BYTES = int(os.environ.get("TESTSIGHT_LOG_CHUNK_BYTES", str(4 * 1024 * 1024)))
+# Directory /analyze-logs/file may read server-side paths from; unset disables path ingestion
+LOG_ROOT = os.environ.get("TESTSIGHT_LOG_ROOT", "")
+
+TOP_TEMPLATES = 20
+MAX_SPIKE_INSIGHTS = 3
+
+ERROR_PATTERNS = (("CONNECTION", "connection"), ("TIMEOUT", "timeout"), ("NULL", "null_reference"))
+
+
+# Level index of a line, as counted in Timeline
+ERROR, WARNING, INFO, OTHER = range(4)
+
+
+class LogStats:
+    def __init__(self, interval: int = BUCKET_SECONDS):
+        self.total_entries = 0
+        self.errors = 0
+        self.warnings = 0
+        self.info = 0
+        self.bytes = 0
+        self.error_patterns = {}
+        self.templates = TemplateMiner()
+        self.timeline = Timeline(interval)
+
+    def feed(self, text: str):
+        """Count one chunk of lines; a trailing newline does not start another entry."""
+        lines = text.upper().split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        levels = []
+        error_patterns = self.error_patterns
+        for line in lines:
+            if "ERROR" in line or "FATAL" in line:
+                levels.append(ERROR)
+                for keyword, pattern in ERROR_PATTERNS:
+                    if keyword in line:
+                        error_patterns[pattern] = error_patterns.get(pattern, 0) + 1
+                        break
+            elif "WARN" in line:
+                levels.append(WARNING)
+            elif "INFO" in line:
+                levels.append(INFO)
+            else:
+                levels.append(OTHER)
+        self.errors += levels.count(ERROR)
+        self.warnings += levels.count(WARNING)
+        self.info += levels.count(INFO)
+        runs = time_runs(lines, self.timeline.interval, self.timeline.last, text)
+        self.templates.feed(text, self.total_entries, runs)
+        self.timeline.add(runs, levels)
+        self.total_entries += len(lines)
+
+    def feed_bytes(self, data: bytes):
+        self.bytes += len(data)
+        self.feed(data.decode("utf-8", errors="replace"))
+
+    def merge(self, other: "LogStats") -> "LogStats":
+        """Add the counts of other, the stats of the chunks that follow this one's."""
+        self.templates.merge(other.templates, self.total_entries, self.timeline.last)
+        self.timeline.merge(other.timeline)
+        self.total_entries += other.total_entries
+        self.errors += other.errors
+        self.warnings += other.warnings
+        self.info += other.info
+        self.bytes += other.bytes
+        for pattern, count in other.error_patterns.items():
+            self.error_patterns[pattern] = self.error_patterns.get(pattern, 0) + count
+        return self
+
+    def insights(self, anomalies: list = ()) -> list:
+        insights = []
+        for pattern, count in self.error_patterns.items():
+            if count >= 3:
+                insights.append({
+                    "type": "critical",
+                    "message": f"{pattern.replace('_', ' ').title()} errors detected ({count} occurrences)"
+                })
+        if self.warnings > self.errors * 2:
+            insights.append({
+                "type": "warning",
+                "message": f"High warning count ({self.warnings}) - review warning messages"
+            })
+        if self.total_entries and self.errors > self.total_entries * 0.1:
+            insights.append({
+                "type": "critical",
+                "message": f"Error rate is high ({(self.errors / self.total_entries * 100):.1f}%)"
+            })
+        spikes = [a for a in anomalies if a["series"] == "errors"]
+        for spike in sorted(spikes, key=lambda a: -a["z"])[:MAX_SPIKE_INSIGHTS]:
+            insights.append({
+                "type": "critical",
+                "message": f"Error spike at {spike['time']}: {spike['count']} errors vs ~{spike['expected']:g} expected"
+            })
+        if not insights:
+            insights.append({
+                "type": "info",
+                "message": "Log analysis complete - no critical patterns detected"
+            })
+        return insights
+
+    def result(self, top_templates: int = TOP_TEMPLATES) -> dict:
+        ranked = self.templates.ranked()
+        timeline, anomalies = self.timeline.result(ranked)
+        return {
+            "status": "success",
+            "total_entries": self.total_entries,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "info": self.info,
+            "insights": self.insights(anomalies),
+            "template_count": len(ranked),
+            "unmatched_lines": self.templates.unmatched,
+            "templates": [t.to_dict() for t in ranked[:top_templates]],
+            "timeline": timeline,
+            "anomalies": anomalies,
+        }
+
+
+def text_chunks(text: str, size: int = CHUNK_BYTES):
+    """Newline-terminated slices of text (the last one may lack the newline)."""
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start + size - 1)
+        end = len(text) if end == -1 else end + 1
+        yield text[start:end]
+        start = end
+
+
+def stream_chunks(f, size: int = CHUNK_BYTES):
+    """Newline-terminated chunks of about size bytes read from a binary file object."""
+    tail = b""
+    while True:
+        block = f.read(size)
+        if not block:
+            break
+        if tail:
+            block = tail + block
+        cut = block.rfind(b"\n") + 1
+        # A line longer than the chunk keeps growing the tail until its newline shows up
+        tail = block[cut:]
+        if cut:
+            yield block[:cut]
+    if tail:
+        yield tail
+
+
+def file_ranges(path: str, size: int = CHUNK_BYTES) -> list:
+    """(start, end) byte ranges covering the file, each ending just after a newline."""
+    length = os.path.getsize(path)
+    if not length:
+        return []
+    ranges = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < length:
+            end = mm.find(b"\n", start + size - 1) if start + size < length else -1
+            end = length if end == -1 else end + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def analyze_bytes(data: bytes, interval: int = BUCKET_SECONDS) -> LogStats:
+    stats = LogStats(interval)
+    stats.feed_bytes(data)
+    return stats
+
+
+def analyze_range(path: str, start: int, end: int, interval: int = BUCKET_SECONDS) -> LogStats:
+    """LogStats of one byte range of a file; runs in an analysis pool process."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return analyze_bytes(mm[start:end], interval)
+
+
+def analyze_text(logs: str, interval: int = BUCKET_SECONDS) -> dict:
+    """/analyze-logs on a request body; totals follow split('\\n'), so a trailing newline is an entry."""
+    stats = LogStats(interval)
+    for chunk in text_chunks(logs):
+        stats.feed(chunk)
+    if logs.endswith("\n"):
+        stats.total_entries += 1
+    return stats.result()
+
+
+def resolve_log_path(path: str) -> str:
+    """Absolute path of a server-side log under TESTSIGHT_LOG_ROOT; ValueError otherwise."""
+    if not LOG_ROOT:
+        raise ValueError("Server-side log paths are disabled (set TESTSIGHT_LOG_ROOT)")
+    root = os.path.realpath(LOG_ROOT)
+    full = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, full]) != root:
+        raise ValueError("Path is outside the log directory")
+    if not os.path.isfile(full):
+        raise ValueError("Log file not found")
+    return full
@@ -0,0 +1,216 @@
+"""Drain-style log template mining.
+
+Variable tokens (anything containing a digit: ids, counts, timestamps, IPs,
+hex) are masked to <*>, and the masked lines are grouped into templates with
+the fixed-depth prefix tree from Drain (He et al., ICWS 2017): lines are
+routed by token count and then token by token over their first positions (a
+wildcard, or a token past max_children, goes down the <*> branch) to a
+small leaf of candidate templates, join the most similar one when enough
+tokens agree and generalize its differing positions to <*>, or start a new
+template. Positions count from the
+first constant token, since leading wildcards (timestamps, ids) carry no
+information. Leaves hold at most max_leaf templates, so a line is compared
+with a bounded number of candidates however varied the log is; a line that
+finds no match in a full leaf, or arrives after max_templates, is counted
+as unmatched.
+
+A chunk is first grouped by line with its digits folded to 0 (translate,
+Counter and first/last index maps, all C loops), so masking and the tree walk
+happen once per distinct line shape rather than once per line; shapes that
+went unmatched are remembered too. A group and a template from another
+chunk's miner are inserted the same way, which is what makes miners
+mergeable.
+"""
+import os
+import re
+from collections import Counter
+from operator import eq
+
+WILDCARD = "<*>"
+MASK_RE = re.compile(r"(?<!\S)[^\s\d]*\d\S*")
+FOLD_DIGITS = str.maketrans("123456789", "000000000")
+
+MAX_TEMPLATES = int(os.environ.get("TESTSIGHT_LOG_MAX_TEMPLATES", "5000"))
+MAX_LEAF = 64
+# Masked lines remembered with their template (or UNMATCHED), so repeats skip the tree walk
+MEMO_SIZE = 50000
+UNMATCHED = object()
+SAMPLES = 3
+SAMPLE_CHARS = 300
+
+
+class Template:
+    __slots__ = ("tokens", "count", "first", "last", "samples", "series")
+
+    def __init__(self, tokens: list, count: int, first: int, last: int, samples: list, series: Counter):
+        self.tokens = tokens
+        self.count = count
+        self.first = first
+        self.last = last
+        self.samples = samples
+        self.series = series  # time bucket -> lines, see log_timeseries
+
+    def to_dict(self) -> dict:
+        return {
+            "template": " ".join(self.tokens),
+            "count": self.count,
+            "first_line": self.first,
+            "last_line": self.last,
+            "samples": self.samples,
+        }
+
+
+def probe(tokens: list) -> list:
+    """tokens with the wildcards replaced by None, which no template token equals."""
+    return [None if token == WILDCARD else token for token in tokens]
+
+
+def similarity(template: list, probed: list) -> tuple:
+    """(share of positions where the template's constant token matches, wildcard count)
+
+    probed comes from probe(), so equal positions are exactly the matching constants and the count
+    runs in C.
+    """
+    return sum(map(eq, template, probed)) / len(probed), template.count(WILDCARD)
+
+
+class TemplateMiner:
+    def __init__(self, depth: int = 6, threshold: float = 0.4, max_children: int = 100,
+                 max_templates: int = MAX_TEMPLATES, max_leaf: int = MAX_LEAF):
+        # Drain's depth counts the root, length and leaf layers; the rest route on tokens
+        self.prefix_tokens = max(depth - 3, 1)
+        self.threshold = threshold
+        self.max_children = max_children
+        self.max_templates = max_templates
+        self.max_leaf = max_leaf
+        self.templates = []
+        self.unmatched = 0
+        self._root = {}
+        self._memo = {}
+
+    def __getstate__(self):
+        # The memo only speeds up this process's next chunk
+        state = self.__dict__.copy()
+        state["_memo"] = {}
+        return state
+
+    def feed(self, text: str, base: int = 0, runs: list = ()):
+        """Mine one newline-terminated chunk whose first line is line base + 1 of the log.
+
+        runs, (time bucket, start, end) line ranges from log_timeseries, adds the lines to their template's series.
+        """
+        # Lines that differ only in their digits share a shape; folding digits with
+        # translate() is far cheaper than masking tokens line by line
+        folded = text.translate(FOLD_DIGITS).split("\n")
+        if len(runs) > 1:
+            run_counts = [(bucket, Counter(folded[start:end])) for bucket, start, end in runs]
+            counts = Counter()
+            for _, part in run_counts:
+                counts.update(part)
+            tail = len(folded) - runs[-1][2]
+            if tail:
+                counts.update(folded[-tail:])
+        else:
+            counts = Counter(folded)
+            run_counts = [(runs[0][0], counts)] if runs else []
+        last = dict(zip(folded, range(len(folded))))
+        first = dict(zip(reversed(folded), range(len(folded) - 1, -1, -1)))
+        memo = self._memo
+        joined = {}
+        lines = None
+        for key, count in counts.items():
+            i, j = first[key], last[key]
+            template = memo.get(key)
+            if template is UNMATCHED:
+                self.unmatched += count
+                continue
+            if template is not None:
+                template.count += count
+                template.last = max(template.last, base + j + 1)
+                joined[key] = template
+                continue
+            tokens = MASK_RE.sub(WILDCARD, key).split()
+            if not tokens:
+                continue
+            if lines is None:
+                lines = text.split("\n")
+            samples = [lines[i].strip()[:SAMPLE_CHARS]]
+            if j != i and lines[j].strip() != samples[0]:
+                samples.append(lines[j].strip()[:SAMPLE_CHARS])
+            template = self.add(tokens, count, base + i + 1, base + j + 1, samples)
+            if len(memo) >= MEMO_SIZE:
+                memo.clear()
+            memo[key] = UNMATCHED if template is None else template
+            if template is not None:
+                joined[key] = template
+        for bucket, part in run_counts:
+            for key, n in part.items():
+                template = joined.get(key)
+                if template is not None:
+                    template.series[bucket] += n
+
+    def merge(self, other: "TemplateMiner", base: int = 0, bucket: int | None = None) -> "TemplateMiner":
+        """Add the templates of other, whose line numbers are offset by base.
+
+        Lines other saw before any timestamp are counted in bucket.
+        """
+        for template in sorted(other.templates, key=lambda t: t.first):
+            series = template.series
+            if None in series and bucket is not None:
+                series = Counter(series)
+                series[bucket] += series.pop(None)
+            self.add(list(template.tokens), template.count, template.first + base, template.last + base,
+                     template.samples, series)
+        self.unmatched += other.unmatched
+        return self
+
+    def add(self, tokens: list, count: int, first: int, last: int, samples: list, series: Counter | None = None):
+        """Insert count lines of this shape; returns the template they joined (None when they went unmatched)."""
+        leaf = self._leaf(tokens)
+        probed = probe(tokens)
+        best = None
+        best_score = (-1.0, -1)
+        for template in leaf:
+            score = similarity(template.tokens, probed)
+            if score > best_score:
+                best, best_score = template, score
+        if best is not None and best_score[0] >= self.threshold:
+            if best.tokens != tokens:
+                best.tokens = [t if t == token else WILDCARD for t, token in zip(best.tokens, tokens)]
+            best.count += count
+            best.first = min(best.first, first)
+            best.last = max(best.last, last)
+            for sample in samples:
+                if len(best.samples) < SAMPLES and sample not in best.samples:
+                    best.samples.append(sample)
+            if series:
+                best.series.update(series)
+            return best
+        if len(self.templates) >= self.max_templates or len(leaf) >= self.max_leaf:
+            self.unmatched += count
+            return None
+        template = Template(tokens, count, first, last, samples[:SAMPLES], Counter(series or ()))
+        leaf.append(template)
+        self.templates.append(template)
+        return template
+
+    def _leaf(self, tokens: list) -> list:
+        node = self._root.setdefault(len(tokens), {})
+        start = 0
+        while start < len(tokens) and tokens[start] == WILDCARD:
+            start += 1
+        # As in Drain, the last token never routes: it is too often the variable part of a short line
+        prefix = tokens[start:min(start + self.prefix_tokens, len(tokens) - 1)]
+        prefix += [WILDCARD] * (self.prefix_tokens - len(prefix))
+        for token in prefix[:-1]:
+            if token not in node and len(node) >= self.max_children:
+                token = WILDCARD
+            node = node.setdefault(token, {})
+        token = prefix[-1]
+        if token not in node and len(node) >= self.max_children:
+            token = WILDCARD
+        return node.setdefault(token, [])
+
+    def ranked(self) -> list:
+        """Templates, most frequent first."""
+        return sorted(self.templates, key=lambda t: (-t.count, t.first))
@@ -0,0 +1,203 @@
+"""Time-bucketed log counts and spike detection for the log analyzer.
+
+Timestamps are read from a fixed ISO-style prefix (`2024-01-01 10:00:00`,
+optionally bracketed, `T` or `/` separators accepted). Logs are written in
+time order, so a chunk collapses into a few runs of consecutive lines that
+share a bucket: the lines' first 20 characters are sliced and grouped by
+map()/groupby() in C, and only each new prefix is parsed. Lines without a
+timestamp (stack traces, continuations) join the run before them. Counting
+per run is then list.count() on the levels and Counter() on the template
+keys over slices, so no per-line Python runs here.
+
+Series are returned dense and columnar for charting, coarsened to at most
+TESTSIGHT_LOG_MAX_POINTS points. Spikes are flagged with an exponentially
+weighted mean and variance: a bucket whose count is more than THRESHOLD
+standard deviations above the EWMA of the buckets before it is an anomaly.
+"""
+import calendar
+import math
+import os
+import re
+import time
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+
+TIMESTAMP_RE = re.compile(r"\[?(\d{4}[-/]\d\d[-/]\d\d[ T]\d\d:\d\d:\d\d)")
+PREFIX = itemgetter(slice(0, 20))
+# The timestamp formats above with every digit folded to 0
+FOLD_DIGITS = str.maketrans("123456789", "000000000")
+FOLDED_STAMPS = ("0000-00-00 00:00:00", "0000-00-00T00:00:00", "0000/00/00 00:00:00", "0000/00/00T00:00:00")
+
+BUCKET_SECONDS = 60
+MAX_POINTS = int(os.environ.get("TESTSIGHT_LOG_MAX_POINTS", "1500"))
+# Templates that get their own series in the timeline
+SERIES_TEMPLATES = 10
+
+ALPHA = 0.3
+THRESHOLD = 3.0
+WARMUP = 5
+MIN_COUNT = 5
+
+LEVELS = ("errors", "warnings", "info", "other")
+
+
+def parse_timestamp(stamp: str, days: dict) -> int | None:
+    """Epoch seconds of a fixed-format 'YYYY-MM-DD HH:MM:SS' (taken as UTC), None when out of range.
+
+    days caches midnights.
+    """
+    day = stamp[:10]
+    midnight = days.get(day)
+    if midnight is None:
+        year, month, mday = int(stamp[:4]), int(stamp[5:7]), int(stamp[8:10])
+        if year < 1 or not (1 <= month <= 12 and 1 <= mday <= 31):
+            return None
+        try:
+            midnight = days[day] = calendar.timegm((year, month, mday, 0, 0, 0))
+        except (ValueError, OverflowError):
+            return None
+    hour, minute, second = int(stamp[11:13]), int(stamp[14:16]), int(stamp[17:19])
+    if hour > 23 or minute > 59 or second > 60:
+        return None
+    return midnight + hour * 3600 + minute * 60 + second
+
+
+def has_timestamps(text: str) -> bool:
+    """Cheap check, a few substring searches, for whether time_runs() can find anything in text."""
+    folded = text.translate(FOLD_DIGITS)
+    return any(stamp in folded for stamp in FOLDED_STAMPS)
+
+
+def time_runs(lines: list, interval: int, current: int | None = None, text: str | None = None) -> list:
+    """[(bucket, start, end)] runs of consecutive lines in the same bucket (epoch // interval).
+
+    Lines without a timestamp join the run before them; at the start of the
+    chunk that is current, the bucket of the line before the chunk, or None
+    until Timeline.merge() learns it. text, the chunk the lines come from,
+    lets a chunk without timestamps skip the line scan.
+    """
+    if text is not None and not has_timestamps(text):
+        return [(current, 0, len(lines))] if lines else []
+    days = {}
+    bucket_of = {}
+    runs = []
+    start = 0
+    for prefix, group in groupby(map(PREFIX, lines)):
+        end = start + len(list(group))
+        if prefix in bucket_of:
+            bucket = bucket_of[prefix]
+        else:
+            m = TIMESTAMP_RE.match(prefix)
+            epoch = parse_timestamp(m.group(1), days) if m else None
+            bucket = bucket_of[prefix] = None if epoch is None else epoch // interval
+        if bucket is None:
+            bucket = current
+        if runs and runs[-1][0] == bucket:
+            runs[-1] = (bucket, runs[-1][1], end)
+        else:
+            runs.append((bucket, start, end))
+        current = bucket
+        start = end
+    return runs
+
+
+def ewma_anomalies(values: list, alpha: float = ALPHA, threshold: float = THRESHOLD,
+                   warmup: int = WARMUP, min_count: int = MIN_COUNT) -> list:
+    """(index, value, expected, z) for points more than threshold EWMA deviations above the running mean."""
+    anomalies = []
+    if not values:
+        return anomalies
+    mean = float(values[0])
+    var = 0.0
+    for i in range(1, len(values)):
+        x = values[i]
+        # Counts are at least Poisson-noisy, which also keeps z finite after a flat history
+        std = max(math.sqrt(var), math.sqrt(mean), 1.0)
+        z = (x - mean) / std
+        if i >= warmup and x >= min_count and z >= threshold:
+            anomalies.append((i, x, mean, z))
+        diff = x - mean
+        incr = alpha * diff
+        mean += incr
+        var = (1 - alpha) * (var + diff * incr)
+    return anomalies
+
+
+def iso(epoch: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(epoch))
+
+
+class Timeline:
+    def __init__(self, interval: int = BUCKET_SECONDS):
+        self.interval = interval
+        self.counts = Counter()  # (bucket, level index) -> lines; bucket None before the first timestamp
+        self.last = None  # bucket of the last timestamped line
+
+    def add(self, runs: list, levels: list):
+        counts = self.counts
+        for bucket, start, end in runs:
+            part = levels[start:end]
+            for level in range(len(LEVELS)):
+                n = part.count(level)
+                if n:
+                    counts[bucket, level] += n
+        if runs and runs[-1][0] is not None:
+            self.last = runs[-1][0]
+
+    def merge(self, other: "Timeline") -> "Timeline":
+        """Add other's counts; its lines before any timestamp belong to this timeline's last bucket."""
+        for (bucket, level), n in other.counts.items():
+            self.counts[self.last if bucket is None else bucket, level] += n
+        if other.last is not None:
+            self.last = other.last
+        return self
+
+    def result(self, templates: list) -> tuple:
+        """(timeline dict or None, anomalies) for the level counts and the given Template objects."""
+        buckets = {bucket for bucket, _ in self.counts if bucket is not None}
+        if not buckets:
+            return None, []
+        first, last = min(buckets), max(buckets)
+        factor = math.ceil((last - first + 1) / MAX_POINTS)
+        start = first // factor
+        points = last // factor - start + 1
+
+        def dense(counts) -> list:
+            values = [0] * points
+            for bucket, n in counts:
+                if bucket is not None:
+                    values[bucket // factor - start] += n
+            return values
+
+        per_level = {level: [] for level in range(len(LEVELS))}
+        for (bucket, level), n in self.counts.items():
+            per_level[level].append((bucket, n))
+        series = {LEVELS[level]: dense(counts) for level, counts in per_level.items()}
+        series["total"] = [sum(column) for column in zip(*series.values())]
+        interval = self.interval * factor
+        times = [iso((start + i) * interval) for i in range(points)]
+
+        anomalies = []
+        for name in ("errors", "warnings", "total"):
+            for i, value, expected, z in ewma_anomalies(series[name]):
+                anomalies.append({"time": times[i], "series": name, "count": value,
+                                  "expected": round(expected, 1), "z": round(z, 1)})
+        template_series = []
+        for template in templates[:SERIES_TEMPLATES]:
+            counts = dense(template.series.items())
+            template_series.append({"template": " ".join(template.tokens), "counts": counts})
+            for i, value, expected, z in ewma_anomalies(counts):
+                anomalies.append({"time": times[i], "series": "template", "template": " ".join(template.tokens),
+                                  "count": value, "expected": round(expected, 1), "z": round(z, 1)})
+        anomalies.sort(key=lambda a: (a["time"], a["series"]))
+        timeline = {
+            "bucket_seconds": interval,
+            "times": times,
+            "total": series["total"],
+            "errors": series["errors"],
+            "warnings": series["warnings"],
+            "info": series["info"],
+            "templates": template_series,
+        }
+        return timeline, anomalies
@@ -0,0 +1,282 @@
+"""In-process metrics behind /metrics (Prometheus text format) and /metrics/summary.
+
+Recording takes no lock: every thread updates its own shard of each metric, a
+dict keyed by label values that no other thread writes, and each update is a
+couple of dict and list operations the GIL keeps atomic. The shards are only
+added up when the metrics are read. Histograms have fixed buckets, and the
+summary's percentiles are interpolated within them the way Prometheus'
+histogram_quantile() does.
+
+MetricsMiddleware records every HTTP request under its route template (not
+the raw path, which would give a series per job id); analyzers, the
+write-behind DB writers and the job stages record their own timings.
+"""
+import bisect
+import math
+import threading
+import time
+
+# Seconds; roughly x2.5 steps from a cached analyzer call to a slow repository scan
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STAGE_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+# The routes behind each tool of the dashboard, named as in /stats
+TOOL_ROUTES = {
+    "tests": ("/generate-tests",),
+    "bugs": ("/debug",),
+    "reviews": ("/review",),
+    "refactors": ("/refactor",),
+    "log_analysis": ("/analyze-logs", "/analyze-logs/file"),
+}
+UNMATCHED = "<unmatched>"
+
+REGISTRY = []
+
+
+def escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            # Once per thread; the hot path above never takes the lock
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def _snapshots(self) -> list:
+        with self._lock:
+            shards = list(self._shards)
+        # dict.items() copies in one C call, so a writer cannot resize the dict mid-copy
+        return [list(shard.items()) for shard in shards]
+
+    def render(self) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> dict:
+        totals = {}
+        for items in self._snapshots():
+            for labels, value in items:
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> list:
+        lines = super().render()
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{format_labels(self.labels, labels)} {format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """A counter that also goes down; the shards hold each thread's net change."""
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, labels: tuple = ()):
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # Per-bucket counts (the last one is +Inf), then the sum
+            entry = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect.bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def values(self) -> dict:
+        """{labels: (per-bucket counts, sum)}"""
+        totals = {}
+        for items in self._snapshots():
+            for labels, entry in items:
+                entry = list(entry)
+                total = totals.get(labels)
+                if total is None:
+                    totals[labels] = entry
+                else:
+                    for i, n in enumerate(entry):
+                        total[i] += n
+        return {labels: (entry[:-1], entry[-1]) for labels, entry in totals.items()}
+
+    def merged(self, keep) -> tuple:
+        """(per-bucket counts, sum) over the label sets for which keep(labels) is true."""
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for labels, (bucket_counts, value_sum) in self.values().items():
+            if keep(labels):
+                counts = [a + b for a, b in zip(counts, bucket_counts)]
+                total += value_sum
+        return counts, total
+
+    def render(self) -> list:
+        lines = super().render()
+        for labels, (counts, value_sum) in sorted(self.values().items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                le = 'le="' + format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {format_value(value_sum)}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+def quantile(q: float, counts: list, buckets: tuple) -> float | None:
+    """Estimate of the q-quantile from per-bucket counts, interpolating linearly inside the bucket."""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    cumulative = 0
+    for i, n in enumerate(counts):
+        if cumulative + n >= rank and n:
+            if i == len(buckets):
+                # Beyond the last bound all we know is that it is at least that
+                return buckets[-1]
+            lower = buckets[i - 1] if i else 0.0
+            return lower + (buckets[i] - lower) * (rank - cumulative) / n
+        cumulative += n
+    return buckets[-1]
+
+
+def distribution(counts: list, value_sum: float, buckets: tuple) -> dict:
+    """count, mean and the QUANTILES (as p50, p95, ...) of a histogram, in milliseconds."""
+    count = sum(counts)
+    result = {"count": count, "mean_ms": round(value_sum / count * 1000, 2) if count else None}
+    for q in QUANTILES:
+        value = quantile(q, counts, buckets)
+        result[f"p{round(q * 100)}_ms"] = round(value * 1000, 2) if value is not None else None
+    return result
+
+
+HTTP_REQUESTS = Counter("testsight_http_requests_total", "HTTP requests by route template, method and status",
+                        ("route", "method", "status"))
+HTTP_IN_FLIGHT = Gauge("testsight_http_requests_in_flight", "HTTP requests being served", ("method",))
+HTTP_LATENCY = Histogram("testsight_http_request_duration_seconds",
+                         "Time to the end of the response by route template, method and status",
+                         ("route", "method", "status"))
+ANALYZER_LATENCY = Histogram("testsight_analyzer_duration_seconds",
+                             "Analyzer time per document on result cache misses", ("analyzer", "mode"))
+DB_WRITE_LATENCY = Histogram("testsight_db_write_duration_seconds",
+                             "Insert + commit time of activity log and job event batches", ("table",))
+DB_WRITE_ROWS = Counter("testsight_db_write_rows_total", "Activity log and job event rows written, failed or dropped",
+                        ("table", "outcome"))
+JOB_STAGE_DURATION = Histogram("testsight_job_stage_duration_seconds", "Duration of job stages (clone, test, ...)",
+                               ("stage",), buckets=STAGE_BUCKETS)
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def summary() -> dict:
+    """Latency percentiles per tool, route, analyzer, DB writer and job stage for the dashboard."""
+    buckets = HTTP_LATENCY.buckets
+    tools = {}
+    for tool, routes in TOOL_ROUTES.items():
+        counts, value_sum = HTTP_LATENCY.merged(lambda labels: labels[0] in routes)
+        tools[tool] = distribution(counts, value_sum, buckets)
+    per_route = {}
+    for (route, method, status), (counts, value_sum) in HTTP_LATENCY.values().items():
+        entry = per_route.setdefault((route, method), [[0] * len(counts), 0.0, 0])
+        entry[0] = [a + b for a, b in zip(entry[0], counts)]
+        entry[1] += value_sum
+        if status.startswith("5"):
+            entry[2] += sum(counts)
+    routes = [dict(route=route, method=method, errors=errors, **distribution(counts, value_sum, buckets))
+              for (route, method), (counts, value_sum, errors) in sorted(per_route.items())]
+
+    def by_label(histogram: Histogram, name: str) -> list:
+        return [dict({name: labels[0]}, **distribution(counts, value_sum, histogram.buckets))
+                for labels, (counts, value_sum) in sorted(histogram.values().items())]
+
+    analyzers = [dict(analyzer=analyzer, mode=mode, **distribution(counts, value_sum, ANALYZER_LATENCY.buckets))
+                 for (analyzer, mode), (counts, value_sum) in sorted(ANALYZER_LATENCY.values().items())]
+    return {
+        "in_flight": sum(HTTP_IN_FLIGHT.values().values()),
+        "tools": tools,
+        "routes": routes,
+        "analyzers": analyzers,
+        "db_writes": by_label(DB_WRITE_LATENCY, "table"),
+        "job_stages": by_label(JOB_STAGE_DURATION, "stage"),
+    }
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting and timing every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc((method,))
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec((method,))
+            # The router leaves the matched route in the scope
+            route = scope.get("route")
+            labels = (getattr(route, "path", None) or UNMATCHED, method, str(status))
+            HTTP_REQUESTS.inc(labels)
+            HTTP_LATENCY.observe(elapsed, labels)
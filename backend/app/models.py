@@ -1,23 +1,38 @@
-import sqlite3
 from pydantic import BaseModel
 from datetime import datetime
 import os
+import time
+from . import metrics
+from .db import ConnectionPool
+from .batch_writer import BatchWriter
 
 # Use a relative path that works on all platforms
 DB_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 os.makedirs(DB_DIR, exist_ok=True)
 DB = os.environ.get("TESTSIGHT_DB", os.path.join(DB_DIR, "test_sight.db"))
 
-# DB helper
+pool = ConnectionPool(DB)
+
+# Activity logging: "async" queues rows for group commit off the request path,
+# "sync" inserts and commits inline (the pre-queue behaviour)
+LOG_MODE = os.environ.get("TESTSIGHT_LOG_MODE", "async")
+LOG_SYNCHRONOUS = os.environ.get("TESTSIGHT_LOG_SYNCHRONOUS", "NORMAL").upper()
+LOG_QUEUE_SIZE = int(os.environ.get("TESTSIGHT_LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.environ.get("TESTSIGHT_LOG_BATCH_SIZE", "500"))
+LOG_FLUSH_MS = int(os.environ.get("TESTSIGHT_LOG_FLUSH_MS", "50"))
+if LOG_MODE not in ("async", "sync"):
+    raise ValueError(f"Invalid TESTSIGHT_LOG_MODE value: {LOG_MODE}")
+
+# DB helper: returns this thread's pooled connection, do not close it
 def get_conn():
-    conn = sqlite3.connect(DB, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return pool.get()
 
 # Initialize DB
 def init_db():
     conn = get_conn()
     cur = conn.cursor()
+    # Serialise concurrent initialisation (several API/worker processes)
+    cur.execute("BEGIN IMMEDIATE")
     cur.execute("""
     CREATE TABLE IF NOT EXISTS jobs (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -52,32 +67,283 @@ def init_db():
         user_id TEXT
     )
     """)
+    # Lease columns backing the durable job queue (see jobs.claim_job)
+    ensure_columns(cur, "jobs", {
+        "attempts": "INTEGER NOT NULL DEFAULT 0",
+        "lease_owner": "TEXT",
+        "lease_expires_at": "REAL",
+        "heartbeat_at": "TEXT",
+        "started_at": "TEXT",
+        "finished_at": "TEXT",
+        # Requested ref (branch/tag/sha) and whether to sparse-checkout Python paths only
+        "ref": "TEXT",
+        "sparse": "INTEGER NOT NULL DEFAULT 0",
+        # Number of parallel pytest processes to split the suite over
+        "shards": "INTEGER NOT NULL DEFAULT 1",
+        # "tests" (generate + run the suite) or "review" (see repo_review)
+        "kind": "TEXT NOT NULL DEFAULT 'tests'",
+    })
+    ensure_columns(cur, "runs", {"selection_mode": "TEXT"})
+    # Per-repository map from covered lines to tests (see test_impact)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS test_impact_maps (
+        repo_url TEXT PRIMARY KEY,
+        base_sha TEXT,
+        impact BLOB,
+        updated_at TEXT
+    )
+    """)
+    # Latest duration of every test per repository, used to balance shards
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS test_durations (
+        repo_url TEXT,
+        test_id TEXT,
+        duration REAL,
+        updated_at TEXT,
+        PRIMARY KEY (repo_url, test_id)
+    )
+    """)
+    # Normalised per-run results parsed from JUnit XML and coverage JSON
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS test_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER,
+        test_id TEXT,
+        outcome TEXT,
+        duration REAL,
+        message TEXT
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS coverage_files (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER,
+        path TEXT,
+        statements INTEGER,
+        missing INTEGER,
+        percent REAL
+    )
+    """)
+    # Stage transitions and output lines of running jobs (see job_events)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS job_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER,
+        kind TEXT,
+        data TEXT,
+        created_at TEXT
+    )
+    """)
+    # Per-file outcome and findings of repository review jobs
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS review_files (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER,
+        path TEXT,
+        language TEXT,
+        lines INTEGER,
+        quality_score INTEGER,
+        security_issues INTEGER,
+        findings INTEGER,
+        error TEXT
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS review_findings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER,
+        path TEXT,
+        line INTEGER,
+        severity TEXT,
+        message TEXT,
+        source TEXT
+    )
+    """)
+    create_activity_counters(cur)
+    # Secondary indexes backing the filtered keyset pages below
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_activity_logs_type_id ON activity_logs (activity_type, id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_activity_logs_status_id ON activity_logs (status, id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_activity_logs_created_at ON activity_logs (created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_id ON jobs (status, id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_runs_job_id ON runs (job_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_test_results_run_duration ON test_results (run_id, duration)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_test_results_test_id ON test_results (test_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_coverage_files_run_id ON coverage_files (run_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_job_events_job_id ON job_events (job_id, id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_review_files_job_findings ON review_files (job_id, findings)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_review_findings_job_path ON review_findings (job_id, path)")
     conn.commit()
-    conn.close()
+
+def ensure_columns(cur, table: str, columns: dict):
+    """Add any of columns ({name: type}) missing from an existing table."""
+    existing = {r[1] for r in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+    for name, column_type in columns.items():
+        if name not in existing:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+def create_activity_counters(cur):
+    """Per-activity_type row counts kept in step with activity_logs by triggers.
+
+    /stats reads this table instead of scanning the logs, so it costs the same
+    no matter how much history there is. Counters are backfilled from the
+    existing rows the first time the table is created.
+    """
+    exists = cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='activity_counters'").fetchone()
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS activity_counters (
+        activity_type TEXT PRIMARY KEY,
+        count INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS activity_logs_count_insert AFTER INSERT ON activity_logs
+    BEGIN
+        INSERT INTO activity_counters (activity_type, count) VALUES (COALESCE(NEW.activity_type, ''), 1)
+        ON CONFLICT(activity_type) DO UPDATE SET count = count + 1;
+    END
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS activity_logs_count_delete AFTER DELETE ON activity_logs
+    BEGIN
+        UPDATE activity_counters SET count = count - 1 WHERE activity_type = COALESCE(OLD.activity_type, '');
+    END
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS activity_logs_count_update AFTER UPDATE OF activity_type ON activity_logs
+    BEGIN
+        UPDATE activity_counters SET count = count - 1 WHERE activity_type = COALESCE(OLD.activity_type, '');
+        INSERT INTO activity_counters (activity_type, count) VALUES (COALESCE(NEW.activity_type, ''), 1)
+        ON CONFLICT(activity_type) DO UPDATE SET count = count + 1;
+    END
+    """)
+    if not exists:
+        cur.execute("""
+            INSERT INTO activity_counters (activity_type, count)
+            SELECT COALESCE(activity_type, ''), COUNT(*) FROM activity_logs GROUP BY COALESCE(activity_type, '')
+        """)
 
 init_db()
 
-# Activity log helper
+INSERT_ACTIVITY_SQL = """
+    INSERT INTO activity_logs (activity_type, language, input_data, output_data, status, created_at, user_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+log_writer = BatchWriter(DB, INSERT_ACTIVITY_SQL, max_queue=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE,
+                         flush_interval=LOG_FLUSH_MS / 1000.0, synchronous=LOG_SYNCHRONOUS, name="activity_logs")
+
+# Activity log helper: returns the new row id in sync mode, None when queued
 def log_activity(activity_type: str, language: str, input_data: str, output_data: str, status: str = "success"):
-    conn = get_conn()
-    cur = conn.cursor()
     created_at = datetime.utcnow().isoformat()
-    cur.execute("""
-        INSERT INTO activity_logs (activity_type, language, input_data, output_data, status, created_at, user_id)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (activity_type, language, input_data[:500], output_data[:1000], status, created_at, "default_user"))
-    conn.commit()
-    log_id = cur.lastrowid
-    conn.close()
-    return log_id
+    row = (activity_type, language, input_data[:500], output_data[:1000], status, created_at, "default_user")
+    if LOG_MODE == "sync":
+        start = time.perf_counter()
+        conn = get_conn()
+        with conn:
+            cur = conn.execute(INSERT_ACTIVITY_SQL, row)
+        metrics.DB_WRITE_LATENCY.observe(time.perf_counter() - start, ("activity_logs",))
+        metrics.DB_WRITE_ROWS.inc(("activity_logs", "written"))
+        return cur.lastrowid
+    log_writer.submit(row)
+    return None
+
+def log_activities(entries: list):
+    """Bulk log_activity for (activity_type, language, input_data, output_data, status) tuples."""
+    created_at = datetime.utcnow().isoformat()
+    rows = [(activity_type, language, input_data[:500], output_data[:1000], status, created_at, "default_user")
+            for activity_type, language, input_data, output_data, status in entries]
+    if not rows:
+        return
+    if LOG_MODE == "sync":
+        start = time.perf_counter()
+        conn = get_conn()
+        with conn:
+            conn.executemany(INSERT_ACTIVITY_SQL, rows)
+        metrics.DB_WRITE_LATENCY.observe(time.perf_counter() - start, ("activity_logs",))
+        metrics.DB_WRITE_ROWS.inc(("activity_logs", "written"), len(rows))
+        return
+    # The writer thread commits these together in its next batch
+    for row in rows:
+        log_writer.submit(row)
+
+def filter_clauses(since: str | None = None, until: str | None = None, **equals):
+    """Build WHERE clauses for equality filters plus a created_at range.
 
-def get_activity_logs(limit: int = 50):
+    since is inclusive and until exclusive, both compared against the ISO
+    created_at strings; filters whose value is None are skipped.
+    """
+    clauses = []
+    params = []
+    for column, value in equals.items():
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since:
+        clauses.append("created_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("created_at < ?")
+        params.append(until)
+    return clauses, params
+
+def keyset_page(table: str, limit: int, after_id: int | None = None, before_id: int | None = None,
+                clauses: list | None = None, params: list | None = None):
+    """Return up to limit rows of table newest-first, seeking by id instead of OFFSET.
+
+    before_id pages towards older rows, after_id towards newer ones; either way
+    the cost is an index seek plus limit rows, however deep the page is.
+    """
+    clauses = list(clauses or [])
+    params = list(params or [])
+    if after_id is not None:
+        clauses.append("id > ?")
+        params.append(after_id)
+    if before_id is not None:
+        clauses.append("id < ?")
+        params.append(before_id)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    # Walking forward from after_id has to scan upwards, then flip back
+    ascending = after_id is not None and before_id is None
+    order = "ASC" if ascending else "DESC"
+    rows = get_conn().execute(f"SELECT * FROM {table} {where} ORDER BY id {order} LIMIT ?", (*params, limit)).fetchall()
+    rows = [dict(r) for r in rows]
+    if ascending:
+        rows.reverse()
+    return rows
+
+def get_activity_logs(limit: int = 50, after_id: int | None = None, before_id: int | None = None,
+                      activity_type: str | None = None, status: str | None = None,
+                      since: str | None = None, until: str | None = None):
+    clauses, params = filter_clauses(since, until, activity_type=activity_type, status=status)
+    return keyset_page("activity_logs", limit, after_id, before_id, clauses, params)
+
+def iter_activity_log_batches(since: str | None = None, until: str | None = None,
+                              activity_type: str | None = None, batch_size: int = 500):
+    """Yield activity_logs rows oldest-first as lists of at most batch_size dicts.
+
+    Each batch is a keyset query (id > last seen id) on the calling thread's
+    connection, so no cursor or snapshot is held between batches and memory
+    stays at one batch regardless of table size.
+    """
+    clauses, params = filter_clauses(since, until, activity_type=activity_type)
+    where = "".join(f" AND {c}" for c in clauses)
+    sql = f"SELECT * FROM activity_logs WHERE id > ?{where} ORDER BY id LIMIT ?"
+    last_id = 0
+    while True:
+        rows = get_conn().execute(sql, (last_id, *params, batch_size)).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        yield [dict(r) for r in rows]
+        if len(rows) < batch_size:
+            return
+
+def get_activity_counts():
+    """Return {activity_type: count} over the full activity history."""
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM activity_logs ORDER BY id DESC LIMIT ?", (limit,))
-    rows = cur.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    rows = conn.execute("SELECT activity_type, count FROM activity_counters WHERE count > 0").fetchall()
+    return {r["activity_type"]: r["count"] for r in rows}
 
 class Job(BaseModel):
     id: int
@@ -95,3 +361,4 @@ class Run(BaseModel):
     tests_failed: int | None = 0
     coverage: float | None = 0.0
     artifacts_path: str | None = None
+    selection_mode: str | None = None
@@ -0,0 +1,334 @@
+"""Opt-in per-request CPU and memory profiles.
+
+A request is profiled when it carries an `X-Profile` header (honoured only
+with TESTSIGHT_PROFILE_HEADER=1, so clients cannot slow the server down at
+will) or is picked at random with probability TESTSIGHT_PROFILE_SAMPLE_RATE. Two modes are available:
+- "cprofile" (the header's default): cProfile on the event-loop thread, which
+  is where the async analyzer endpoints (/review, /refactor, ...) do their work.
+- "sample" (`X-Profile: sample`, and what rate-sampled requests get): a
+  thread that records every busy thread's Python stack every
+  TESTSIGHT_PROFILE_INTERVAL_MS. It also sees endpoints that run on the
+  threadpool, at a fraction of cProfile's overhead.
+
+tracemalloc runs alongside either mode for the peak allocation; the
+allocation snapshot is taken in save(), on the threadpool after the response.
+One request is profiled at a time; another request asking for a profile
+meanwhile goes through unprofiled with `X-Profile-Id: busy`.
+
+Attribution is approximate, and each report carries these limits in "notes".
+cProfile sees every coroutine the event loop runs while the request is in
+flight, so other requests' work on the loop is counted as this request's.
+The sampler records every busy thread, which includes other requests'
+threadpool work. tracemalloc is process-wide: the peak and the allocations
+include concurrent requests, and tracing slows all of them down while a
+profile runs.
+
+Each report is a JSON file in TESTSIGHT_PROFILE_DIR. Next to it sits the raw
+pstats dump (cprofile) or folded stacks (sample), ready for snakeviz or
+flamegraph.pl. The newest MAX_PROFILES are kept. With profiling off, the
+middleware only scans the request headers.
+"""
+import cProfile
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+
+from starlette.concurrency import run_in_threadpool
+
+PROFILE_DIR = os.environ.get("TESTSIGHT_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "testsight_workspace",
+                                                                    "profiles"))
+SAMPLE_RATE = float(os.environ.get("TESTSIGHT_PROFILE_SAMPLE_RATE", "0"))
+HEADER_ENABLED = os.environ.get("TESTSIGHT_PROFILE_HEADER", "0") != "0"
+INTERVAL = float(os.environ.get("TESTSIGHT_PROFILE_INTERVAL_MS", "5")) / 1000.0
+MAX_PROFILES = int(os.environ.get("TESTSIGHT_MAX_PROFILES", "200"))
+TOP_FUNCTIONS = 50
+TOP_ALLOCATIONS = 20
+
+HEADER = b"x-profile"
+MODES = ("cprofile", "sample")
+PROFILE_ID_RE = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+# Frames a thread sits in while it has nothing to do
+IDLE_FUNCTIONS = {"wait", "select", "poll", "accept", "_worker", "_wait_for_tstate_lock"}
+EXTENSIONS = {"cprofile": ".prof", "sample": ".folded"}
+NOTES = {
+    "cprofile": "cProfile counts every coroutine the event loop ran during the request, including other requests'",
+    "sample": "stacks come from every busy thread, including threadpool work for other requests",
+}
+MEMORY_NOTE = "tracemalloc is process-wide: peak and allocations include concurrent requests, which it also slowed"
+
+_busy = threading.Lock()
+
+
+def requested_mode(scope) -> str | None:
+    """Profiling mode asked for by the request, or None."""
+    if HEADER_ENABLED:
+        for name, value in scope["headers"]:
+            if name == HEADER:
+                value = value.decode("latin-1").strip().lower()
+                if value in ("0", "false", "off", "no"):
+                    return None
+                return value if value in MODES else "cprofile"
+    if SAMPLE_RATE and random.random() < SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+def function_label(filename: str, line: int, name: str) -> str:
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+class StackSampler:
+    """Counts the Python stacks of all busy threads every interval seconds, from a background thread."""
+
+    def __init__(self, interval: float = INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == me or frame.f_code.co_name in IDLE_FUNCTIONS:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(function_label(code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+                self.stacks[";".join(stack)] += 1
+
+    def functions(self) -> list:
+        """Per-function self and cumulative time estimated from the sample counts."""
+        self_samples = Counter()
+        total_samples = Counter()
+        for stack, n in self.stacks.items():
+            frames = stack.split(";")
+            self_samples[frames[-1]] += n
+            for function in set(frames):
+                total_samples[function] += n
+        rows = [{"function": function, "calls": None, "self_ms": round(self_samples[function] * self.interval * 1000, 3),
+                 "cumulative_ms": round(n * self.interval * 1000, 3)}
+                for function, n in total_samples.items()]
+        rows.sort(key=lambda row: -row["cumulative_ms"])
+        return rows[:TOP_FUNCTIONS]
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+def cprofile_functions(profiler: cProfile.Profile) -> list:
+    stats = pstats.Stats(profiler).stats
+    rows = [{"function": function_label(*key), "calls": calls, "self_ms": round(tottime * 1000, 3),
+             "cumulative_ms": round(cumtime * 1000, 3)}
+            for key, (_, calls, tottime, cumtime, _) in stats.items()]
+    rows.sort(key=lambda row: -row["cumulative_ms"])
+    return rows[:TOP_FUNCTIONS]
+
+
+class RequestProfile:
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.profiler = None
+        self.sampler = None
+        self.started_tracing = False
+        self.start = 0.0
+        self.duration = 0.0
+
+    def __enter__(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            self.started_tracing = True
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        if self.mode == "cprofile":
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.sampler = StackSampler()
+            self.sampler.start()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.duration = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler.disable()
+        else:
+            self.sampler.stop()
+        self.peak = tracemalloc.get_traced_memory()[1] - self.baseline
+
+    def stop_tracing(self):
+        """Stop tracemalloc if this profile started it; safe to call twice."""
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def save(self, scope, status: int):
+        """Write the JSON report and the raw profile; runs after the response on the threadpool.
+
+        The allocation snapshot walks every traced block, so it is taken here rather than on the event loop.
+        """
+        snapshot = tracemalloc.take_snapshot()
+        self.stop_tracing()
+        allocations = [{"location": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                        "bytes": stat.size, "count": stat.count}
+                       for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]]
+        route = scope.get("route")
+        report = {
+            "id": self.id,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status,
+            "mode": self.mode,
+            "duration_ms": round(self.duration * 1000, 3),
+            "peak_memory_bytes": self.peak,
+            "samples": self.sampler.samples if self.sampler else None,
+            "functions": cprofile_functions(self.profiler) if self.profiler else self.sampler.functions(),
+            "allocations": allocations,
+            "notes": [NOTES[self.mode], MEMORY_NOTE],
+        }
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        raw = os.path.join(PROFILE_DIR, self.id + EXTENSIONS[self.mode])
+        if self.profiler:
+            self.profiler.dump_stats(raw)
+        else:
+            with open(raw, "w", encoding="utf-8") as f:
+                f.write(self.sampler.folded())
+        with open(os.path.join(PROFILE_DIR, self.id + ".json"), "w", encoding="utf-8") as f:
+            json.dump(report, f)
+        prune()
+
+
+def report_path(profile_id: str, extension: str = ".json") -> str:
+    """Path of a stored report; ValueError for ids that are not ours (no path tricks)."""
+    if not PROFILE_ID_RE.match(profile_id):
+        raise ValueError(f"Invalid profile id: {profile_id!r}")
+    return os.path.join(PROFILE_DIR, profile_id + extension)
+
+
+def prune(keep: int = MAX_PROFILES):
+    for profile_id in list_ids()[keep:]:
+        for extension in (".json",) + tuple(EXTENSIONS.values()):
+            try:
+                os.remove(report_path(profile_id, extension))
+            except FileNotFoundError:
+                pass
+
+
+def list_ids() -> list:
+    """Stored profile ids, newest first."""
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted((name[:-5] for name in names if name.endswith(".json") and PROFILE_ID_RE.match(name[:-5])),
+                  reverse=True)
+
+
+def load_report(profile_id: str) -> dict | None:
+    try:
+        with open(report_path(profile_id), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def list_reports(limit: int = 50) -> list:
+    summaries = []
+    for profile_id in list_ids()[:limit]:
+        report = load_report(profile_id)
+        if report:
+            summaries.append({key: report[key] for key in ("id", "created_at", "method", "path", "route", "status",
+                                                           "mode", "duration_ms", "peak_memory_bytes")})
+    return summaries
+
+
+def raw_path(report: dict) -> str:
+    return report_path(report["id"], EXTENSIONS[report["mode"]])
+
+
+def diff_reports(base: dict, other: dict, top: int = TOP_FUNCTIONS) -> dict:
+    """Duration, peak memory and per-function cumulative time of other minus base, biggest changes first."""
+    before = {row["function"]: row for row in base["functions"]}
+    after = {row["function"]: row for row in other["functions"]}
+    functions = []
+    for function in before.keys() | after.keys():
+        old = before.get(function, {}).get("cumulative_ms", 0.0)
+        new = after.get(function, {}).get("cumulative_ms", 0.0)
+        functions.append({"function": function, "base_ms": old, "other_ms": new, "delta_ms": round(new - old, 3)})
+    functions.sort(key=lambda row: -abs(row["delta_ms"]))
+    return {
+        "base": base["id"],
+        "other": other["id"],
+        "modes": [base["mode"], other["mode"]],
+        "duration_delta_ms": round(other["duration_ms"] - base["duration_ms"], 3),
+        "peak_memory_delta_bytes": other["peak_memory_bytes"] - base["peak_memory_bytes"],
+        "functions": functions[:top],
+    }
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling the requests requested_mode() picks."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        mode = requested_mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if not _busy.acquire(blocking=False):
+            await self.app(scope, receive, self._with_header(send, "busy"))
+            return
+        status = 500
+        profile = RequestProfile(mode)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        # Held until save() has stopped tracemalloc, so the next profile does not find it half torn down
+        try:
+            with profile:
+                await self.app(scope, receive, self._with_header(send_with_status, profile.id))
+            await run_in_threadpool(profile.save, scope, status)
+        finally:
+            profile.stop_tracing()
+            _busy.release()
+
+    @staticmethod
+    def _with_header(send, profile_id: str):
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                message = dict(message, headers=list(message.get("headers", [])) +
+                               [(b"x-profile-id", profile_id.encode("latin-1"))])
+            await send(message)
+        return send_with_header
@@ -0,0 +1,304 @@
+"""Repository-wide review jobs (jobs.kind = 'review').
+
+The job checks the repository out like a test job, lists its source files
+(`git ls-files` honours every .gitignore; plain directories get a walk that
+reads the top-level .gitignore), drops vendored trees, minified bundles,
+binaries and oversized files, and runs the review and debug analyzers over the
+rest in a process pool. Files are streamed to the pool in chunks with a cap
+on chunks in flight and each finished chunk is written straight to
+review_files / review_findings, so memory stays flat however big the
+repository is.
+"""
+import fnmatch
+import logging
+import multiprocessing
+import os
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from . import analyzers
+from .documents import get_document
+from .job_events import JobEvents
+from .jobs import get_job, set_job_status
+from .models import get_conn
+from .worker import checkout_workspace, lease_lost, release_workspace
+
+SOURCE_LANGUAGES = {
+    ".py": "python",
+    ".java": "java",
+    ".cs": "c#",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".go": "go",
+    ".c": "c",
+    ".h": "c",
+    ".cpp": "c++",
+    ".cc": "c++",
+    ".hpp": "c++",
+}
+
+# Directory names that hold third-party or generated code
+VENDOR_DIRS = {
+    ".git", "node_modules", "bower_components", "vendor", "third_party", "third-party", "external",
+    ".venv", "venv", "site-packages", "__pycache__", ".tox", ".mypy_cache", "dist", "build", "target",
+    "bin", "obj",
+}
+
+MAX_FILE_BYTES = int(os.environ.get("TESTSIGHT_REVIEW_MAX_FILE_BYTES", str(1024 * 1024)))
+PROCESSES = int(os.environ.get("TESTSIGHT_REVIEW_PROCESSES", str(os.cpu_count() or 2)))
+CHUNK_FILES = 64
+PROGRESS_EVERY = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def read_gitignore(root: str) -> list:
+    try:
+        with open(os.path.join(root, ".gitignore"), encoding="utf-8", errors="replace") as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    except OSError:
+        return []
+
+
+def is_ignored(rel_path: str, is_dir: bool, patterns: list) -> bool:
+    """Match one path against top-level .gitignore patterns; the last matching pattern wins."""
+    ignored = False
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        negate = pattern.startswith("!")
+        if negate:
+            pattern = pattern[1:]
+        if pattern.endswith("/"):
+            if not is_dir:
+                continue
+            pattern = pattern.rstrip("/")
+        if pattern.startswith("/") or "/" in pattern:
+            matched = fnmatch.fnmatch(rel_path, pattern.lstrip("/"))
+        else:
+            matched = fnmatch.fnmatch(name, pattern)
+        if matched:
+            ignored = not negate
+    return ignored
+
+
+def walk_files(root: str):
+    patterns = read_gitignore(root)
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = [d for d in dirnames
+                       if d not in VENDOR_DIRS and not is_ignored(rel_dir + d, True, patterns)]
+        for name in filenames:
+            if not is_ignored(rel_dir + name, False, patterns):
+                yield rel_dir + name
+
+
+def list_files(root: str):
+    """Relative paths of the repository's files that are not gitignored."""
+    if os.path.exists(os.path.join(root, ".git")):
+        try:
+            out = subprocess.run(["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                                 cwd=root, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+            for path in out.split(b"\0"):
+                if path:
+                    yield os.fsdecode(path)
+            return
+        except (subprocess.CalledProcessError, OSError):
+            pass
+    yield from walk_files(root)
+
+
+def source_files(root: str):
+    """(path, language) of reviewable source files under root."""
+    for path in list_files(root):
+        language = SOURCE_LANGUAGES.get(os.path.splitext(path)[1].lower())
+        if not language or path.endswith((".min.js", ".bundle.js")):
+            continue
+        if any(part in VENDOR_DIRS for part in path.split("/")[:-1]):
+            continue
+        yield path, language
+
+
+def review_file(root: str, path: str, language: str) -> tuple:
+    """(path, language, lines, quality_score, security_issues, findings, error) for one file.
+
+    findings are (line, severity, message, source) tuples from the review and debug analyzers.
+    """
+    full = os.path.join(root, path)
+    try:
+        if os.path.getsize(full) > MAX_FILE_BYTES:
+            return path, language, 0, None, 0, [], "skipped: too large"
+        with open(full, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return path, language, 0, None, 0, [], f"unreadable: {e}"
+    if b"\0" in data[:8192]:
+        return path, language, 0, None, 0, [], "skipped: binary"
+    code = data.decode("utf-8", errors="replace")
+    if not code.strip():
+        return path, language, 0, None, 0, [], None
+    # The extension already tells us the language; only a confident detection
+    # that would turn the review into a mismatch warning overrides it
+    mismatch = analyzers.language_mismatch(get_document(code), language)
+    if mismatch:
+        language = mismatch["detected_language"]
+    # Not through result_cache: these results are never asked for again, and storing one entry per file
+    # would push out the ones the interactive endpoints rely on
+    review = analyzers.review(code, language)
+    debug = analyzers.debug(code, "", language)
+    findings = []
+    for finding in review.get("findings", []):
+        if finding["line"] or finding["type"] != "info":
+            findings.append((finding["line"], finding["type"], finding["message"], "review"))
+    for issue in debug.get("all_issues", []):
+        if issue["type"] == "No Issues Found":
+            continue
+        line = issue["line"] if isinstance(issue["line"], int) else 0
+        severity = {"High": "error", "Medium": "warning"}.get(issue.get("severity"), "info")
+        findings.append((line, severity, issue["message"], "debug"))
+    return (path, language, review.get("total_lines", 0), review.get("quality_score"),
+            review.get("security_issues", 0), findings, None)
+
+
+def review_chunk(root: str, files: list) -> list:
+    results = []
+    for path, language in files:
+        try:
+            results.append(review_file(root, path, language))
+        except Exception as e:
+            results.append((path, language, 0, None, 0, [], f"{type(e).__name__}: {e}"))
+    return results
+
+
+def chunked(iterable, size: int):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def review_repository(root: str, processes: int = PROCESSES):
+    """Yield per-file results for every source file under root, chunk by chunk."""
+    chunks = chunked(source_files(root), CHUNK_FILES)
+    if processes <= 1:
+        for chunk in chunks:
+            yield from review_chunk(root, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(review_chunk, root, chunk))
+            # Keep the pool busy without queueing the whole repository
+            if len(pending) >= 2 * processes:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in pending:
+            yield from future.result()
+
+
+def save_file_results(job_id: int, results: list):
+    conn = get_conn()
+    with conn:
+        conn.executemany("""
+            INSERT INTO review_files (job_id, path, language, lines, quality_score, security_issues, findings, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(job_id, path, language, lines, score, security, len(findings), error)
+              for path, language, lines, score, security, findings, error in results])
+        conn.executemany("INSERT INTO review_findings (job_id, path, line, severity, message, source) VALUES (?, ?, ?, ?, ?, ?)",
+                         [(job_id, r[0], line, severity, message, source)
+                          for r in results for line, severity, message, source in r[5]])
+
+
+def clear_review(job_id: int):
+    conn = get_conn()
+    with conn:
+        conn.execute("DELETE FROM review_files WHERE job_id=?", (job_id,))
+        conn.execute("DELETE FROM review_findings WHERE job_id=?", (job_id,))
+
+
+def run_review_job(job_id: int, lease=None):
+    """Review a repository job; lease is the worker's Heartbeat, as for worker.run_job_background."""
+    job = get_job(job_id)
+    events = JobEvents(job_id)
+    owner = lease.owner if lease is not None else None
+    repo_path, _commit_sha = checkout_workspace(job, events, writable=False, owner=owner)
+    if repo_path is None:
+        return
+    try:
+        # A retried job starts over rather than duplicating rows
+        clear_review(job_id)
+        events.stage("review")
+        batch = []
+        reviewed = 0
+        for result in review_repository(repo_path, PROCESSES):
+            batch.append(result)
+            if len(batch) >= CHUNK_FILES:
+                # The next owner starts over with clear_review(), so stop adding rows
+                if lease_lost(lease, events):
+                    return
+                save_file_results(job_id, batch)
+                reviewed += len(batch)
+                batch = []
+                if reviewed % PROGRESS_EVERY < CHUNK_FILES:
+                    events.line(f"reviewed {reviewed} files")
+        if lease_lost(lease, events):
+            return
+        save_file_results(job_id, batch)
+        reviewed += len(batch)
+        events.line(f"reviewed {reviewed} files")
+        if set_job_status(job_id, "done", owner):
+            events.status("done")
+    finally:
+        release_workspace(job, repo_path)
+
+
+def get_review_summary(job_id: int, top: int = 20) -> dict:
+    conn = get_conn()
+    totals = conn.execute("""
+        SELECT COUNT(*) AS files, SUM(error IS NOT NULL) AS skipped, COALESCE(SUM(findings), 0) AS findings,
+               COALESCE(SUM(security_issues), 0) AS security_issues, COALESCE(SUM(lines), 0) AS lines
+        FROM review_files WHERE job_id=?
+    """, (job_id,)).fetchone()
+    by_severity = {r["severity"]: r["n"] for r in conn.execute(
+        "SELECT severity, COUNT(*) AS n FROM review_findings WHERE job_id=? GROUP BY severity", (job_id,))}
+    top_files = [dict(r) for r in conn.execute("""
+        SELECT path, language, lines, quality_score, security_issues, findings FROM review_files
+        WHERE job_id=? AND findings > 0 ORDER BY findings DESC, security_issues DESC LIMIT ?
+    """, (job_id, top))]
+    top_messages = [dict(r) for r in conn.execute("""
+        SELECT message, severity, COUNT(*) AS occurrences, COUNT(DISTINCT path) AS files FROM review_findings
+        WHERE job_id=? GROUP BY message, severity ORDER BY occurrences DESC LIMIT ?
+    """, (job_id, top))]
+    return {
+        "job_id": job_id,
+        "files_reviewed": totals["files"] - (totals["skipped"] or 0),
+        "files_skipped": totals["skipped"] or 0,
+        "lines": totals["lines"],
+        "total_findings": totals["findings"],
+        "security_issues": totals["security_issues"],
+        "by_severity": by_severity,
+        "top_files": top_files,
+        "top_messages": top_messages,
+    }
+
+
+def get_review_findings(job_id: int, path: str | None = None, severity: str | None = None, limit: int = 100):
+    sql = "SELECT path, line, severity, message, source FROM review_findings WHERE job_id=?"
+    params = [job_id]
+    if path:
+        sql += " AND path=?"
+        params.append(path)
+    if severity:
+        sql += " AND severity=?"
+        params.append(severity)
+    sql += " ORDER BY path, line LIMIT ?"
+    params.append(limit)
+    return [dict(r) for r in get_conn().execute(sql, params).fetchall()]
@@ -0,0 +1,284 @@
+"""Result cache for the deterministic analysis endpoints.
+
+/debug, /review, /refactor, /generate-tests and /analyze-logs are pure
+functions of their inputs, so their responses are cached under a hash of the
+endpoint, the canonical JSON of the analyzer arguments and a fingerprint of
+the analyzer code. Any edit to the analyzers or the review rules changes the
+fingerprint, which retires every older entry without a manual flush.
+
+Two tiers: an in-process LRU bounded by bytes, and an optional SQLite file
+(TESTSIGHT_RESULT_CACHE_DB) shared by all server processes and surviving
+restarts. Both expire entries after TESTSIGHT_RESULT_CACHE_TTL seconds.
+Async callers use the *_async methods, which do the disk tier's SQLite I/O
+on the threadpool instead of the event loop. Disk hits do not write: the
+last_used times they refresh are collected and written in one batch with
+the next store or every DISK_TOUCH_BATCH hits.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from starlette.concurrency import run_in_threadpool
+
+from . import (analyzers, documents, language_detect, language_profiles, log_analyzer, log_templates,
+               log_timeseries, metrics, review_rules)
+from .db import ConnectionPool
+
+MEMORY_BYTES = int(os.environ.get("TESTSIGHT_RESULT_CACHE_BYTES", str(32 * 1024 * 1024)))
+DISK_PATH = os.environ.get("TESTSIGHT_RESULT_CACHE_DB", "")
+DISK_BYTES = int(os.environ.get("TESTSIGHT_RESULT_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+# Seconds; 0 keeps entries until they are evicted for space
+TTL = float(os.environ.get("TESTSIGHT_RESULT_CACHE_TTL", "86400"))
+# Check the disk tier's size every this many stores
+DISK_TRIM_EVERY = 64
+# Pending last_used updates written at once
+DISK_TOUCH_BATCH = 256
+
+
+def code_fingerprint(*modules) -> str:
+    """Hash of the analyzer sources plus ANALYZER_VERSION."""
+    h = hashlib.sha256(analyzers.ANALYZER_VERSION.encode("utf-8"))
+    for module in modules:
+        with open(module.__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+FINGERPRINT = code_fingerprint(analyzers, review_rules, documents, language_detect, language_profiles,
+                               log_analyzer, log_templates, log_timeseries)
+
+
+def cache_key(endpoint: str, params: dict, fingerprint: str = FINGERPRINT) -> str:
+    payload = json.dumps({"endpoint": endpoint, "params": params, "fingerprint": fingerprint},
+                         sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class DiskTier:
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.pool = ConnectionPool(path)
+        self._touched = {}  # key -> last_used not yet written
+        self._touch_lock = threading.Lock()
+        conn = self.pool.get()
+        with conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS result_cache (
+                key TEXT PRIMARY KEY,
+                value BLOB,
+                size INTEGER,
+                expires_at REAL,
+                last_used REAL
+            )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_last_used ON result_cache (last_used)")
+
+    def get(self, key: str, now: float):
+        """Read-only lookup; expired rows are left for trim() and the hit's last_used is written later."""
+        row = self.pool.get().execute("SELECT value, expires_at FROM result_cache WHERE key=?", (key,)).fetchone()
+        if not row or (row["expires_at"] and row["expires_at"] <= now):
+            return None
+        with self._touch_lock:
+            self._touched[key] = now
+            full = len(self._touched) >= DISK_TOUCH_BATCH
+        if full:
+            conn = self.pool.get()
+            with conn:
+                self._write_touched(conn)
+        return zlib.decompress(row["value"]).decode("utf-8")
+
+    def _write_touched(self, conn):
+        with self._touch_lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn.executemany("UPDATE result_cache SET last_used=MAX(last_used, ?) WHERE key=?",
+                             [(used, key) for key, used in touched.items()])
+
+    def put(self, key: str, value: str, expires_at: float, now: float):
+        blob = zlib.compress(value.encode("utf-8"))
+        conn = self.pool.get()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO result_cache (key, value, size, expires_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                         (key, blob, len(blob), expires_at, now))
+            self._write_touched(conn)
+
+    def trim(self, now: float) -> int:
+        """Drop expired rows, then least recently used ones until under max_bytes."""
+        conn = self.pool.get()
+        evicted = 0
+        with conn:
+            self._write_touched(conn)
+            evicted += conn.execute("DELETE FROM result_cache WHERE expires_at > 0 AND expires_at <= ?", (now,)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM result_cache").fetchone()[0]
+            if total > self.max_bytes:
+                cutoff = None
+                for row in conn.execute("SELECT last_used, size FROM result_cache ORDER BY last_used"):
+                    total -= row["size"]
+                    cutoff = row["last_used"]
+                    if total <= self.max_bytes:
+                        break
+                evicted += conn.execute("DELETE FROM result_cache WHERE last_used <= ?", (cutoff,)).rowcount
+        return evicted
+
+    def clear(self):
+        conn = self.pool.get()
+        with conn:
+            conn.execute("DELETE FROM result_cache")
+
+    def stats(self) -> dict:
+        row = self.pool.get().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM result_cache").fetchone()
+        return {"path": self.path, "entries": row[0], "bytes": row[1], "max_bytes": self.max_bytes}
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int = MEMORY_BYTES, ttl: float = TTL, disk: DiskTier | None = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk = disk
+        self.bytes = 0
+        self._entries = OrderedDict()  # key -> (json value, expires_at)
+        self._lock = threading.Lock()
+        self._stores = 0
+        self.counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0, "disk_evictions": 0}
+
+    def get(self, key: str):
+        now = time.time()
+        result = self._memory_get(key, now)
+        if result is None and self.disk is not None:
+            result = self._disk_get(key, now)
+        if result is None:
+            self._miss()
+        return result
+
+    async def get_async(self, key: str):
+        """get() with the disk-tier read on the threadpool."""
+        now = time.time()
+        result = self._memory_get(key, now)
+        if result is None and self.disk is not None:
+            result = await run_in_threadpool(self._disk_get, key, now)
+        if result is None:
+            self._miss()
+        return result
+
+    def put(self, key: str, result: dict):
+        now = time.time()
+        value, expires_at = self._store(key, result, now)
+        if self.disk is not None:
+            self._disk_put(key, value, expires_at, now)
+
+    async def put_async(self, key: str, result: dict):
+        """put() with the disk-tier write on the threadpool."""
+        now = time.time()
+        value, expires_at = self._store(key, result, now)
+        if self.disk is not None:
+            await run_in_threadpool(self._disk_put, key, value, expires_at, now)
+
+    def get_or_compute(self, endpoint: str, fn, **params) -> dict:
+        """fn(**params) through the cache; callers get their own copy of the result."""
+        key = cache_key(endpoint, params)
+        result = self.get(key)
+        if result is None:
+            result = self._compute(endpoint, fn, params)
+            self.put(key, result)
+        return result
+
+    async def get_or_compute_async(self, endpoint: str, fn, **params) -> dict:
+        """get_or_compute() for the async endpoints: fn still runs on the loop, disk-tier I/O does not."""
+        key = cache_key(endpoint, params)
+        result = await self.get_async(key)
+        if result is None:
+            result = self._compute(endpoint, fn, params)
+            await self.put_async(key, result)
+        return result
+
+    @staticmethod
+    def _compute(endpoint: str, fn, params: dict) -> dict:
+        start = time.perf_counter()
+        result = fn(**params)
+        metrics.ANALYZER_LATENCY.observe(time.perf_counter() - start, (endpoint, "request"))
+        return result
+
+    def _memory_get(self, key: str, now: float):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at and expires_at <= now:
+                self._drop(key)
+                self.counters["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+        return json.loads(value)
+
+    def _disk_get(self, key: str, now: float):
+        value = self.disk.get(key, now)
+        if value is None:
+            return None
+        with self._lock:
+            self.counters["disk_hits"] += 1
+        self._remember(key, value, now + self.ttl if self.ttl else 0)
+        return json.loads(value)
+
+    def _miss(self):
+        with self._lock:
+            self.counters["misses"] += 1
+
+    def _store(self, key: str, result: dict, now: float) -> tuple:
+        value = json.dumps(result, separators=(",", ":"))
+        expires_at = now + self.ttl if self.ttl else 0
+        self._remember(key, value, expires_at)
+        return value, expires_at
+
+    def _disk_put(self, key: str, value: str, expires_at: float, now: float):
+        self.disk.put(key, value, expires_at, now)
+        with self._lock:
+            self._stores += 1
+            trim = self._stores % DISK_TRIM_EVERY == 0
+        if trim:
+            evicted = self.disk.trim(now)
+            with self._lock:
+                self.counters["disk_evictions"] += evicted
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (value, expires_at)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.counters["evictions"] += 1
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(entry[0])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.counters, entries=len(self._entries), bytes=self.bytes, max_bytes=self.max_bytes,
+                         ttl=self.ttl, fingerprint=FINGERPRINT[:16])
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        stats["disk"] = self.disk.stats() if self.disk is not None else None
+        return stats
+
+
+result_cache = ResultCache(disk=DiskTier(DISK_PATH, DISK_BYTES) if DISK_PATH else None)
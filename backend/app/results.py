@@ -0,0 +1,107 @@
+"""Machine-readable pytest results (JUnit XML, coverage JSON) and per-test history."""
+import json
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from .models import get_conn
+
+
+def node_id(testcase) -> str:
+    """Rebuild the pytest node id from an xunit1 <testcase> element."""
+    name = testcase.get("name", "")
+    path = testcase.get("file")
+    classname = testcase.get("classname", "")
+    if not path:
+        return f"{classname.replace('.', '/')}::{name}" if classname else name
+    path = path.replace(os.sep, "/")
+    module = path[:-3].replace("/", ".") if path.endswith(".py") else path
+    inner = classname[len(module) + 1:] if classname.startswith(module + ".") else ""
+    parts = [path] + [p for p in inner.split(".") if p] + [name]
+    return "::".join(parts)
+
+
+def parse_junit(path: str) -> list:
+    """Return [(node_id, outcome, duration, message)] from a pytest --junitxml report.
+
+    The report is read incrementally and every <testcase> is discarded once
+    parsed, so memory does not grow with the size of the suite.
+    """
+    results = []
+    if not os.path.exists(path):
+        return results
+    for _, element in ET.iterparse(path, events=("end",)):
+        if element.tag != "testcase":
+            continue
+        outcome = "passed"
+        message = None
+        for child in element:
+            if child.tag in ("failure", "error", "skipped"):
+                outcome = {"failure": "failed", "error": "error", "skipped": "skipped"}[child.tag]
+                message = (child.get("message") or child.text or "")[:1000]
+                break
+        results.append((node_id(element), outcome, float(element.get("time") or 0.0), message))
+        element.clear()
+    return results
+
+
+def parse_coverage_json(path: str):
+    """Return (total_percent, [(path, statements, missing, percent)]) from `coverage json`."""
+    if not os.path.exists(path):
+        return 0.0, []
+    with open(path) as f:
+        report = json.load(f)
+    files = []
+    for file_path, data in report.get("files", {}).items():
+        summary = data.get("summary", {})
+        files.append((file_path.replace(os.sep, "/"), summary.get("num_statements", 0),
+                      summary.get("missing_lines", 0), round(summary.get("percent_covered", 0.0), 2)))
+    total = round(report.get("totals", {}).get("percent_covered", 0.0), 2)
+    return total, files
+
+
+def save_results(conn, run_id: int, results: list, coverage_files: list):
+    """Store per-test outcomes and per-file coverage of a run (inside the caller's transaction)."""
+    conn.executemany("INSERT INTO test_results (run_id, test_id, outcome, duration, message) VALUES (?, ?, ?, ?, ?)",
+                     [(run_id, *r) for r in results])
+    conn.executemany("INSERT INTO coverage_files (run_id, path, statements, missing, percent) VALUES (?, ?, ?, ?, ?)",
+                     [(run_id, *f) for f in coverage_files])
+
+
+def get_run_tests(run_id: int, outcome: str | None = None, slowest: bool = False, limit: int = 100):
+    clauses = ["run_id = ?"]
+    params = [run_id]
+    if outcome:
+        clauses.append("outcome = ?")
+        params.append(outcome)
+    order = "duration DESC" if slowest else "id"
+    rows = get_conn().execute(f"SELECT test_id, outcome, duration, message FROM test_results WHERE {' AND '.join(clauses)} ORDER BY {order} LIMIT ?",
+                              (*params, limit)).fetchall()
+    return [dict(r) for r in rows]
+
+
+def get_run_coverage(run_id: int):
+    rows = get_conn().execute("SELECT path, statements, missing, percent FROM coverage_files WHERE run_id=? ORDER BY percent, path",
+                              (run_id,)).fetchall()
+    return [dict(r) for r in rows]
+
+
+def list_runs(job_id: int):
+    rows = get_conn().execute("SELECT * FROM runs WHERE job_id=? ORDER BY id DESC", (job_id,)).fetchall()
+    return [dict(r) for r in rows]
+
+
+def load_durations(repo_url: str) -> dict:
+    rows = get_conn().execute("SELECT test_id, duration FROM test_durations WHERE repo_url=?", (repo_url,)).fetchall()
+    return {r["test_id"]: r["duration"] for r in rows}
+
+
+def save_durations(repo_url: str, results: list):
+    """Remember the latest duration of every test that ran, for shard balancing."""
+    now = datetime.utcnow().isoformat()
+    conn = get_conn()
+    with conn:
+        conn.executemany("""
+            INSERT INTO test_durations (repo_url, test_id, duration, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(repo_url, test_id) DO UPDATE SET duration=excluded.duration, updated_at=excluded.updated_at
+        """, [(repo_url, test_id, duration, now) for test_id, outcome, duration, _ in results if outcome != "skipped"])
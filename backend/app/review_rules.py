@@ -0,0 +1,199 @@
+"""Declarative line rules for /review, compiled once and run in one pass.
+
+Every rule names cheap triggers that any line it fires on must contain.
+Each distinct trigger is searched once over the whole document -- literals
+with str.find, which is far faster in CPython than one big alternation regex
+-- and the hits are mapped to candidate lines; only those lines are stripped,
+lowered and checked exactly, in registry order. Context conditions ("try
+nearby", "zero check before") are answered from per-document sorted line
+indexes with bisect instead of rescanning a window of lines for every hit, so
+a review is linear in the size of the code.
+
+Triggers run over one of three views of the code: "raw", "lower" and
+"digits" (every decimal digit folded to 0, so digit runs become a literal).
+"""
+import re
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from operator import add
+
+MAGIC_NUMBER_RE = re.compile(r"\b\d{3,}\b")
+ASCII_DIGITS = str.maketrans("123456789", "000000000")
+DIGIT_RE = re.compile(r"\d")
+
+# Line-level facts looked up by rules: name -> (view, literals any of which marks the line)
+CONTEXTS = {
+    "try": ("lower", ("try",)),
+    "zero_check": ("raw", ("!= 0", "== 0")),
+}
+
+
+class Rule:
+    def __init__(self, name: str, type: str, message: str, penalty: int, triggers: tuple, on: str = "lower",
+                 check=None, security: bool = False):
+        self.name = name
+        self.type = type
+        self.message = message
+        self.penalty = penalty
+        self.triggers = triggers
+        self.on = on
+        self.check = check
+        self.security = security
+
+
+def _is_hardcoded_password(line, stripped, lower, doc, i):
+    return ('password' in lower and '=' in line and '"' in line and 'hash' not in lower
+            and 'input' not in lower and 'read' not in lower)
+
+
+def _is_sql_injection(line, stripped, lower, doc, i):
+    return ('sql' in lower or 'query' in lower) and ('+' in line or 'concat' in lower) and 'select' in lower
+
+
+def _is_unguarded_parse(line, stripped, lower, doc, i):
+    if not ('convert.toint32' in lower or 'int.parse' in lower or 'integer.parseint' in lower):
+        return False
+    # 0-based lines i-5 .. i+4 around 1-based line i
+    return not doc.near("try", max(0, i - 5), min(doc.total_lines, i + 5))
+
+
+def _is_unguarded_division(line, stripped, lower, doc, i):
+    if not ('/' in stripped and 'num2' in stripped):
+        return False
+    # The ten lines up to and including this one
+    return not doc.near("zero_check", max(0, i - 10), i)
+
+
+def _is_magic_number(line, stripped, lower, doc, i):
+    return bool(MAGIC_NUMBER_RE.search(stripped)) and 'const' not in lower and 'final' not in lower
+
+
+# Evaluated in this order on each line, which is the order findings are reported in
+RULES = [
+    Rule("hardcoded-password", "error", "Hardcoded password detected - critical security risk", 15,
+         ("password",), check=_is_hardcoded_password, security=True),
+    Rule("sql-injection", "error", "Potential SQL injection vulnerability - use parameterized queries", 15,
+         ("select",), check=_is_sql_injection, security=True),
+    Rule("eval", "error", "Use of eval() is dangerous - security risk", 10,
+         ("eval(",), check=lambda line, stripped, lower, doc, i: 'eval(' in lower, security=True),
+    Rule("long-line", "info", "Line is very long - consider breaking it up for readability", 1,
+         (re.compile(r"^[^\n]{151}", re.MULTILINE),), on="raw", check=lambda line, stripped, lower, doc, i: len(line) > 150),
+    Rule("magic-number", "info", "Consider using named constants instead of magic numbers", 1,
+         ("000",), on="digits", check=_is_magic_number),
+    Rule("unguarded-parse", "warning", "Consider adding try-catch for parse operations to handle invalid input", 3,
+         ("convert.toint32", "int.parse", "integer.parseint"), check=_is_unguarded_parse),
+    Rule("unguarded-division", "warning", "Add check for division by zero", 5,
+         ("num2",), on="raw", check=_is_unguarded_division),
+]
+
+
+def find_all(text: str, trigger) -> list:
+    """Start offsets of every occurrence of a literal string or compiled pattern."""
+    if not isinstance(trigger, str):
+        return [m.start() for m in trigger.finditer(text)]
+    found = []
+    find = text.find
+    pos = find(trigger)
+    while pos != -1:
+        found.append(pos)
+        pos = find(trigger, pos + 1)
+    return found
+
+
+def line_starts(lines: list) -> list:
+    # Offset of line k is the length of the k lines before it plus k newlines; all in C
+    return list(map(add, accumulate(map(len, lines), initial=0), range(len(lines) + 1)))
+
+
+class Document:
+    """One piece of code as seen by the rules: its lines plus lazily built context indexes."""
+
+    def __init__(self, engine, code: str, lines: list | None = None, lower: str | None = None):
+        self.engine = engine
+        self.code = code
+        self.lines = lines if lines is not None else code.split("\n")
+        self.total_lines = len(self.lines)
+        self._texts = {} if lower is None else {"lower": lower}
+        self._starts = {}
+        self._contexts = {}
+
+    def text(self, on: str) -> str:
+        if on == "raw":
+            return self.code
+        if on not in self._texts:
+            if on == "lower":
+                self._texts[on] = self.code.lower()
+            elif self.code.isascii():
+                self._texts[on] = self.code.translate(ASCII_DIGITS)
+            else:
+                self._texts[on] = DIGIT_RE.sub("0", self.code)
+        return self._texts[on]
+
+    def starts(self, on: str) -> list:
+        text = self.text(on)
+        # lower() can change lengths for a few non-ASCII characters; share offsets when it did not
+        key = "raw" if len(text) == len(self.code) else on
+        if key not in self._starts:
+            self._starts[key] = line_starts(self.lines if key == "raw" else text.split("\n"))
+        return self._starts[key]
+
+    def matching_lines(self, trigger, on: str) -> list:
+        """Sorted 0-based indexes of the lines in which trigger occurs."""
+        starts = self.starts(on)
+        found = []
+        last = -1
+        for pos in find_all(self.text(on), trigger):
+            idx = bisect_right(starts, pos) - 1
+            if idx != last:
+                found.append(idx)
+                last = idx
+        return found
+
+    def near(self, context: str, lo: int, hi: int) -> bool:
+        """True when some line in [lo, hi) has the named context."""
+        index = self._contexts.get(context)
+        if index is None:
+            on, triggers = self.engine.contexts[context]
+            index = self._contexts[context] = sorted(set().union(*(self.matching_lines(t, on) for t in triggers)))
+        k = bisect_left(index, lo)
+        return k < len(index) and index[k] < hi
+
+
+class RuleEngine:
+    def __init__(self, rules: list, contexts: dict):
+        self.rules = rules
+        self.contexts = contexts
+        # Each distinct (view, trigger) is searched once however many rules share it
+        self.triggers = list(dict.fromkeys((r.on, t) for r in rules for t in r.triggers))
+
+    def candidate_lines(self, doc: Document) -> list:
+        found = set()
+        for on, trigger in self.triggers:
+            found.update(doc.matching_lines(trigger, on))
+        return sorted(found)
+
+    def scan(self, code: str, lines: list | None = None, lower: str | None = None):
+        """Yield (line_number, rule) for every rule that fires, in line then rule order."""
+        doc = Document(self, code, lines, lower)
+        for idx in self.candidate_lines(doc):
+            line = doc.lines[idx]
+            stripped = line.strip()
+            # Skip empty lines and comments
+            if not stripped or stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+                continue
+            lower = stripped.lower()
+            for rule in self.rules:
+                if rule.check(line, stripped, lower, doc, idx + 1):
+                    yield idx + 1, rule
+
+
+engine = RuleEngine(RULES, CONTEXTS)
+
+
+def scan(code: str):
+    return engine.scan(code)
+
+
+def scan_document(doc) -> list:
+    """Findings for a documents.ParsedDocument, reusing its line split and lower-cased text."""
+    return list(engine.scan(doc.code, doc.lines, doc.lower))
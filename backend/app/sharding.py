@@ -0,0 +1,36 @@
+"""Split a pytest suite across several processes."""
+import heapq
+import subprocess
+
+
+def collect_node_ids(repo_path: str, tests: list | None = None) -> list:
+    """Node ids pytest would run for tests (default: the whole suite)."""
+    cmd = ["pytest", "--collect-only", "-q", "-p", "no:cacheprovider", *(tests or [])]
+    out = subprocess.run(cmd, cwd=repo_path, text=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT).stdout
+    return [line.strip() for line in out.splitlines() if "::" in line and not line.startswith(" ")]
+
+
+def plan_shards(node_ids: list, shards: int, durations: dict | None = None) -> list:
+    """Distribute node_ids over at most `shards` non-empty lists.
+
+    With historical durations the longest tests are placed first, each on the
+    currently lightest shard (LPT); tests never seen before count as the median
+    known duration. Without history tests are dealt round-robin.
+    """
+    shards = max(1, min(shards, len(node_ids)))
+    if not node_ids:
+        return []
+    known = sorted(d for d in (durations or {}).values() if d is not None)
+    if not known:
+        return [node_ids[i::shards] for i in range(shards)]
+    default = known[len(known) // 2]
+    weighted = sorted(((durations.get(t, default), t) for t in node_ids), key=lambda item: -item[0])
+    heap = [(0.0, i) for i in range(shards)]
+    plan = [[] for _ in range(shards)]
+    for duration, test_id in weighted:
+        load, i = heapq.heappop(heap)
+        plan[i].append(test_id)
+        heapq.heappush(heap, (load + duration, i))
+    # Keep each shard in collection order so module/class fixtures are reused
+    order = {t: n for n, t in enumerate(node_ids)}
+    return [sorted(p, key=order.__getitem__) for p in plan if p]
@@ -0,0 +1,166 @@
+"""Coverage-driven test impact selection for repeated runs of the same repo.
+
+A passing full run records, with `--cov-context=test`, which tests executed
+which source lines. The map is stored per repository together with the commit
+it was built from. On a later commit we diff against that base commit and
+only run the tests that cover the changed lines (plus changed or new test
+files). Anything we cannot attribute safely -- config changes, module-level
+code, deleted tests, no usable map -- falls back to a full run.
+"""
+import json
+import os
+import re
+import subprocess
+import zlib
+from datetime import datetime
+
+from .models import get_conn
+
+# Above this share of the known tests a full run is just as cheap and refreshes the map
+MAX_IMPACT_FRACTION = float(os.environ.get("TESTSIGHT_IMPACT_MAX_FRACTION", "0.5"))
+
+# Changes to these never affect test outcomes
+IGNORED_SUFFIXES = (".md", ".rst", ".txt", ".png", ".jpg", ".jpeg", ".gif", ".svg")
+
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+
+class Selection:
+    def __init__(self, mode: str, tests: list | None = None, reason: str = ""):
+        self.mode = mode
+        self.tests = tests
+        self.reason = reason
+
+
+def is_test_file(path: str) -> bool:
+    name = os.path.basename(path)
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def build_map(repo_path: str, coverage_file: str = ".coverage") -> dict | None:
+    """Turn per-test coverage contexts into {"tests": [...], "files": {path: {line: [test_idx]}}}."""
+    try:
+        import coverage
+    except ImportError:
+        return None
+    data_path = os.path.join(repo_path, coverage_file)
+    if not os.path.exists(data_path):
+        return None
+    data = coverage.CoverageData(basename=data_path)
+    data.read()
+    tests = []
+    test_index = {}
+    files = {}
+    for measured in data.measured_files():
+        rel = os.path.relpath(measured, repo_path).replace(os.sep, "/")
+        if rel.startswith(".."):
+            continue
+        lines = {}
+        for lineno, contexts in data.contexts_by_lineno(measured).items():
+            owners = set()
+            for context in contexts:
+                # pytest-cov names contexts "<nodeid>|setup/run/teardown"; "" is import time
+                test_id = context.split("|", 1)[0]
+                if not test_id:
+                    owners.add(-1)
+                    continue
+                if test_id not in test_index:
+                    test_index[test_id] = len(tests)
+                    tests.append(test_id)
+                owners.add(test_index[test_id])
+            lines[str(lineno)] = sorted(owners)
+        files[rel] = lines
+    if not tests:
+        return None
+    return {"tests": tests, "files": files}
+
+
+def save_map(repo_url: str, base_sha: str, impact: dict):
+    blob = zlib.compress(json.dumps(impact, separators=(",", ":")).encode("utf-8"))
+    conn = get_conn()
+    with conn:
+        conn.execute("""
+            INSERT INTO test_impact_maps (repo_url, base_sha, impact, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(repo_url) DO UPDATE SET base_sha=excluded.base_sha, impact=excluded.impact,
+                                                updated_at=excluded.updated_at
+        """, (repo_url, base_sha, blob, datetime.utcnow().isoformat()))
+
+
+def load_map(repo_url: str):
+    row = get_conn().execute("SELECT base_sha, impact FROM test_impact_maps WHERE repo_url=?", (repo_url,)).fetchone()
+    if not row:
+        return None, None
+    return row["base_sha"], json.loads(zlib.decompress(row["impact"]))
+
+
+def changed_lines(repo_path: str, base_sha: str, head_sha: str) -> dict:
+    """{path: set of changed line numbers in the base version} between two commits.
+
+    New files map to an empty set; pure insertions mark the lines on either side.
+    """
+    diff = subprocess.run(["git", "diff", "--unified=0", "--no-renames", "--no-color", base_sha, head_sha],
+                          cwd=repo_path, check=True, text=True, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, errors="replace").stdout
+    changes = {}
+    path = None
+    old_path = None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            old_path = None if line == "--- /dev/null" else line[6:]
+        elif line.startswith("+++ "):
+            path = old_path if line == "+++ /dev/null" else line[6:]
+            changes.setdefault(path, set())
+        elif line.startswith("@@") and path is not None:
+            if old_path is None:
+                continue
+            match = HUNK_RE.match(line)
+            if not match:
+                continue
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            if count == 0:
+                changes[path].update((start, start + 1))
+            else:
+                changes[path].update(range(start, start + count))
+    return changes
+
+
+def select_tests(repo_url: str, repo_path: str, head_sha: str | None) -> Selection:
+    if not head_sha:
+        return Selection("full", reason="not a git checkout")
+    base_sha, impact = load_map(repo_url)
+    if not impact:
+        return Selection("full", reason="no impact map yet")
+    try:
+        changes = changed_lines(repo_path, base_sha, head_sha)
+    except (subprocess.CalledProcessError, OSError):
+        return Selection("full", reason=f"cannot diff against {base_sha}")
+
+    tests = impact["tests"]
+    files = impact["files"]
+    known_test_files = {t.split("::", 1)[0] for t in tests}
+    selected = set()
+    selected_files = set()
+    for path, lines in changes.items():
+        if path.lower().endswith(IGNORED_SUFFIXES) and not os.path.basename(path).startswith("requirements"):
+            continue
+        if not path.endswith(".py") or os.path.basename(path) == "conftest.py":
+            return Selection("full", reason=f"{path} changed")
+        if path in known_test_files or is_test_file(path):
+            if not os.path.exists(os.path.join(repo_path, path)):
+                return Selection("full", reason=f"test file {path} removed")
+            selected_files.add(path)
+            continue
+        covered = files.get(path, {})
+        for lineno in lines:
+            for owner in covered.get(str(lineno), ()):
+                if owner == -1:
+                    return Selection("full", reason=f"module-level code in {path} changed")
+                selected.add(tests[owner])
+
+    picked = sorted(selected_files) + sorted(t for t in selected if t.split("::", 1)[0] not in selected_files)
+    if not picked:
+        return Selection("full", reason="no covered code changed")
+    if len(picked) > MAX_IMPACT_FRACTION * len(tests):
+        return Selection("full", reason=f"{len(picked)} of {len(tests)} tests affected")
+    return Selection("impacted", picked, reason=f"{len(picked)} of {len(tests)} tests affected since {base_sha[:12]}")
@@ -0,0 +1,325 @@
+"""Streaming uploads behind /repos/upload and /code/upload-image.
+
+read_form() parses the multipart body as it arrives and stops reading with
+UploadTooLarge once more than the limit (plus FORM_OVERHEAD) has come in, so
+an oversized upload is turned away after at most that many bytes whether or
+not it declares a Content-Length. The file part is spooled to a temporary
+file; from there it is read in UPLOAD_CHUNK_BYTES blocks that are hashed
+(SHA-256), counted against the size limit and written out, so an upload
+costs one block of memory however large it is.
+
+Repository archives are unpacked into a workspace directory that can be
+passed to /jobs as repo_url. Tar archives (plain, gz, bz2, xz) are extracted
+while they stream through the hash; zip keeps its directory at the end, so it
+is hashed first and then extracted member by member. Member names are
+checked before anything is written: absolute paths and '..' fail the upload,
+links and device files are skipped. The extracted bytes and file count are
+capped as well, which stops decompression bombs. Workspaces are named after
+the upload's hash and file name, so uploading the same file again reuses the
+first extraction. They are shared and never written to: a job runs on its
+own copy (copy_workspace). evict_workspaces() removes the least recently
+used ones once UPLOAD_DIR grows past TESTSIGHT_UPLOAD_DIR_MAX_BYTES.
+"""
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import uuid
+import zipfile
+import zlib
+
+from starlette.datastructures import FormData, UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+from .git_cache import dir_size, file_lock
+
+UPLOAD_DIR = os.environ.get("TESTSIGHT_UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "testsight_workspace",
+                                                                  "uploads"))
+IMAGE_DIR = os.path.join(tempfile.gettempdir(), "devagent_images")
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.environ.get("TESTSIGHT_MAX_UPLOAD_BYTES", str(1024 ** 3)))
+MAX_IMAGE_BYTES = int(os.environ.get("TESTSIGHT_MAX_IMAGE_BYTES", str(25 * 1024 ** 2)))
+MAX_EXTRACTED_BYTES = int(os.environ.get("TESTSIGHT_MAX_EXTRACTED_BYTES", str(4 * 1024 ** 3)))
+MAX_EXTRACTED_FILES = int(os.environ.get("TESTSIGHT_MAX_EXTRACTED_FILES", "200000"))
+# Workspaces are evicted least-recently-used first past this (default 10 GiB); ones used within the hour stay
+UPLOAD_DIR_MAX_BYTES = int(os.environ.get("TESTSIGHT_UPLOAD_DIR_MAX_BYTES", str(10 * 1024 ** 3)))
+WORKSPACE_MIN_AGE = 3600
+# Multipart framing around the file part, allowed on top of the limit in the Content-Length check
+FORM_OVERHEAD = 64 * 1024
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ZIP_SUFFIXES = (".zip",)
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def check_length(content_length: str | None, limit: int):
+    """Reject a request whose declared body is already over limit, before any of it is read."""
+    if content_length and content_length.isdigit() and int(content_length) > limit + FORM_OVERHEAD:
+        raise UploadTooLarge(f"Upload exceeds the {limit} byte limit")
+
+
+async def limited_stream(chunks, limit: int):
+    """The chunks of a request body, cut off with UploadTooLarge once it is over limit plus FORM_OVERHEAD."""
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > limit + FORM_OVERHEAD:
+            raise UploadTooLarge(f"Upload exceeds the {limit} byte limit")
+        yield chunk
+
+
+async def read_form(request, limit: int) -> FormData:
+    """The multipart form of request, parsed while the body streams in and rejected as soon as it passes limit.
+
+    The caller closes the form, which removes the spooled files.
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise ValueError("Expected a multipart/form-data upload")
+    check_length(request.headers.get("content-length"), limit)
+    parser = MultiPartParser(request.headers, limited_stream(request.stream(), limit),
+                             max_files=1, max_fields=10)
+    try:
+        return await parser.parse()
+    except MultiPartException as e:
+        raise ValueError(e.message)
+
+
+def form_file(form: FormData, field: str = "file") -> UploadFile:
+    upload = form.get(field)
+    if not isinstance(upload, UploadFile):
+        raise ValueError(f"Missing file upload {field!r}")
+    return upload
+
+
+class HashingReader:
+    """File-like wrapper that hashes and counts what is read through it and stops past limit bytes."""
+
+    def __init__(self, f, limit: int):
+        self.f = f
+        self.limit = limit
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+
+    def read(self, n: int = -1) -> bytes:
+        data = self.f.read(n)
+        self.size += len(data)
+        if self.size > self.limit:
+            raise UploadTooLarge(f"Upload exceeds the {self.limit} byte limit")
+        self.sha256.update(data)
+        return data
+
+    def drain(self):
+        """Read to the end, e.g. the padding a tar reader leaves behind, so the hash covers everything."""
+        while self.read(UPLOAD_CHUNK_BYTES):
+            pass
+
+
+def copy_stream(src, dst, size: int = UPLOAD_CHUNK_BYTES):
+    while True:
+        block = src.read(size)
+        if not block:
+            break
+        dst.write(block)
+
+
+def member_path(root: str, name: str) -> str | None:
+    """Where archive member name goes under root; None for the root itself, ValueError when it would escape."""
+    name = name.replace("\\", "/")
+    parts = [part for part in name.split("/") if part not in ("", ".")]
+    if name.startswith("/") or ".." in parts or (parts and ":" in parts[0]):
+        raise ValueError(f"Unsafe path in archive: {name!r}")
+    return os.path.join(root, *parts) if parts else None
+
+
+class Extraction:
+    """Writes archive members under root while keeping count of files and bytes against the limits."""
+
+    def __init__(self, root: str, max_bytes: int = MAX_EXTRACTED_BYTES, max_files: int = MAX_EXTRACTED_FILES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.files = 0
+        self.bytes = 0
+        self.skipped = 0
+        os.makedirs(root, exist_ok=True)
+
+    def directory(self, name: str):
+        path = member_path(self.root, name)
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def file(self, name: str, src):
+        path = member_path(self.root, name)
+        if path is None:
+            return
+        self.files += 1
+        if self.files > self.max_files:
+            raise UploadTooLarge(f"Archive has more than {self.max_files} files")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Sizes in archive headers can lie, so the budget is checked on the bytes actually inflated
+        with open(path, "wb") as dst:
+            while True:
+                block = src.read(UPLOAD_CHUNK_BYTES)
+                if not block:
+                    break
+                self.bytes += len(block)
+                if self.bytes > self.max_bytes:
+                    raise UploadTooLarge(f"Archive expands past the {self.max_bytes} byte limit")
+                dst.write(block)
+
+
+def extract_tar(f, extraction: Extraction):
+    """Extract a tar stream (any compression) in one sequential pass over f."""
+    try:
+        with tarfile.open(fileobj=f, mode="r|*") as tar:
+            for member in tar:
+                if member.isdir():
+                    extraction.directory(member.name)
+                elif member.isfile():
+                    extraction.file(member.name, tar.extractfile(member))
+                else:
+                    extraction.skipped += 1
+    except tarfile.TarError as e:
+        raise ValueError(f"Not a valid tar archive: {e}")
+
+
+def extract_zip(f, extraction: Extraction):
+    """Extract a zip archive from the seekable file f."""
+    try:
+        with zipfile.ZipFile(f) as archive:
+            for info in archive.infolist():
+                mode = info.external_attr >> 16
+                if info.is_dir():
+                    extraction.directory(info.filename)
+                elif mode and (mode & 0o170000) not in (0, 0o100000):
+                    # Symlinks and other special files made by Unix zip
+                    extraction.skipped += 1
+                else:
+                    with archive.open(info) as src:
+                        extraction.file(info.filename, src)
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError, zlib.error, EOFError, OSError) as e:
+        # Bad deflate data surfaces as zlib.error and a truncated member as EOFError, only once it is read
+        raise ValueError(f"Not a valid zip archive: {e}")
+
+
+def workspace_root(path: str) -> str:
+    """path, or the single directory in it (archives of a repository usually wrap it in one)."""
+    entries = os.listdir(path)
+    if len(entries) == 1 and os.path.isdir(os.path.join(path, entries[0])):
+        return os.path.join(path, entries[0])
+    return path
+
+
+def store_repo(f, filename: str, max_bytes: int = MAX_UPLOAD_BYTES) -> dict:
+    """Unpack the upload in f (a seekable binary file) into a workspace; returns its repo_path and stats.
+
+    Archives are recognized by filename; anything else is stored as the only file of the workspace.
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    filename = os.path.basename(filename.replace("\\", "/")) or "upload"
+    lower = filename.lower()
+    incoming = tempfile.mkdtemp(prefix=".incoming-", dir=UPLOAD_DIR)
+    try:
+        extraction = Extraction(os.path.join(incoming, "repo"))
+        reader = HashingReader(f, max_bytes)
+        if lower.endswith(TAR_SUFFIXES):
+            extract_tar(reader, extraction)
+            reader.drain()
+        elif lower.endswith(ZIP_SUFFIXES):
+            reader.drain()
+            f.seek(0)
+            extract_zip(f, extraction)
+        else:
+            extraction.file(filename, reader)
+        digest = reader.sha256.hexdigest()
+        # The name picks the archive format, and a single file keeps it, so it is part of the key
+        key = hashlib.sha256(f"{digest}/{filename}".encode("utf-8")).hexdigest()[:32]
+        workspace = os.path.join(UPLOAD_DIR, key)
+        reused = os.path.isdir(workspace)
+        if not reused:
+            try:
+                os.rename(extraction.root, workspace)
+            except OSError:
+                # The same upload finished extracting in another request first
+                reused = True
+        touch(workspace)
+    finally:
+        shutil.rmtree(incoming, ignore_errors=True)
+    evict_workspaces()
+    return {
+        "repo_path": workspace_root(workspace),
+        "sha256": digest,
+        "bytes": reader.size,
+        "files": extraction.files,
+        "skipped": extraction.skipped,
+        "reused": reused,
+    }
+
+
+def touch(path: str):
+    now = time.time()
+    os.utime(path, (now, now))
+
+
+def upload_workspace(path: str) -> str | None:
+    """The workspace under UPLOAD_DIR that path (a repo_path handed out by store_repo) lies in, or None."""
+    root = os.path.realpath(UPLOAD_DIR)
+    full = os.path.realpath(path)
+    if os.path.commonpath([root, full]) != root or full == root:
+        return None
+    name = os.path.relpath(full, root).split(os.sep)[0]
+    return None if name.startswith(".") else os.path.join(root, name)
+
+
+def copy_workspace(path: str, dest: str) -> str:
+    """Copy path, a directory inside an upload workspace, to dest for one job to work in; returns dest."""
+    shutil.rmtree(dest, ignore_errors=True)
+    shutil.copytree(path, dest, symlinks=True)
+    return dest
+
+
+def evict_workspaces(max_bytes: int = UPLOAD_DIR_MAX_BYTES, min_age: float = WORKSPACE_MIN_AGE) -> list:
+    """Remove the least recently used workspaces until UPLOAD_DIR is under max_bytes; returns their paths.
+
+    Workspaces stored or copied within min_age seconds stay, and so do extractions still in progress.
+    """
+    evicted = []
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    with file_lock(os.path.join(UPLOAD_DIR, ".evict.lock")):
+        items = []
+        for name in os.listdir(UPLOAD_DIR):
+            path = os.path.join(UPLOAD_DIR, name)
+            if os.path.isdir(path):
+                items.append((os.stat(path).st_mtime, path, dir_size(path)))
+        items.sort()
+        total = sum(size for _, _, size in items)
+        cutoff = time.time() - min_age
+        for last_used, path, size in items:
+            if last_used > cutoff:
+                break
+            # Extractions a crashed request left behind go regardless of the quota
+            if total > max_bytes or os.path.basename(path).startswith(".incoming-"):
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                evicted.append(path)
+    return evicted
+
+
+def store_file(f, filename: str, directory: str = IMAGE_DIR, max_bytes: int = MAX_IMAGE_BYTES) -> dict:
+    """Copy the upload in f to a uniquely named file in directory; returns its path, size and hash."""
+    os.makedirs(directory, exist_ok=True)
+    filename = os.path.basename(filename.replace("\\", "/")) or "upload"
+    path = os.path.join(directory, f"{uuid.uuid4().hex}_{filename}")
+    reader = HashingReader(f, max_bytes)
+    try:
+        with open(path, "wb") as dst:
+            copy_stream(reader, dst)
+    except BaseException:
+        os.remove(path)
+        raise
+    return {"path": path, "bytes": reader.size, "sha256": reader.sha256.hexdigest()}
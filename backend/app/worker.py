@@ -1,16 +1,33 @@
 import os
 import shutil
 import subprocess
-from .jobs import get_job
+import sys
+import threading
+from .jobs import finish_job, get_job, set_job_commit, set_job_status
 from .models import get_conn
+from .git_cache import GitCache, head_sha
+from . import test_impact, uploads
+from .results import parse_junit, parse_coverage_json, load_durations, save_durations, save_results
+from .sharding import collect_node_ids, plan_shards
+from .job_events import JobEvents
 from datetime import datetime
-import uuid
 import tempfile
 
 # Use temp directory that works on all platforms
 WORKDIR = os.path.join(tempfile.gettempdir(), "testsight_workspace")
 os.makedirs(WORKDIR, exist_ok=True)
 
+# Mirrors, evicted LRU past the quota (default 20 GiB), and the workspaces of running jobs
+GIT_CACHE_MAX_BYTES = int(os.environ.get("TESTSIGHT_GIT_CACHE_MAX_BYTES", str(20 * 1024 ** 3)))
+git_cache = GitCache(os.path.join(WORKDIR, "git-cache"), GIT_CACHE_MAX_BYTES)
+
+# Per-job copies of uploaded workspaces (uploads.copy_workspace), removed when the job ends
+JOB_COPIES_DIR = os.path.join(WORKDIR, "job-copies")
+
+# JUnit reports, coverage.json and pytest logs of every run (runs.artifacts_path)
+ARTIFACTS_DIR = os.path.join(WORKDIR, "artifacts")
+os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+
 def call_kiro_generate_tests(repo_path: str, spec_path: str = "/.kiro/generate_tests.spec.yaml") -> str:
     candidate = os.path.join(repo_path, ".kiro", "generated_tests.py")
     if os.path.exists(candidate):
@@ -34,69 +51,194 @@ def test_add_zero():
 """)
     return dest
 
-def run_pytest_with_coverage(repo_path: str):
-    cmd = ["pytest", "--maxfail=1", "--disable-warnings", "--cov=.", "--cov-report=term-missing"]
-    p = subprocess.Popen(cmd, cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-    output, _ = p.communicate()
-    tests_total = 0
-    tests_failed = 0
-    coverage = 0.0
-    for line in output.splitlines():
-        if "failed" in line and "passed" in line:
-            parts = line.split(',')
-            for part in parts:
-                if 'passed' in part:
-                    try:
-                        passed = int(part.strip().split()[0])
-                    except:
-                        passed = 0
-                if 'failed' in part:
-                    try:
-                        failed = int(part.strip().split()[0])
-                    except:
-                        failed = 0
-            tests_failed = locals().get('failed', 0)
-            tests_total = locals().get('passed', 0) + tests_failed
-        if 'TOTAL' in line and '%' in line:
-            try:
-                coverage = float(line.split()[-1].strip().replace('%',''))
-            except:
-                pass
-    return {"output": output, "tests_total": tests_total, "tests_failed": tests_failed, "coverage": coverage}
-
-def save_run(job_id: int, res: dict, artifacts_path: str | None = None):
-    conn = get_conn()
-    cur = conn.cursor()
+def _pump_output(stream, log_path: str, on_line=None):
+    """Copy a process's output to log_path line by line, reporting each line as it arrives."""
+    with open(log_path, "w") as log:
+        for line in stream:
+            log.write(line)
+            if on_line:
+                on_line(line.rstrip("\n"))
+
+def run_pytest_with_coverage(repo_path: str, tests: list | None = None, contexts: bool = False,
+                             shards: int = 1, durations: dict | None = None, artifacts_path: str | None = None,
+                             on_line=None):
+    """Run pytest (optionally sharded) and return machine-readable results.
+
+    Each process writes a JUnit XML report and streams its output to a log
+    file in artifacts_path rather than into memory, passing every line to
+    on_line (prefixed with the shard when sharded); coverage is read back from
+    `coverage json`. With several shards every process gets its own coverage
+    data file and they are combined into repo_path/.coverage afterwards, so the
+    total and per-test contexts match a single-process run.
+    """
+    artifacts_path = artifacts_path or tempfile.mkdtemp(prefix="run_", dir=ARTIFACTS_DIR)
+    os.makedirs(artifacts_path, exist_ok=True)
+    plan = [list(tests or [])]
+    if shards > 1:
+        sharded = plan_shards(collect_node_ids(repo_path, tests), shards, durations)
+        if len(sharded) > 1:
+            plan = sharded
+    cmd = ["pytest", "--maxfail=1", "--disable-warnings", "--cov=.", "--cov-report=",
+           "-p", "no:cacheprovider", "-o", "junit_family=xunit1"]
+    if contexts:
+        # Record which test ran each line, feeding test_impact
+        cmd.append("--cov-context=test")
     started_at = datetime.utcnow().isoformat()
-    finished_at = datetime.utcnow().isoformat()
-    cur.execute("INSERT INTO runs (job_id, started_at, finished_at, tests_total, tests_failed, coverage, artifacts_path) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (job_id, started_at, finished_at, res.get('tests_total',0), res.get('tests_failed',0), res.get('coverage',0.0), artifacts_path))
-    conn.commit()
-    conn.close()
+    procs = []
+    pumps = []
+    try:
+        for i, node_ids in enumerate(plan):
+            junit = os.path.join(artifacts_path, f"junit-{i}.xml")
+            log_path = os.path.join(artifacts_path, f"pytest-{i}.log")
+            # Unbuffered so progress reaches on_line as pytest prints it
+            env = dict(os.environ, PYTHONUNBUFFERED="1")
+            if len(plan) > 1:
+                env["COVERAGE_FILE"] = os.path.join(repo_path, f".coverage.shard{i}")
+            p = subprocess.Popen(cmd + [f"--junitxml={junit}", *node_ids], cwd=repo_path, env=env,
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace")
+            procs.append((p, junit, log_path))
+            shard_on_line = on_line
+            if on_line and len(plan) > 1:
+                shard_on_line = lambda line, prefix=f"[shard {i}] ": on_line(prefix + line)
+            pump = threading.Thread(target=_pump_output, args=(p.stdout, log_path, shard_on_line), daemon=True)
+            pump.start()
+            pumps.append(pump)
+        returncode = 0
+        results = []
+        for (p, junit, _), pump in zip(procs, pumps):
+            p.wait()
+            pump.join()
+            returncode = max(returncode, p.returncode)
+            results.extend(parse_junit(junit))
+    finally:
+        for p, _, _ in procs:
+            if p.poll() is None:
+                p.kill()
+    coverage_cmd = [sys.executable, "-m", "coverage"]
+    if len(plan) > 1:
+        data_files = [f".coverage.shard{i}" for i in range(len(plan))
+                      if os.path.exists(os.path.join(repo_path, f".coverage.shard{i}"))]
+        subprocess.run([*coverage_cmd, "combine", *data_files], cwd=repo_path,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    coverage_json = os.path.join(artifacts_path, "coverage.json")
+    subprocess.run([*coverage_cmd, "json", "-q", "-o", coverage_json], cwd=repo_path,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    coverage, coverage_files = parse_coverage_json(coverage_json)
+    return {
+        "tests_total": sum(1 for r in results if r[1] != "skipped"),
+        "tests_failed": sum(1 for r in results if r[1] in ("failed", "error")),
+        "coverage": coverage,
+        "returncode": returncode,
+        "results": results,
+        "coverage_files": coverage_files,
+        "shards": len(plan),
+        "artifacts_path": artifacts_path,
+        "log_paths": [log_path for _, _, log_path in procs],
+        "started_at": started_at,
+        "finished_at": datetime.utcnow().isoformat(),
+    }
 
-def run_job_background(job_id: int):
-    job = get_job(job_id)
+def save_run(job_id: int, res: dict, artifacts_path: str | None = None, owner: str | None = None):
+    """Insert the run plus its per-test results and per-file coverage and mark the job done; returns the run id.
+
+    With owner, all of it happens only while owner holds the job's lease; otherwise nothing is saved and
+    the result is None.
+    """
+    conn = get_conn()
+    now = datetime.utcnow().isoformat()
+    with conn:
+        if not finish_job(conn, job_id, "done", owner):
+            return None
+        cur = conn.execute("INSERT INTO runs (job_id, started_at, finished_at, tests_total, tests_failed, coverage, artifacts_path, selection_mode) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (job_id, res.get('started_at', now), res.get('finished_at', now), res.get('tests_total',0), res.get('tests_failed',0), res.get('coverage',0.0), artifacts_path or res.get('artifacts_path'), res.get('selection_mode', 'full')))
+        run_id = cur.lastrowid
+        save_results(conn, run_id, res.get("results", []), res.get("coverage_files", []))
+    return run_id
+
+def checkout_workspace(job: dict, events: JobEvents, writable: bool = True, owner: str | None = None):
+    """(repo_path, commit_sha) for the job's repository, or (None, None) after marking it failed_clone.
+
+    URLs are checked out from the git cache. Uploaded workspaces are shared between jobs, so a job that
+    writes (generated tests, coverage data) gets its own copy; other local paths are used in place.
+    """
     repo_url = job.get('repo_url')
+    events.stage("clone")
     if repo_url.startswith("/") and os.path.exists(repo_url):
         repo_path = repo_url
+        workspace = uploads.upload_workspace(repo_url)
+        if workspace:
+            # Keeps it off the eviction list while the job runs
+            uploads.touch(workspace)
+            if writable:
+                repo_path = uploads.copy_workspace(repo_url, os.path.join(JOB_COPIES_DIR, f"job_{job['id']}"))
+        commit_sha = head_sha(repo_path)
     else:
-        repo_name = f"repo_{uuid.uuid4().hex[:8]}"
-        repo_path = os.path.join(WORKDIR, repo_name)
-        os.makedirs(WORKDIR, exist_ok=True)
         try:
-            subprocess.check_call(["git", "clone", repo_url, repo_path])
+            repo_path, commit_sha = git_cache.checkout(repo_url, job.get('ref'), bool(job.get('sparse')))
         except Exception as e:
-            conn = get_conn()
-            cur = conn.cursor()
-            cur.execute("UPDATE jobs SET status=? WHERE id=?", ("failed_clone", job_id))
-            conn.commit()
-            conn.close()
+            events.line(f"clone failed: {e}")
+            if set_job_status(job['id'], "failed_clone", owner):
+                events.status("failed_clone")
+            return None, None
+    set_job_commit(job['id'], commit_sha)
+    return repo_path, commit_sha
+
+def release_workspace(job: dict, repo_path: str):
+    if os.path.dirname(repo_path) == JOB_COPIES_DIR:
+        shutil.rmtree(repo_path, ignore_errors=True)
+    elif repo_path != job.get('repo_url'):
+        git_cache.release(repo_path)
+        git_cache.enforce_quota()
+
+def lease_lost(lease, events: JobEvents) -> bool:
+    """True when the worker's lease on the job ran out, so its results must not be saved."""
+    if lease is not None and lease.lost:
+        events.line("lease lost, leaving the job to its next owner")
+        return True
+    return False
+
+def run_job_background(job_id: int, lease=None):
+    """Run a test job; lease is the worker's Heartbeat (worker_pool), None when run outside the pool."""
+    job = get_job(job_id)
+    events = JobEvents(job_id)
+    owner = lease.owner if lease is not None else None
+    repo_url = job.get('repo_url')
+    repo_path, commit_sha = checkout_workspace(job, events, owner=owner)
+    if repo_path is None:
+        return
+    try:
+        events.stage("generate")
+        test_file = call_kiro_generate_tests(repo_path)
+        selection = test_impact.select_tests(repo_url, repo_path, commit_sha)
+        events.line(f"selection: {selection.mode} ({selection.reason})")
+        events.stage("test")
+        full = selection.mode == "full"
+        shards = job.get('shards') or 1
+        durations = load_durations(repo_url) if shards > 1 else None
+        artifacts_path = os.path.join(ARTIFACTS_DIR, f"job_{job_id}")
+        res = run_pytest_with_coverage(repo_path, tests=selection.tests, contexts=full, shards=shards,
+                                       durations=durations, artifacts_path=artifacts_path, on_line=events.line)
+        if selection.mode == "impacted" and res["returncode"] in (4, 5):
+            # Selected node ids no longer collect (renamed tests): run everything
+            selection = test_impact.Selection("full", reason="selected tests not collected")
+            full = True
+            events.line("selected tests not collected, running the full suite")
+            res = run_pytest_with_coverage(repo_path, contexts=True, shards=shards, durations=durations,
+                                           artifacts_path=artifacts_path, on_line=events.line)
+        res["selection_mode"] = selection.mode
+        if lease_lost(lease, events):
             return
-    test_file = call_kiro_generate_tests(repo_path)
-    res = run_pytest_with_coverage(repo_path)
-    save_run(job_id, res)
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("UPDATE jobs SET status=? WHERE id=?", ("done", job_id))
-    conn.commit()
-    conn.close()
+        events.stage("save")
+        if res.get("results"):
+            save_durations(repo_url, res["results"])
+        if full and commit_sha and res["returncode"] == 0:
+            # Only a complete, passing run gives a trustworthy map (--maxfail stops early)
+            impact = test_impact.build_map(repo_path)
+            if impact:
+                test_impact.save_map(repo_url, commit_sha, impact)
+        if save_run(job_id, res, owner=owner) is None:
+            events.line("lease lost, run not saved")
+            return
+        events.status("done")
+    finally:
+        release_workspace(job, repo_path)
@@ -0,0 +1,164 @@
+"""Job worker processes draining the durable queue in the jobs table.
+
+Run a standalone pool next to the API with:
+
+    python -m app.worker_pool --workers 4
+
+Each worker claims one job at a time under a lease, keeps the lease alive
+with a heartbeat thread while the job runs, and puts jobs whose lease expired
+(crashed or killed worker) back on the queue. Results are saved and the
+job finished only while the worker still holds the lease, so a worker that
+lost it cannot overwrite the run of the job's next owner. The API can also start a small
+embedded pool (TESTSIGHT_EMBEDDED_WORKERS) for single-command setups; set it
+to 0 when running dedicated workers.
+"""
+import argparse
+import atexit
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+
+from .jobs import claim_job, heartbeat_job, requeue_expired_jobs, set_job_status
+from .worker import run_job_background
+from .repo_review import run_review_job
+from .job_events import JobEvents
+
+WORKERS = int(os.environ.get("TESTSIGHT_WORKERS", str(os.cpu_count() or 2)))
+EMBEDDED_WORKERS = int(os.environ.get("TESTSIGHT_EMBEDDED_WORKERS", "1"))
+LEASE_SECONDS = float(os.environ.get("TESTSIGHT_JOB_LEASE_SECONDS", "60"))
+POLL_INTERVAL = float(os.environ.get("TESTSIGHT_JOB_POLL_SECONDS", "1"))
+MAX_ATTEMPTS = int(os.environ.get("TESTSIGHT_JOB_MAX_ATTEMPTS", "3"))
+
+logger = logging.getLogger(__name__)
+
+# Workers are spawned, not forked, so they never inherit the API's threads,
+# sockets or database handles
+_ctx = multiprocessing.get_context("spawn")
+_embedded = {"stop": None, "procs": []}
+
+
+class Heartbeat:
+    """Renews a job lease from a background thread while the job runs."""
+
+    def __init__(self, job_id: int, owner: str, lease_seconds: float = LEASE_SECONDS):
+        self.job_id = job_id
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                if not heartbeat_job(self.job_id, self.owner, self.lease_seconds):
+                    self.lost = True
+                    logger.warning("Lost lease on job %s", self.job_id)
+                    return
+            except Exception:
+                logger.exception("Heartbeat for job %s failed", self.job_id)
+
+
+def process_one(owner: str) -> bool:
+    """Claim and run a single job; returns False when the queue was empty."""
+    requeue_expired_jobs(MAX_ATTEMPTS)
+    job = claim_job(owner, LEASE_SECONDS)
+    if not job:
+        return False
+    with Heartbeat(job["id"], owner) as heartbeat:
+        try:
+            run = run_review_job if job.get("kind") == "review" else run_job_background
+            run(job["id"], heartbeat)
+        except Exception:
+            logger.exception("Job %s crashed", job["id"])
+            if not heartbeat.lost and set_job_status(job["id"], "failed", owner):
+                JobEvents(job["id"]).status("failed")
+    return True
+
+
+def worker_main(stop_event, poll_interval: float = POLL_INTERVAL):
+    # The parent decides when to stop; a terminal Ctrl-C must not kill a job midway
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    while not stop_event.is_set():
+        try:
+            if process_one(owner):
+                continue
+        except Exception:
+            logger.exception("Worker %s failed to poll the job queue", owner)
+        stop_event.wait(poll_interval)
+
+
+def start_worker(stop_event, name: str):
+    # Not daemonic: review jobs start their own process pool, which daemonic processes may not do.
+    # Whoever starts a worker stops it with stop_pool().
+    proc = _ctx.Process(target=worker_main, args=(stop_event,), name=name)
+    proc.start()
+    return proc
+
+
+def start_pool(size: int):
+    """Start size worker processes; returns (stop_event, processes)."""
+    stop_event = _ctx.Event()
+    return stop_event, [start_worker(stop_event, f"testsight-worker-{i}") for i in range(size)]
+
+
+def stop_pool(stop_event, procs, timeout: float = 30.0):
+    """Ask workers to finish their current job, then terminate stragglers."""
+    stop_event.set()
+    for proc in procs:
+        proc.join(timeout)
+        if proc.is_alive():
+            proc.terminate()
+            proc.join()
+
+
+def start_embedded():
+    if EMBEDDED_WORKERS > 0 and not _embedded["procs"]:
+        _embedded["stop"], _embedded["procs"] = start_pool(EMBEDDED_WORKERS)
+        # Registered after the workers started, so it runs before multiprocessing's own exit hook joins
+        # them; otherwise an API exiting without its shutdown event would wait on the workers forever
+        atexit.unregister(stop_embedded)
+        atexit.register(stop_embedded)
+
+
+def stop_embedded():
+    if _embedded["procs"]:
+        stop_pool(_embedded["stop"], _embedded["procs"])
+        _embedded["stop"], _embedded["procs"] = None, []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run DevAgent job workers")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+
+    stop_event, procs = start_pool(args.workers)
+    logger.info("Started %d job workers", len(procs))
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    try:
+        while not stop_event.wait(1.0):
+            for i, proc in enumerate(procs):
+                if not proc.is_alive():
+                    logger.warning("Worker %s exited with %s, restarting", proc.name, proc.exitcode)
+                    procs[i] = start_worker(stop_event, proc.name)
+    except KeyboardInterrupt:
+        pass
+    logger.info("Stopping job workers")
+    stop_pool(stop_event, procs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Benchmarks for the DevAgent AI backend. Run from the backend directory,
+# e.g. `python -m benchmarks.bench_db`.
@@ -0,0 +1,154 @@
+"""Connection layer benchmark: per-call connections vs the pooled WAL layer.
+
+Usage (from backend/): python -m benchmarks.bench_db [--writes N] [--readers N]
+
+Measures how many get-connection calls per second each layer sustains and the
+latency distribution of a log_activity-style INSERT + COMMIT while reader
+threads hammer the table, which is the /debug + /activity-logs mix we see.
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from app.db import ConnectionPool
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    activity_type TEXT,
+    language TEXT,
+    input_data TEXT,
+    output_data TEXT,
+    status TEXT,
+    created_at TEXT,
+    user_id TEXT
+)
+"""
+INSERT = """
+    INSERT INTO activity_logs (activity_type, language, input_data, output_data, status, created_at, user_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class LegacyLayer:
+    """The original behaviour: a fresh rollback-journal connection per call."""
+    name = "per-call"
+
+    def __init__(self, path):
+        self.path = path
+
+    def get(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def release(self, conn):
+        conn.close()
+
+
+class PooledLayer:
+    name = "pooled"
+
+    def __init__(self, path):
+        self.pool = ConnectionPool(path)
+
+    def get(self):
+        return self.pool.get()
+
+    def release(self, conn):
+        pass
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def bench_connections(layer, seconds):
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        conn = layer.get()
+        conn.execute("SELECT 1").fetchone()
+        layer.release(conn)
+        count += 1
+    return count / seconds
+
+
+def bench_writes(layer, writes, readers):
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            conn = layer.get()
+            conn.execute("SELECT * FROM activity_logs ORDER BY id DESC LIMIT 50").fetchall()
+            layer.release(conn)
+
+    threads = [threading.Thread(target=reader, daemon=True) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    payload = "x" * 400
+    latencies = []
+    try:
+        for _ in range(writes):
+            start = time.perf_counter()
+            conn = layer.get()
+            with conn:
+                conn.execute(INSERT, ("debug", "python", payload, payload, "success",
+                                      datetime.utcnow().isoformat(), "default_user"))
+            layer.release(conn)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    return latencies
+
+
+def run(layer_cls, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        setup = sqlite3.connect(path)
+        setup.execute(SCHEMA)
+        setup.commit()
+        setup.close()
+        layer = layer_cls(path)
+        conns_per_sec = bench_connections(layer, args.seconds)
+        latencies = bench_writes(layer, args.writes, args.readers)
+        if isinstance(layer, PooledLayer):
+            layer.pool.close_all()
+    return {
+        "layer": layer_cls.name,
+        "conns_per_sec": conns_per_sec,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    results = [run(LegacyLayer, args), run(PooledLayer, args)]
+    print(f"{'layer':<10} {'conn/s':>12} {'p50 write':>11} {'p99 write':>11} {'max write':>11}")
+    for r in results:
+        print(f"{r['layer']:<10} {r['conns_per_sec']:>12,.0f} {r['p50_ms']:>9.3f}ms "
+              f"{r['p99_ms']:>9.3f}ms {r['max_ms']:>9.3f}ms")
+    before, after = results
+    print(f"\nconnections/s x{after['conns_per_sec'] / before['conns_per_sec']:.1f}, "
+          f"p99 write latency x{before['p99_ms'] / max(after['p99_ms'], 1e-9):.1f} lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Language detector benchmark: the original if/elif chain vs language_detect.
+
+Usage (from backend/): python -m benchmarks.bench_language_detect [--folds 5] [--repeat 3]
+
+Accuracy is k-fold cross-validated on benchmarks/language_corpus.py: each fold
+is detected with profiles trained on the other folds, so no snippet is scored
+by a model that has seen it. Besides exact accuracy it reports how often each
+detector would reject a request whose language was selected correctly (a
+false "Language mismatch" warning). Throughput is measured on the corpus
+snippets and on one large source, where only the first MAX_CHARS are read.
+"""
+import argparse
+import time
+from collections import Counter
+
+from app import language_detect
+
+from .language_corpus import CORPUS
+
+
+def legacy_detect(code: str) -> str:
+    """The chain detect_language used before language_detect, kept verbatim as the reference."""
+    code_lower = code.lower()
+    
+    # Java detection
+    if 'public class' in code or 'public static void main' in code or 'System.out.println' in code:
+        return 'java'
+    # C# detection
+    elif 'Console.WriteLine' in code or 'namespace' in code or 'using System' in code:
+        return 'c#'
+    # Python detection
+    elif 'def ' in code or 'import ' in code or 'print(' in code or ':' in code and 'def' in code:
+        return 'python'
+    # JavaScript detection
+    elif 'console.log' in code or 'function' in code or 'const ' in code or 'let ' in code or '=>' in code:
+        return 'javascript'
+    # C++ detection
+    elif '#include' in code or 'std::' in code or 'cout' in code:
+        return 'c++'
+    # C detection
+    elif '#include' in code and 'printf' in code:
+        return 'c'
+    # Go detection
+    elif 'func ' in code or 'package main' in code or 'fmt.Print' in code:
+        return 'go'
+    
+    return 'unknown'
+
+
+def legacy_mismatch(selected: str, code: str) -> bool:
+    detected = legacy_detect(code)
+    return detected != 'unknown' and detected != selected
+
+
+def cross_validate(folds: int) -> list:
+    """(label, detected, confidence) per corpus sample, each from profiles trained without its fold."""
+    results = [None] * len(CORPUS)
+    for fold in range(folds):
+        train = [sample for i, sample in enumerate(CORPUS) if i % folds != fold]
+        profiles = language_detect.build_profiles(train)
+        for i in range(fold, len(CORPUS), folds):
+            label, code = CORPUS[i]
+            results[i] = (label,) + language_detect.detect(code, profiles)
+    return results
+
+
+def timed(fn, codes, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for code in codes:
+            fn(code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = cross_validate(args.folds)
+    per_language = Counter(label for label, _ in CORPUS)
+    correct = Counter(label for label, detected, _ in results if detected == label)
+    legacy_correct = Counter(label for label, code in CORPUS if legacy_detect(code) == label)
+    print(f"{'language':>12} {'samples':>8} {'legacy':>8} {'detector':>9}")
+    for label in sorted(per_language):
+        n = per_language[label]
+        print(f"{label:>12} {n:>8} {legacy_correct[label] / n:>8.0%} {correct[label] / n:>9.0%}")
+    print(f"{'all':>12} {len(CORPUS):>8} {sum(legacy_correct.values()) / len(CORPUS):>8.0%} "
+          f"{sum(correct.values()) / len(CORPUS):>9.0%}")
+
+    code_samples = [(label, code) for label, code in CORPUS if label != "unknown"]
+    legacy_false = sum(legacy_mismatch(label, code) for label, code in code_samples)
+    false = sum(language_detect.is_mismatch(label, detected, confidence)
+                for label, detected, confidence in results if label != "unknown")
+    print(f"false mismatch warnings: legacy {legacy_false}/{len(code_samples)}, "
+          f"detector {false}/{len(code_samples)} (confidence >= {language_detect.MISMATCH_CONFIDENCE})")
+    # Every sample submitted under every language it is incompatible with
+    languages = sorted(set(per_language) - {"unknown"})
+    wrong = [(other, i) for i, (label, _) in enumerate(CORPUS) if label != "unknown"
+             for other in languages if not language_detect.compatible(other, label)]
+    legacy_caught = sum(legacy_mismatch(other, CORPUS[i][1]) for other, i in wrong)
+    caught = sum(language_detect.is_mismatch(other, results[i][1], results[i][2]) for other, i in wrong)
+    print(f"wrong selections caught: legacy {legacy_caught / len(wrong):.0%}, detector {caught / len(wrong):.0%}")
+    confusions = Counter((label, detected) for label, detected, _ in results if detected != label)
+    if confusions:
+        print("confusions: " + ", ".join(f"{label}->{detected} x{n}" for (label, detected), n in
+                                         confusions.most_common()))
+
+    codes = [code for _, code in CORPUS]
+    size = sum(map(len, codes))
+    big = "\n".join(codes) * 20
+    print(f"{'input':>14} {'legacy/s':>10} {'detector/s':>11} {'detector MB/s':>14}")
+    for name, inputs, chars in (("corpus", codes, size), ("large source", [big], min(len(big), language_detect.MAX_CHARS))):
+        legacy = timed(legacy_detect, inputs, args.repeat)
+        detector = timed(language_detect.detect, inputs, args.repeat)
+        print(f"{name:>14} {len(inputs) / legacy:>10.0f} {len(inputs) / detector:>11.0f} "
+              f"{chars / detector / 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""/review rule engine benchmark: the original per-line loop vs review_rules.
+
+Usage (from backend/): python -m benchmarks.bench_review [--sizes 1000,10000,50000] [--repeat 3]
+
+Generates C#-flavoured sources with a realistic sprinkling of rule hits
+(parse calls, divisions, SQL strings, long lines), checks that both
+implementations report identical findings and prints lines/second per size.
+Linear scaling shows up as a flat lines/second column.
+"""
+import argparse
+import random
+import re
+import time
+
+from app import review_rules
+
+SNIPPETS = [
+    "int total = a + b;",
+    "Console.WriteLine(\"Result: \" + total);",
+    "for (int i = 0; i < items.Count; i++) {",
+    "}",
+    "// accumulate results",
+    "",
+    "num1 = Convert.ToInt32(Console.ReadLine());",
+    "if (num2 != 0) {",
+    "res = num1 / num2;",
+    "var timeout = 5000;",
+    "string query = \"SELECT * FROM users WHERE id = \" + userId;",
+    "string password = \"hunter2\";",
+    "try {",
+    "} catch (Exception e) {",
+    "var value = eval(expression);",
+    "const int Limit = 1000;",
+    "    var description = \"" + "x" * 160 + "\";",
+]
+
+
+def legacy_scan(code: str):
+    """The loop /review used before review_rules, kept verbatim as the reference."""
+    code_lines = code.split('\n')
+    findings = []
+    for i, line in enumerate(code_lines, 1):
+        line_stripped = line.strip()
+        line_lower = line_stripped.lower()
+        if not line_stripped or line_stripped.startswith('//') or line_stripped.startswith('/*') or line_stripped.startswith('*'):
+            continue
+        if 'password' in line_lower and '=' in line and '"' in line and 'hash' not in line_lower and 'input' not in line_lower and 'read' not in line_lower:
+            findings.append((i, "Hardcoded password detected - critical security risk"))
+        if ('sql' in line_lower or 'query' in line_lower) and ('+' in line or 'concat' in line_lower) and 'select' in line_lower:
+            findings.append((i, "Potential SQL injection vulnerability - use parameterized queries"))
+        if 'eval(' in line_lower:
+            findings.append((i, "Use of eval() is dangerous - security risk"))
+        if len(line) > 150:
+            findings.append((i, "Line is very long - consider breaking it up for readability"))
+        numbers = re.findall(r'\b\d{3,}\b', line_stripped)
+        if numbers and 'const' not in line_lower and 'final' not in line_lower:
+            findings.append((i, "Consider using named constants instead of magic numbers"))
+        if 'convert.toint32' in line_lower or 'int.parse' in line_lower or 'integer.parseint' in line_lower:
+            context_start = max(0, i - 5)
+            context_end = min(len(code_lines), i + 5)
+            if not any('try' in code_lines[j].lower() for j in range(context_start, context_end)):
+                findings.append((i, "Consider adding try-catch for parse operations to handle invalid input"))
+        if '/' in line_stripped and 'num2' in line_stripped:
+            context_start = max(0, i - 10)
+            if not any('!= 0' in code_lines[j] or '== 0' in code_lines[j] for j in range(context_start, i)):
+                findings.append((i, "Add check for division by zero"))
+    return findings
+
+
+def engine_scan(code: str):
+    return [(line_no, rule.message) for line_no, rule in review_rules.scan(code)]
+
+
+def make_source(lines: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    # Mostly plain statements, hits every few dozen lines
+    weights = [30, 10, 8, 8, 5, 5, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+    return "\n".join(rng.choices(SNIPPETS, weights=weights, k=lines))
+
+
+def timed(fn, code, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'legacy s':>10} {'engine s':>10} {'legacy l/s':>12} {'engine l/s':>12} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        code = make_source(size)
+        if legacy_scan(code) != engine_scan(code):
+            raise SystemExit(f"findings differ for {size} lines")
+        legacy = timed(legacy_scan, code, args.repeat)
+        engine = timed(engine_scan, code, args.repeat)
+        print(f"{size:>8} {legacy:>10.4f} {engine:>10.4f} {size / legacy:>12.0f} {size / engine:>12.0f} "
+              f"{legacy / engine:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Regenerate app/language_profiles.py from benchmarks/language_corpus.py.
+
+Usage (from backend/): python -m benchmarks.build_language_profiles
+
+Run it after editing the corpus or the tokenizer in app/language_detect.py,
+then check python -m benchmarks.bench_language_detect before committing.
+"""
+import os
+
+from app import language_detect
+
+from .language_corpus import CORPUS
+
+TARGET = os.path.join(os.path.dirname(language_detect.__file__), "language_profiles.py")
+
+HEADER = '''"""Language profiles for language_detect.
+
+Generated by benchmarks/build_language_profiles.py from
+benchmarks/language_corpus.py; do not edit by hand. language -> (per-feature
+bias, {feature: log-weight}), see language_detect.build_profiles().
+"""
+
+'''
+
+
+def main():
+    profiles = language_detect.build_profiles(CORPUS)
+    with open(TARGET, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        f.write("LANGUAGES = {\n")
+        for language, (bias, weights) in sorted(profiles["languages"].items()):
+            f.write(f"    {language!r}: ({bias!r}, {{\n")
+            for feature, weight in weights.items():
+                f.write(f"        {feature!r}: {weight!r},\n")
+            f.write("    }),\n")
+        f.write("}\n\n")
+        f.write('PROFILES = {\n'
+                '    "vocabulary": frozenset().union(*(weights for _, weights in LANGUAGES.values())),\n'
+                '    "languages": LANGUAGES,\n'
+                '}\n')
+    features = sum(len(weights) for _, weights in profiles["languages"].values())
+    print(f"wrote {TARGET}: {len(profiles['languages'])} languages, {len(profiles['vocabulary'])} features, "
+          f"{features} weights")
+
+
+if __name__ == "__main__":
+    main()
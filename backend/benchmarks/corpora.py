@@ -0,0 +1,256 @@
+"""Synthetic corpora for benchmarks.suite.
+
+make_source() builds a program of about the requested number of lines in
+python, java, c# or javascript. It is made of classes whose methods mix
+loops, parse calls, divisions, try/catch, prints, magic numbers and the odd
+SQL string or hardcoded password, so the analyzers hit their rules at a
+realistic rate instead of running over filler. Output is deterministic for a
+given seed.
+
+log_lines() yields timestamped application log lines drawn from a set of
+message templates, with stack traces and an error burst every few thousand
+lines. free_text_lines() and message_type_lines() are the high-cardinality
+kinds: random words, and 300 message types with numbers scattered through
+them. write_log() streams any kind to a file of a given size, and existing
+files are reused, so the 1 GB corpus is only generated once.
+"""
+import itertools
+import os
+import random
+import string
+import tempfile
+import time
+
+LANGUAGES = ("python", "java", "c#", "javascript")
+CACHE_DIR = os.environ.get("TESTSIGHT_BENCH_DIR", os.path.join(tempfile.gettempdir(), "testsight_bench"))
+
+NOUNS = ("order", "user", "invoice", "item", "account", "payment", "session", "report", "price", "total", "count",
+         "result", "record", "value", "buffer", "request", "response", "index", "limit", "offset")
+
+# Statement templates per language; {a} {b} {c} are identifiers, {n} a number, {s} a method name
+BODIES = {
+    "python": [
+        "{a} = {b} + {c}",
+        "{a} = int(input())",
+        "if {b} != 0:\n    {a} = {c} / {b}",
+        "for i in range(len({a})):\n    {b} += {a}[i]",
+        "print(\"{a}:\", {b})",
+        "# update the {a} before returning",
+        "{a} = {n}",
+        "query = \"SELECT * FROM {a} WHERE id = \" + str({b})",
+        "try:\n    {a} = self.{s}({b})\nexcept Exception:\n    pass",
+        "{a} = [x * 2 for x in {b} if x > {n}]",
+        "while {a} < {n}:\n    {a} += 1",
+        "return {a}",
+    ],
+    "java": [
+        "int {a} = {b} + {c};",
+        "int {a} = Integer.parseInt({b});",
+        "if ({b} != 0) {{\n    {a} = {c} / {b};\n}}",
+        "for (int i = 0; i < {a}.size(); i++) {{\n    {b} += {a}.get(i);\n}}",
+        "System.out.println(\"{a}: \" + {b});",
+        "// update the {a} before returning",
+        "int {a} = {n};",
+        "String query = \"SELECT * FROM {a} WHERE id = \" + {b};",
+        "try {{\n    {a} = {s}({b});\n}} catch (Exception e) {{\n    e.printStackTrace();\n}}",
+        "String password = \"{a}{n}\";",
+        "while ({a} < {n}) {{\n    {a}++;\n}}",
+        "return {a};",
+    ],
+    "c#": [
+        "var {a} = {b} + {c};",
+        "int {a} = Convert.ToInt32(Console.ReadLine());",
+        "if ({b} != 0) {{\n    {a} = {c} / {b};\n}}",
+        "foreach (var x in {a}) {{\n    {b} += x;\n}}",
+        "Console.WriteLine(\"{a}: \" + {b});",
+        "// update the {a} before returning",
+        "var {a} = {n};",
+        "string query = \"SELECT * FROM {a} WHERE id = \" + {b};",
+        "try {{\n    {a} = {s}({b});\n}} catch (Exception e) {{\n    Console.WriteLine(e.Message);\n}}",
+        "string password = \"{a}{n}\";",
+        "while ({a} < {n}) {{\n    {a}++;\n}}",
+        "return {a};",
+    ],
+    "javascript": [
+        "let {a} = {b} + {c};",
+        "const {a} = parseInt({b});",
+        "if ({b} != 0) {{\n    {a} = {c} / {b};\n}}",
+        "for (var i = 0; i < {a}.length; i++) {{\n    {b} += {a}[i];\n}}",
+        "console.log(\"{a}:\", {b});",
+        "// update the {a} before returning",
+        "var {a} = {n};",
+        "const query = \"SELECT * FROM {a} WHERE id = \" + {b};",
+        "try {{\n    {a} = this.{s}({b});\n}} catch (e) {{\n    console.error(e);\n}}",
+        "{a} = {b}.map(x => x * 2).filter(x => x > {n});",
+        "while ({a} < {n}) {{\n    {a}++;\n}}",
+        "return {a};",
+    ],
+}
+BODY_WEIGHTS = (10, 2, 2, 3, 3, 3, 2, 1, 2, 1, 1, 0)
+
+
+def _indent(text: str, prefix: str) -> str:
+    return "\n".join(prefix + line for line in text.split("\n"))
+
+
+def _statement(rng: random.Random, language: str, method_names: list) -> str:
+    a, b, c = rng.sample(NOUNS, 3)
+    template = rng.choices(BODIES[language], weights=BODY_WEIGHTS)[0]
+    return template.format(a=a, b=b, c=c, n=rng.choice((3, 60, 100, 250, 1000, 3600, 86400)),
+                           s=rng.choice(method_names))
+
+
+def _method(rng: random.Random, language: str, name: str, method_names: list, body_lines: int) -> list:
+    body = [_statement(rng, language, method_names) for _ in range(body_lines)]
+    ret = BODIES[language][-1].format(a=rng.choice(NOUNS))
+    if language == "python":
+        return [f"    def {name}(self, {rng.choice(NOUNS)}):", f'        """Compute the {name}."""'] + \
+            [_indent(s, "        ") for s in body] + ["        " + ret, ""]
+    if language == "java":
+        head = f"    public int {name}(int {rng.choice(NOUNS)}) {{"
+    elif language == "c#":
+        head = f"    public int {name}(int {rng.choice(NOUNS)})\n    {{"
+    else:
+        head = f"    {name}({rng.choice(NOUNS)}) {{"
+    return [head] + [_indent(s, "        ") for s in body] + ["        " + ret, "    }", ""]
+
+
+def _class(rng: random.Random, language: str, index: int) -> list:
+    name = f"{rng.choice(NOUNS).title()}Service{index}"
+    method_names = [f"{verb}{noun.title()}" for verb, noun in
+                    zip(rng.sample(("get", "load", "save", "compute", "update", "check", "parse", "format"), 4),
+                        rng.sample(NOUNS, 4))]
+    methods = [line for m in method_names for line in _method(rng, language, m, method_names, rng.randint(3, 12))]
+    if language == "python":
+        return [f"class {name}:", ""] + methods
+    if language == "java":
+        return [f"public class {name} {{", ""] + methods + ["}", ""]
+    if language == "c#":
+        return [f"public class {name}", "{"] + methods + ["}", ""]
+    return [f"class {name} {{", ""] + methods + ["}", ""]
+
+
+HEADERS = {
+    "python": ["import os", "import sys", "", ""],
+    "java": ["import java.util.*;", ""],
+    "c#": ["using System;", "using System.Collections.Generic;", "", "namespace Benchmarks", "{", ""],
+    "javascript": ["'use strict';", ""],
+}
+FOOTERS = {
+    "python": ["if __name__ == \"__main__\":", "    print(\"done\")"],
+    "java": [],
+    "c#": ["}"],
+    "javascript": ["module.exports = {};"],
+}
+
+
+def make_source(language: str, lines: int, seed: int = 0) -> str:
+    """A program of about lines lines in language (whole classes, so it may run slightly over)."""
+    rng = random.Random(f"{language}-{seed}")
+    out = list(HEADERS[language])
+    index = 0
+    while len(out) < lines - len(FOOTERS[language]):
+        out.extend("\n".join(_class(rng, language, index)).split("\n"))
+        index += 1
+    return "\n".join(out + FOOTERS[language])
+
+
+LOG_LEVELS = ("INFO", "INFO", "INFO", "INFO", "DEBUG", "WARN", "ERROR")
+LOG_TEMPLATES = (
+    "Request {id} GET /api/{noun}/{n} completed in {ms}ms",
+    "User {id} logged in from 10.0.{m}.{m}",
+    "Cache miss for {noun}:{id}",
+    "Processed {n} {noun} records in {ms}ms",
+    "Connection to db-{m}.internal:5432 lost, retrying in {n}s",
+    "Timeout after {ms}ms waiting for {noun} service",
+    "NullReferenceException in {Noun}Service.Update{Noun} at line {n}",
+    "Slow query on {noun} took {ms}ms",
+    "Scheduled job {noun}-cleanup removed {n} rows",
+    "Payment {id} for order {n} declined: insufficient funds",
+)
+TRACE = ("    at com.example.{Noun}Service.update{Noun}({Noun}Service.java:{n})\n"
+         "    at com.example.Controller.handle(Controller.java:{m})")
+
+
+def log_lines(seed: int = 0, start: int = 1704067200):
+    """Endless log lines, about three per second of log time, with an error burst every 5000 lines."""
+    rng = random.Random(seed)
+    t = start
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(t))
+    i = 0
+    while True:
+        i += 1
+        if rng.random() < 0.3:
+            t += 1
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(t))
+        burst = i % 5000 < 200
+        level = "ERROR" if burst and rng.random() < 0.5 else rng.choice(LOG_LEVELS)
+        noun = rng.choice(NOUNS)
+        fields = dict(id=rng.randrange(10 ** 6), noun=noun, Noun=noun.title(), n=rng.randrange(1000),
+                      m=rng.randrange(256), ms=rng.randrange(5000))
+        template = LOG_TEMPLATES[rng.randrange(4, 7)] if level == "ERROR" else rng.choice(LOG_TEMPLATES)
+        yield f"{stamp} {level} " + template.format(**fields)
+        if level == "ERROR" and rng.random() < 0.2:
+            yield TRACE.format(**fields)
+
+
+def _words(rng: random.Random, count: int) -> list:
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randrange(3, 10))) for _ in range(count)]
+
+
+def free_text_lines(seed: int = 0, start: int = 1704067200):
+    """Endless log lines of random words: nearly every line is its own shape, the miner's worst case."""
+    rng = random.Random(seed)
+    words = _words(rng, 3000)
+    for i in itertools.count():
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(start + i // 3))
+        yield f"{stamp} {rng.choice(LOG_LEVELS)} " + " ".join(rng.choices(words, k=rng.randrange(5, 13)))
+
+
+def message_type_lines(seed: int = 0, start: int = 1704067200, types: int = 300):
+    """Endless log lines of a fixed set of message types, each token a number 15% of the time."""
+    rng = random.Random(seed)
+    words = _words(rng, 3000)
+    messages = [rng.choices(words, k=rng.randrange(4, 11)) for _ in range(types)]
+    for i in itertools.count():
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(start + i // 3))
+        tokens = [str(rng.randrange(10 ** 6)) if rng.random() < 0.15 else w for w in rng.choice(messages)]
+        yield f"{stamp} {rng.choice(LOG_LEVELS)} " + " ".join(tokens)
+
+
+LOG_KINDS = {"app": log_lines, "freetext": free_text_lines, "types300": message_type_lines}
+
+
+def make_log(size: int, seed: int = 0, kind: str = "app") -> str:
+    """About size bytes of log text of a LOG_KINDS kind."""
+    out = []
+    total = 0
+    for line in LOG_KINDS[kind](seed):
+        out.append(line)
+        total += len(line) + 1
+        if total >= size:
+            break
+    return "\n".join(out) + "\n"
+
+
+def write_log(size: int, seed: int = 0, directory: str = CACHE_DIR, kind: str = "app") -> str:
+    """Path of a log file of about size bytes, generated once and then reused."""
+    name = f"log-{size}-{seed}.log" if kind == "app" else f"log-{kind}-{size}-{seed}.log"
+    path = os.path.join(directory, name)
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+    partial = path + ".partial"
+    with open(partial, "w", encoding="utf-8", newline="\n") as f:
+        written = 0
+        block = []
+        for line in LOG_KINDS[kind](seed):
+            block.append(line)
+            written += len(line) + 1
+            if len(block) == 10000 or written >= size:
+                f.write("\n".join(block) + "\n")
+                block = []
+                if written >= size:
+                    break
+    os.replace(partial, path)
+    return path
@@ -0,0 +1,1986 @@
+"""Labeled snippets for the language detector.
+
+The kind of code people paste into the tools: single functions, small
+classes, main programs and tests, some without the language's most obvious
+marker. build_language_profiles trains app/language_profiles.py on it and
+bench_language_detect cross-validates the detector against it. Non-code
+samples are labeled "unknown".
+"""
+
+CORPUS = [
+    # ---------------------------------------------------------------- python
+    ("python", '''
+def calculate_average(numbers):
+    if not numbers:
+        return 0
+    total = sum(numbers)
+    return total / len(numbers)
+
+print(calculate_average([1, 2, 3]))
+'''),
+    ("python", '''
+import os
+import json
+
+
+class Config:
+    def __init__(self, path):
+        self.path = path
+        self.data = {}
+
+    def load(self):
+        with open(self.path) as f:
+            self.data = json.load(f)
+        return self.data
+'''),
+    ("python", '''
+result = []
+for item in items:
+    if item is None:
+        continue
+    elif isinstance(item, str):
+        result.append(item.strip())
+    else:
+        result.append(str(item))
+'''),
+    ("python", '''
+from typing import List, Optional
+
+def find_user(users: List[dict], name: str) -> Optional[dict]:
+    for user in users:
+        if user["name"] == name:
+            return user
+    return None
+'''),
+    ("python", '''
+try:
+    value = int(input("Enter a number: "))
+except ValueError as e:
+    print(f"Invalid input: {e}")
+else:
+    print(value * 2)
+finally:
+    print("done")
+'''),
+    ("python", '''
+squares = {n: n ** 2 for n in range(10) if n % 2 == 0}
+names = [p.name.title() for p in people if p.age >= 18]
+print(squares, names)
+'''),
+    ("python", '''
+import pytest
+from app.calc import add
+
+
+def test_add():
+    assert add(2, 3) == 5
+
+
+def test_add_negative():
+    assert add(-1, -1) == -2
+'''),
+    ("python", '''
+@app.route("/users/<int:user_id>")
+def get_user(user_id):
+    user = User.query.get_or_404(user_id)
+    return jsonify(user.to_dict())
+'''),
+    ("python", '''
+async def fetch_all(session, urls):
+    tasks = [fetch(session, url) for url in urls]
+    return await asyncio.gather(*tasks)
+
+if __name__ == "__main__":
+    asyncio.run(main())
+'''),
+    ("python", '''
+class Stack:
+    def __init__(self):
+        self._items = []
+
+    def push(self, item):
+        self._items.append(item)
+
+    def pop(self):
+        if not self._items:
+            raise IndexError("pop from empty stack")
+        return self._items.pop()
+
+    def __len__(self):
+        return len(self._items)
+'''),
+    ("python", '''
+with open("data.csv") as f:
+    reader = csv.DictReader(f)
+    rows = [row for row in reader if row["status"] != "inactive"]
+print(len(rows), "active rows")
+'''),
+    ("python", '''
+x = 10
+y = 0
+while x > 0:
+    y += x
+    x -= 1
+print("sum is", y)
+'''),
+    ("python", '''
+@pytest.fixture
+def client():
+    app = create_app({"TESTING": True})
+    with app.test_client() as client:
+        yield client
+
+
+def test_index(client):
+    response = client.get("/")
+    assert response.status_code == 200
+'''),
+    ("python", '''
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Order:
+    id: int
+    items: list = field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        return sum(item.price for item in self.items)
+'''),
+    ("python", '''
+async def fetch_all(session, urls):
+    tasks = [asyncio.create_task(fetch(session, url)) for url in urls]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    return [r for r in results if not isinstance(r, Exception)]
+'''),
+    ("python", '''
+try:
+    value = int(raw_value)
+except (TypeError, ValueError) as exc:
+    logger.warning("bad value %r: %s", raw_value, exc)
+    value = None
+finally:
+    cleanup()
+'''),
+    ("python", '''
+def read_lines(path):
+    """Yield stripped, non-empty lines."""
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                yield line
+'''),
+    ("python", '''
+counts = {}
+for word in text.split():
+    counts[word] = counts.get(word, 0) + 1
+top = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:10]
+print(f"top words: {top}")
+'''),
+    ("python", '''
+class Stack:
+    def __init__(self):
+        self._items = []
+
+    def push(self, item):
+        self._items.append(item)
+
+    def pop(self):
+        if not self._items:
+            raise IndexError("pop from empty stack")
+        return self._items.pop()
+
+    def __len__(self):
+        return len(self._items)
+'''),
+    ("python", '''
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resize images")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--width", type=int, default=800)
+    args = parser.parse_args()
+    main(args.paths, args.width)
+'''),
+    ("python", '''
+def merge_sort(values):
+    if len(values) <= 1:
+        return values
+    mid = len(values) // 2
+    left, right = merge_sort(values[:mid]), merge_sort(values[mid:])
+    merged = []
+    while left and right:
+        merged.append(left.pop(0) if left[0] <= right[0] else right.pop(0))
+    return merged + left + right
+'''),
+    ("python", '''
+squares = {n: n ** 2 for n in range(10) if n % 2 == 0}
+names = [user.name.title() for user in users if user.active]
+print(len(squares), ", ".join(names))
+'''),
+    ("python", '''
+class TestParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = Parser()
+
+    def test_empty_input(self):
+        self.assertEqual(self.parser.parse(""), [])
+
+    def test_invalid_input(self):
+        with self.assertRaises(ParseError):
+            self.parser.parse("((")
+'''),
+    ("python", '''
+def retry(times=3):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(times):
+                try:
+                    return func(*args, **kwargs)
+                except ConnectionError:
+                    if attempt == times - 1:
+                        raise
+        return wrapper
+    return decorator
+'''),
+    # ---------------------------------------------------------------- java
+    ("java", '''
+public class Calculator {
+    public static void main(String[] args) {
+        int a = 5;
+        int b = 3;
+        System.out.println("Sum: " + (a + b));
+    }
+}
+'''),
+    ("java", '''
+import java.util.ArrayList;
+import java.util.List;
+
+public class UserService {
+    private final List<User> users = new ArrayList<>();
+
+    public void addUser(User user) {
+        users.add(user);
+    }
+
+    public List<User> getUsers() {
+        return users;
+    }
+}
+'''),
+    ("java", '''
+@Override
+public boolean equals(Object o) {
+    if (this == o) return true;
+    if (o == null || getClass() != o.getClass()) return false;
+    Point point = (Point) o;
+    return x == point.x && y == point.y;
+}
+'''),
+    ("java", '''
+Scanner scanner = new Scanner(System.in);
+int num1 = Integer.parseInt(scanner.nextLine());
+int num2 = Integer.parseInt(scanner.nextLine());
+System.out.println(num1 / num2);
+'''),
+    ("java", '''
+try {
+    BufferedReader reader = new BufferedReader(new FileReader("input.txt"));
+    String line;
+    while ((line = reader.readLine()) != null) {
+        System.out.println(line);
+    }
+    reader.close();
+} catch (IOException e) {
+    e.printStackTrace();
+}
+'''),
+    ("java", '''
+public interface Shape {
+    double area();
+}
+
+public class Circle implements Shape {
+    private final double radius;
+
+    public Circle(double radius) {
+        this.radius = radius;
+    }
+
+    @Override
+    public double area() {
+        return Math.PI * radius * radius;
+    }
+}
+'''),
+    ("java", '''
+import org.junit.jupiter.api.Test;
+import static org.junit.jupiter.api.Assertions.assertEquals;
+
+class CalculatorTest {
+    @Test
+    void addsTwoNumbers() {
+        Calculator calc = new Calculator();
+        assertEquals(5, calc.add(2, 3));
+    }
+}
+'''),
+    ("java", '''
+List<String> names = people.stream()
+    .filter(p -> p.getAge() >= 18)
+    .map(Person::getName)
+    .collect(Collectors.toList());
+'''),
+    ("java", '''
+private static int factorial(int n) {
+    if (n <= 1) {
+        return 1;
+    }
+    return n * factorial(n - 1);
+}
+'''),
+    ("java", '''
+Map<String, Integer> counts = new HashMap<>();
+for (String word : words) {
+    counts.put(word, counts.getOrDefault(word, 0) + 1);
+}
+'''),
+    ("java", '''
+package com.example.demo;
+
+@RestController
+@RequestMapping("/api/orders")
+public class OrderController {
+    @Autowired
+    private OrderRepository repository;
+
+    @GetMapping("/{id}")
+    public ResponseEntity<Order> get(@PathVariable Long id) {
+        return repository.findById(id).map(ResponseEntity::ok).orElse(ResponseEntity.notFound().build());
+    }
+}
+'''),
+    ("java", '''
+final StringBuilder sb = new StringBuilder();
+for (int i = 0; i < 10; i++) {
+    sb.append(i).append(',');
+}
+String result = sb.toString();
+'''),
+    ("java", '''
+public class User {
+    private final String name;
+    private int age;
+
+    public User(String name, int age) {
+        this.name = name;
+        this.age = age;
+    }
+
+    public String getName() {
+        return name;
+    }
+
+    public int getAge() {
+        return age;
+    }
+}
+'''),
+    ("java", '''
+List<String> names = new ArrayList<>();
+for (User user : users) {
+    if (user.isActive()) {
+        names.add(user.getName());
+    }
+}
+System.out.println(String.join(", ", names));
+'''),
+    ("java", '''
+@Test
+public void shouldReturnEmptyListWhenNoOrders() {
+    when(repository.findAll()).thenReturn(Collections.emptyList());
+    List<Order> result = service.getOrders();
+    assertTrue(result.isEmpty());
+    verify(repository).findAll();
+}
+'''),
+    ("java", '''
+import java.util.HashMap;
+import java.util.Map;
+
+public class WordCounter {
+    public static Map<String, Integer> count(String text) {
+        Map<String, Integer> counts = new HashMap<>();
+        for (String word : text.split("\\\\s+")) {
+            counts.merge(word, 1, Integer::sum);
+        }
+        return counts;
+    }
+}
+'''),
+    ("java", '''
+try (BufferedReader reader = new BufferedReader(new FileReader(path))) {
+    String line;
+    while ((line = reader.readLine()) != null) {
+        process(line);
+    }
+} catch (IOException e) {
+    throw new UncheckedIOException(e);
+}
+'''),
+    ("java", '''
+@RestController
+@RequestMapping("/api/orders")
+public class OrderController {
+    @Autowired
+    private OrderService orderService;
+
+    @GetMapping("/{id}")
+    public ResponseEntity<Order> get(@PathVariable Long id) {
+        return ResponseEntity.ok(orderService.find(id));
+    }
+}
+'''),
+    ("java", '''
+public boolean isPalindrome(String s) {
+    int i = 0, j = s.length() - 1;
+    while (i < j) {
+        if (s.charAt(i++) != s.charAt(j--)) {
+            return false;
+        }
+    }
+    return true;
+}
+'''),
+    ("java", '''
+List<Integer> evens = numbers.stream()
+    .filter(n -> n % 2 == 0)
+    .map(n -> n * n)
+    .collect(Collectors.toList());
+'''),
+    ("java", '''
+public enum Status {
+    ACTIVE, INACTIVE, SUSPENDED;
+
+    public boolean isActive() {
+        return this == ACTIVE;
+    }
+}
+'''),
+    ("java", '''
+public class Main {
+    public static void main(String[] args) throws InterruptedException {
+        ExecutorService pool = Executors.newFixedThreadPool(4);
+        for (int i = 0; i < 10; i++) {
+            final int id = i;
+            pool.submit(() -> System.out.println("task " + id));
+        }
+        pool.shutdown();
+    }
+}
+'''),
+    ("java", '''
+@Override
+public int hashCode() {
+    return Objects.hash(id, name);
+}
+
+@Override
+public String toString() {
+    return "Item{id=" + id + ", name='" + name + "'}";
+}
+'''),
+    ("java", '''
+Scanner scanner = new Scanner(System.in);
+int n = scanner.nextInt();
+long sum = 0;
+for (int i = 0; i < n; i++) {
+    sum += scanner.nextLong();
+}
+System.out.printf("%d%n", sum);
+'''),
+    ("typescript", '''
+export interface User {
+  id: number;
+  name: string;
+  email?: string;
+  roles: string[];
+}
+'''),
+    ("typescript", '''
+function first<T>(items: T[]): T | undefined {
+  return items.length > 0 ? items[0] : undefined;
+}
+'''),
+    ("typescript", '''
+@Component({
+  selector: 'app-user-list',
+  templateUrl: './user-list.component.html',
+})
+export class UserListComponent implements OnInit {
+  users: User[] = [];
+
+  constructor(private userService: UserService) {}
+
+  ngOnInit(): void {
+    this.userService.getUsers().subscribe((users) => (this.users = users));
+  }
+}
+'''),
+    ("typescript", '''
+type Result<T> = { ok: true; value: T } | { ok: false; error: string };
+
+export function parse(input: string): Result<number> {
+  const n = Number(input);
+  return isNaN(n) ? { ok: false, error: 'not a number' } : { ok: true, value: n };
+}
+'''),
+    ("typescript", '''
+enum Direction {
+  Up = 'UP',
+  Down = 'DOWN',
+}
+
+const move = (dir: Direction): void => {
+  console.log(dir);
+};
+'''),
+    ("typescript", '''
+export class Queue<T> {
+  private items: T[] = [];
+
+  enqueue(item: T): void {
+    this.items.push(item);
+  }
+
+  dequeue(): T | undefined {
+    return this.items.shift();
+  }
+
+  get size(): number {
+    return this.items.length;
+  }
+}
+'''),
+    ("typescript", '''
+async function getJson<T>(url: string): Promise<T> {
+  const response: Response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}`);
+  }
+  return (await response.json()) as T;
+}
+'''),
+    ("typescript", '''
+const counts: Record<string, number> = {};
+for (const word of words) {
+  counts[word] = (counts[word] ?? 0) + 1;
+}
+'''),
+    ("typescript", '''
+interface Props {
+  title: string;
+  onClose: () => void;
+}
+
+export const Modal: React.FC<Props> = ({ title, onClose }) => {
+  return <div className="modal"><h2>{title}</h2><button onClick={onClose}>x</button></div>;
+};
+'''),
+    ("typescript", '''
+let timer: ReturnType<typeof setTimeout> | null = null;
+export function schedule(fn: () => void, ms: number): void {
+  if (timer !== null) clearTimeout(timer);
+  timer = setTimeout(fn, ms);
+}
+'''),
+    ("typescript", '''
+describe('Queue', () => {
+  let queue: Queue<number>;
+
+  beforeEach(() => {
+    queue = new Queue<number>();
+  });
+
+  it('dequeues in order', () => {
+    queue.enqueue(1);
+    expect(queue.dequeue()).toBe(1);
+  });
+});
+'''),
+    ("typescript", '''
+import { Injectable } from '@angular/core';
+
+@Injectable({ providedIn: 'root' })
+export class ConfigService {
+  private readonly settings: Map<string, unknown> = new Map();
+
+  get<T>(key: string, fallback: T): T {
+    return (this.settings.get(key) as T) ?? fallback;
+  }
+}
+'''),
+    # ---------------------------------------------------------------- c#
+    ("c#", '''
+using System;
+
+namespace HelloWorld
+{
+    class Program
+    {
+        static void Main(string[] args)
+        {
+            Console.WriteLine("Hello World!");
+        }
+    }
+}
+'''),
+    ("c#", '''
+int num1, num2, res;
+Console.Write("Enter first number: ");
+num1 = Convert.ToInt32(Console.ReadLine());
+Console.Write("Enter second number: ");
+num2 = Convert.ToInt32(Console.ReadLine());
+res = num1 / num2;
+Console.WriteLine("Result: " + res);
+'''),
+    ("c#", '''
+public class Person
+{
+    public string Name { get; set; }
+    public int Age { get; private set; }
+
+    public Person(string name, int age)
+    {
+        Name = name;
+        Age = age;
+    }
+}
+'''),
+    ("c#", '''
+var adults = people
+    .Where(p => p.Age >= 18)
+    .OrderBy(p => p.Name)
+    .Select(p => p.Name)
+    .ToList();
+'''),
+    ("c#", '''
+public async Task<IActionResult> GetOrder(int id)
+{
+    var order = await _context.Orders.FindAsync(id);
+    if (order == null)
+    {
+        return NotFound();
+    }
+    return Ok(order);
+}
+'''),
+    ("c#", '''
+using System.Collections.Generic;
+using System.Linq;
+
+public static class Extensions
+{
+    public static bool IsNullOrEmpty<T>(this IEnumerable<T> source)
+    {
+        return source == null || !source.Any();
+    }
+}
+'''),
+    ("c#", '''
+try
+{
+    string text = File.ReadAllText(path);
+    Console.WriteLine(text.Length);
+}
+catch (FileNotFoundException ex)
+{
+    Console.WriteLine($"Missing file: {ex.FileName}");
+}
+'''),
+    ("c#", '''
+[TestFixture]
+public class CalculatorTests
+{
+    [Test]
+    public void Add_ReturnsSum()
+    {
+        var calc = new Calculator();
+        Assert.AreEqual(5, calc.Add(2, 3));
+    }
+}
+'''),
+    ("c#", '''
+foreach (var item in items)
+{
+    if (item is string s && !string.IsNullOrWhiteSpace(s))
+    {
+        results.Add(s.Trim());
+    }
+}
+'''),
+    ("c#", '''
+private readonly ILogger<OrderService> _logger;
+
+public OrderService(ILogger<OrderService> logger)
+{
+    _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+}
+'''),
+    ("c#", '''
+Dictionary<string, int> counts = new Dictionary<string, int>();
+foreach (string word in words)
+{
+    counts.TryGetValue(word, out int n);
+    counts[word] = n + 1;
+}
+'''),
+    ("c#", '''
+public interface IRepository<T> where T : class
+{
+    Task<T> GetByIdAsync(int id);
+    Task AddAsync(T entity);
+    void Remove(T entity);
+}
+'''),
+    ("c#", '''
+public class User
+{
+    public int Id { get; set; }
+    public string Name { get; set; }
+    public DateTime CreatedAt { get; private set; } = DateTime.UtcNow;
+}
+'''),
+    ("c#", '''
+using System;
+using System.Linq;
+
+namespace Demo
+{
+    class Program
+    {
+        static void Main(string[] args)
+        {
+            var total = args.Select(int.Parse).Sum();
+            Console.WriteLine($"Total: {total}");
+        }
+    }
+}
+'''),
+    ("c#", '''
+[Fact]
+public void Add_ReturnsSum()
+{
+    var calculator = new Calculator();
+    var result = calculator.Add(2, 3);
+    Assert.Equal(5, result);
+}
+'''),
+    ("c#", '''
+public async Task<List<Order>> GetOrdersAsync(int customerId)
+{
+    using var connection = new SqlConnection(_connectionString);
+    await connection.OpenAsync();
+    var orders = await connection.QueryAsync<Order>(Sql, new { customerId });
+    return orders.ToList();
+}
+'''),
+    ("c#", '''
+foreach (var item in items)
+{
+    if (item == null) continue;
+    Console.WriteLine(item.ToString());
+}
+'''),
+    ("c#", '''
+public interface IRepository<T> where T : class
+{
+    Task<T> GetByIdAsync(int id);
+    Task AddAsync(T entity);
+    IEnumerable<T> Find(Func<T, bool> predicate);
+}
+'''),
+    ("c#", '''
+var names = users
+    .Where(u => u.IsActive)
+    .OrderBy(u => u.LastName)
+    .Select(u => u.FullName)
+    .ToList();
+'''),
+    ("c#", '''
+[HttpGet("{id}")]
+public async Task<ActionResult<Product>> GetProduct(int id)
+{
+    var product = await _context.Products.FindAsync(id);
+    if (product == null)
+    {
+        return NotFound();
+    }
+    return product;
+}
+'''),
+    ("c#", '''
+try
+{
+    File.WriteAllText(path, content);
+}
+catch (IOException ex)
+{
+    _logger.LogError(ex, "Failed to write {Path}", path);
+    throw;
+}
+'''),
+    ("c#", '''
+public static string Reverse(this string s)
+{
+    var chars = s.ToCharArray();
+    Array.Reverse(chars);
+    return new string(chars);
+}
+'''),
+    ("c#", '''
+public record Point(double X, double Y)
+{
+    public double Length => Math.Sqrt(X * X + Y * Y);
+}
+'''),
+    ("c#", '''
+string? line;
+while ((line = Console.ReadLine()) != null)
+{
+    if (string.IsNullOrWhiteSpace(line)) break;
+    lines.Add(line.Trim());
+}
+'''),
+    # ---------------------------------------------------------------- javascript
+    ("javascript", '''
+function add(a, b) {
+    return a + b;
+}
+
+console.log(add(2, 3));
+'''),
+    ("javascript", '''
+const express = require('express');
+const app = express();
+
+app.get('/users/:id', (req, res) => {
+    res.json({ id: req.params.id });
+});
+
+app.listen(3000, () => console.log('listening'));
+'''),
+    ("javascript", '''
+const total = items
+    .filter(item => item.active)
+    .map(item => item.price * item.qty)
+    .reduce((sum, value) => sum + value, 0);
+'''),
+    ("javascript", '''
+async function loadUsers() {
+    const response = await fetch('/api/users');
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+    return response.json();
+}
+'''),
+    ("javascript", '''
+document.querySelector('#submit').addEventListener('click', function (event) {
+    event.preventDefault();
+    const name = document.getElementById('name').value;
+    alert('Hello ' + name);
+});
+'''),
+    ("javascript", '''
+class Counter {
+    constructor() {
+        this.count = 0;
+    }
+
+    increment() {
+        this.count++;
+        return this;
+    }
+}
+
+module.exports = Counter;
+'''),
+    ("javascript", '''
+let result = [];
+for (let i = 0; i < arr.length; i++) {
+    if (arr[i] !== undefined && arr[i] !== null) {
+        result.push(arr[i]);
+    }
+}
+'''),
+    ("javascript", '''
+describe('sum', () => {
+    it('adds numbers', () => {
+        expect(sum(1, 2)).toBe(3);
+    });
+});
+'''),
+    ("javascript", '''
+import React, { useState } from 'react';
+
+export default function Toggle() {
+    const [on, setOn] = useState(false);
+    return <button onClick={() => setOn(!on)}>{on ? 'On' : 'Off'}</button>;
+}
+'''),
+    ("javascript", '''
+const { name, age = 30, ...rest } = user;
+const copy = { ...rest, name: name.toUpperCase() };
+setTimeout(() => console.log(copy), 100);
+'''),
+    ("javascript", '''
+var self = this;
+$.ajax({
+    url: '/api/items',
+    success: function (data) {
+        self.items = data;
+    }
+});
+'''),
+    ("javascript", '''
+promise
+    .then(res => res.json())
+    .then(data => {
+        console.log(data);
+    })
+    .catch(err => console.error(err));
+'''),
+    ("javascript", '''
+const express = require('express');
+const app = express();
+
+app.get('/users/:id', async (req, res) => {
+  const user = await db.findUser(req.params.id);
+  if (!user) return res.status(404).send('Not found');
+  res.json(user);
+});
+
+app.listen(3000);
+'''),
+    ("javascript", '''
+document.querySelector('#submit').addEventListener('click', (event) => {
+  event.preventDefault();
+  const value = document.getElementById('name').value;
+  console.log(`Hello, ${value}`);
+});
+'''),
+    ("javascript", '''
+describe('sum', () => {
+  it('adds two numbers', () => {
+    expect(sum(1, 2)).toBe(3);
+  });
+});
+'''),
+    ("javascript", '''
+function debounce(fn, wait) {
+  let timer;
+  return function (...args) {
+    clearTimeout(timer);
+    timer = setTimeout(() => fn.apply(this, args), wait);
+  };
+}
+'''),
+    ("javascript", '''
+fetch('/api/items')
+  .then((response) => response.json())
+  .then((data) => {
+    data.forEach((item) => console.log(item.name));
+  })
+  .catch((err) => console.error(err));
+'''),
+    ("javascript", '''
+module.exports = {
+  mode: 'production',
+  entry: './src/index.js',
+  output: {
+    path: path.resolve(__dirname, 'dist'),
+    filename: 'bundle.js',
+  },
+};
+'''),
+    ("javascript", '''
+var self = this;
+var count = 0;
+for (var i = 0; i < list.length; i++) {
+  if (list[i] !== null && typeof list[i] === 'object') {
+    count++;
+  }
+}
+'''),
+    ("javascript", '''
+export default function TodoList({ todos, onToggle }) {
+  return (
+    <ul>
+      {todos.map((todo) => (
+        <li key={todo.id} onClick={() => onToggle(todo.id)}>{todo.text}</li>
+      ))}
+    </ul>
+  );
+}
+'''),
+    ("javascript", '''
+const { name, age = 18, ...rest } = person;
+const merged = { ...defaults, ...options };
+const unique = [...new Set(values)];
+'''),
+    ("javascript", '''
+async function main() {
+  try {
+    const data = await fs.promises.readFile('config.json', 'utf8');
+    const config = JSON.parse(data);
+    console.log(config.version);
+  } catch (e) {
+    process.exit(1);
+  }
+}
+main();
+'''),
+    ("javascript", '''
+class EventEmitter {
+  constructor() {
+    this.listeners = {};
+  }
+
+  on(name, fn) {
+    (this.listeners[name] = this.listeners[name] || []).push(fn);
+    return this;
+  }
+
+  emit(name, ...args) {
+    (this.listeners[name] || []).forEach((fn) => fn(...args));
+  }
+}
+'''),
+    ("javascript", '''
+const result = users
+  .filter((u) => u.active)
+  .map((u) => u.email)
+  .reduce((acc, email) => acc + email.length, 0);
+'''),
+    # ---------------------------------------------------------------- typescript
+    ("typescript", '''
+interface User {
+    id: number;
+    name: string;
+    email?: string;
+}
+
+function greet(user: User): string {
+    return `Hello, ${user.name}`;
+}
+'''),
+    ("typescript", '''
+export class UserService {
+    private users: User[] = [];
+
+    constructor(private readonly http: HttpClient) {}
+
+    getUser(id: number): Observable<User> {
+        return this.http.get<User>(`/api/users/${id}`);
+    }
+}
+'''),
+    ("typescript", '''
+type Status = 'active' | 'inactive' | 'banned';
+
+const counts: Record<Status, number> = {
+    active: 0,
+    inactive: 0,
+    banned: 0,
+};
+'''),
+    ("typescript", '''
+function first<T>(items: T[]): T | undefined {
+    return items.length > 0 ? items[0] : undefined;
+}
+
+const n = first<number>([1, 2, 3]);
+'''),
+    ("typescript", '''
+async function loadOrders(customerId: string): Promise<Order[]> {
+    const response = await fetch(`/api/customers/${customerId}/orders`);
+    const data = (await response.json()) as Order[];
+    return data.filter((o: Order) => o.total > 0);
+}
+'''),
+    ("typescript", '''
+enum Direction {
+    Up = 1,
+    Down,
+    Left,
+    Right,
+}
+
+let heading: Direction = Direction.Up;
+'''),
+    ("typescript", '''
+@Component({
+    selector: 'app-root',
+    templateUrl: './app.component.html',
+})
+export class AppComponent implements OnInit {
+    title: string = 'demo';
+
+    ngOnInit(): void {
+        this.title = 'ready';
+    }
+}
+'''),
+    ("typescript", '''
+const add = (a: number, b: number): number => a + b;
+let total: number = 0;
+for (const value of [1, 2, 3]) {
+    total = add(total, value);
+}
+'''),
+    ("typescript", '''
+export interface Props {
+    label: string;
+    onClick: (event: React.MouseEvent<HTMLButtonElement>) => void;
+    disabled?: boolean;
+}
+
+export const Button: React.FC<Props> = ({ label, onClick, disabled = false }) => (
+    <button onClick={onClick} disabled={disabled}>{label}</button>
+);
+'''),
+    ("typescript", '''
+abstract class Animal {
+    protected constructor(public readonly name: string) {}
+    abstract speak(): void;
+}
+
+class Dog extends Animal {
+    speak(): void {
+        console.log(`${this.name} barks`);
+    }
+}
+'''),
+    ("typescript", '''
+const cache = new Map<string, Promise<unknown>>();
+
+export function memo<T>(key: string, load: () => Promise<T>): Promise<T> {
+    if (!cache.has(key)) {
+        cache.set(key, load());
+    }
+    return cache.get(key) as Promise<T>;
+}
+'''),
+    ("typescript", '''
+declare module 'config' {
+    export const apiUrl: string;
+    export function get(key: keyof Settings): string | null;
+}
+'''),
+    # ---------------------------------------------------------------- c
+    ("c", '''
+#include <stdio.h>
+
+int main(void) {
+    int a = 5, b = 3;
+    printf("Sum: %d\\n", a + b);
+    return 0;
+}
+'''),
+    ("c", '''
+#include <stdlib.h>
+#include <string.h>
+
+char *duplicate(const char *s) {
+    size_t len = strlen(s) + 1;
+    char *copy = malloc(len);
+    if (copy == NULL) {
+        return NULL;
+    }
+    memcpy(copy, s, len);
+    return copy;
+}
+'''),
+    ("c", '''
+struct node {
+    int value;
+    struct node *next;
+};
+
+void push(struct node **head, int value) {
+    struct node *n = malloc(sizeof(struct node));
+    n->value = value;
+    n->next = *head;
+    *head = n;
+}
+'''),
+    ("c", '''
+int sum_array(const int *arr, int n) {
+    int total = 0;
+    for (int i = 0; i < n; i++) {
+        total += arr[i];
+    }
+    return total;
+}
+'''),
+    ("c", '''
+FILE *fp = fopen("data.txt", "r");
+if (fp == NULL) {
+    perror("fopen");
+    exit(EXIT_FAILURE);
+}
+char line[256];
+while (fgets(line, sizeof(line), fp) != NULL) {
+    printf("%s", line);
+}
+fclose(fp);
+'''),
+    ("c", '''
+typedef struct {
+    double x;
+    double y;
+} point_t;
+
+static double distance(point_t a, point_t b) {
+    double dx = a.x - b.x, dy = a.y - b.y;
+    return sqrt(dx * dx + dy * dy);
+}
+'''),
+    ("c", '''
+#define MAX_USERS 100
+
+static int user_count = 0;
+static char *users[MAX_USERS];
+
+int add_user(char *name) {
+    if (user_count >= MAX_USERS)
+        return -1;
+    users[user_count++] = name;
+    return 0;
+}
+'''),
+    ("c", '''
+int num1, num2;
+scanf("%d %d", &num1, &num2);
+if (num2 != 0) {
+    printf("%d\\n", num1 / num2);
+} else {
+    fprintf(stderr, "division by zero\\n");
+}
+'''),
+    ("c", '''
+void swap(int *a, int *b) {
+    int tmp = *a;
+    *a = *b;
+    *b = tmp;
+}
+'''),
+    ("c", '''
+unsigned long hash(const unsigned char *str) {
+    unsigned long h = 5381;
+    int c;
+    while ((c = *str++))
+        h = ((h << 5) + h) + c;
+    return h;
+}
+'''),
+    ("c", '''
+#include <pthread.h>
+
+static pthread_mutex_t lock = PTHREAD_MUTEX_INITIALIZER;
+static int counter;
+
+void *worker(void *arg) {
+    pthread_mutex_lock(&lock);
+    counter++;
+    pthread_mutex_unlock(&lock);
+    return NULL;
+}
+'''),
+    ("c", '''
+int *buf = calloc(n, sizeof(int));
+if (!buf) {
+    return -ENOMEM;
+}
+memset(buf, 0, n * sizeof(int));
+free(buf);
+'''),
+    ("c", '''
+#include <stdio.h>
+#include <string.h>
+
+int main(int argc, char **argv) {
+    if (argc < 2) {
+        fprintf(stderr, "usage: %s name\\n", argv[0]);
+        return 1;
+    }
+    printf("hello %s (%zu)\\n", argv[1], strlen(argv[1]));
+    return 0;
+}
+'''),
+    ("c", '''
+struct node {
+    int value;
+    struct node *next;
+};
+
+struct node *push(struct node *head, int value) {
+    struct node *n = malloc(sizeof(*n));
+    if (n == NULL)
+        return head;
+    n->value = value;
+    n->next = head;
+    return n;
+}
+'''),
+    ("c", '''
+static int compare(const void *a, const void *b) {
+    int x = *(const int *)a;
+    int y = *(const int *)b;
+    return (x > y) - (x < y);
+}
+
+qsort(values, count, sizeof(int), compare);
+'''),
+    ("c", '''
+char *buf = malloc(size + 1);
+if (!buf) {
+    perror("malloc");
+    exit(EXIT_FAILURE);
+}
+memcpy(buf, src, size);
+buf[size] = '\\0';
+free(buf);
+'''),
+    ("c", '''
+FILE *fp = fopen(path, "r");
+if (fp == NULL) {
+    return -1;
+}
+while (fgets(line, sizeof(line), fp) != NULL) {
+    lines++;
+}
+fclose(fp);
+'''),
+    ("c", '''
+#define MAX(a, b) ((a) > (b) ? (a) : (b))
+#define BUFFER_SIZE 1024
+
+static unsigned long hash(const char *str) {
+    unsigned long h = 5381;
+    int c;
+    while ((c = *str++))
+        h = ((h << 5) + h) + c;
+    return h;
+}
+'''),
+    ("c", '''
+void swap(int *a, int *b) {
+    int tmp = *a;
+    *a = *b;
+    *b = tmp;
+}
+
+void reverse(int *arr, size_t n) {
+    for (size_t i = 0; i < n / 2; i++)
+        swap(&arr[i], &arr[n - 1 - i]);
+}
+'''),
+    ("c", '''
+int fd = open(path, O_RDONLY);
+if (fd < 0) {
+    perror("open");
+    return errno;
+}
+ssize_t n = read(fd, buf, sizeof buf);
+close(fd);
+'''),
+    ("c", '''
+pthread_mutex_lock(&queue->lock);
+while (queue->count == 0)
+    pthread_cond_wait(&queue->not_empty, &queue->lock);
+item = queue->items[queue->head];
+queue->head = (queue->head + 1) % QUEUE_SIZE;
+queue->count--;
+pthread_mutex_unlock(&queue->lock);
+'''),
+    ("c", '''
+enum color { RED, GREEN, BLUE };
+
+const char *color_name(enum color c) {
+    switch (c) {
+    case RED:
+        return "red";
+    case GREEN:
+        return "green";
+    default:
+        return "blue";
+    }
+}
+'''),
+    ("c", '''
+static void test_parse_empty(void) {
+    struct config cfg;
+    assert(parse_config("", &cfg) == 0);
+    assert(cfg.count == 0);
+}
+'''),
+    ("c", '''
+uint32_t crc32(const uint8_t *data, size_t len) {
+    uint32_t crc = 0xFFFFFFFFu;
+    for (size_t i = 0; i < len; i++) {
+        crc ^= data[i];
+        for (int k = 0; k < 8; k++)
+            crc = (crc >> 1) ^ (0xEDB88320u & -(crc & 1));
+    }
+    return ~crc;
+}
+'''),
+    # ---------------------------------------------------------------- c++
+    ("c++", '''
+#include <iostream>
+
+int main() {
+    int a = 5, b = 3;
+    std::cout << "Sum: " << a + b << std::endl;
+    return 0;
+}
+'''),
+    ("c++", '''
+#include <vector>
+#include <algorithm>
+
+std::vector<int> sorted_copy(const std::vector<int>& v) {
+    std::vector<int> out(v);
+    std::sort(out.begin(), out.end());
+    return out;
+}
+'''),
+    ("c++", '''
+class Shape {
+public:
+    virtual ~Shape() = default;
+    virtual double area() const = 0;
+};
+
+class Square : public Shape {
+public:
+    explicit Square(double side) : side_(side) {}
+    double area() const override { return side_ * side_; }
+private:
+    double side_;
+};
+'''),
+    ("c++", '''
+template <typename T>
+T max_of(const T& a, const T& b) {
+    return a < b ? b : a;
+}
+'''),
+    ("c++", '''
+using namespace std;
+
+int main() {
+    int num1, num2;
+    cin >> num1 >> num2;
+    cout << num1 / num2 << endl;
+    return 0;
+}
+'''),
+    ("c++", '''
+auto ptr = std::make_unique<Widget>(42);
+std::shared_ptr<Logger> logger = std::make_shared<Logger>();
+if (ptr != nullptr) {
+    ptr->run();
+}
+'''),
+    ("c++", '''
+std::map<std::string, int> counts;
+for (const auto& word : words) {
+    ++counts[word];
+}
+'''),
+    ("c++", '''
+namespace geometry {
+
+struct Point {
+    double x{0};
+    double y{0};
+};
+
+inline double dot(const Point& a, const Point& b) noexcept {
+    return a.x * b.x + a.y * b.y;
+}
+
+}  // namespace geometry
+'''),
+    ("c++", '''
+try {
+    auto value = std::stoi(input);
+    std::cout << value * 2 << '\\n';
+} catch (const std::invalid_argument& e) {
+    std::cerr << "bad input: " << e.what() << '\\n';
+}
+'''),
+    ("c++", '''
+TEST(CalculatorTest, AddsNumbers) {
+    Calculator calc;
+    EXPECT_EQ(calc.add(2, 3), 5);
+}
+'''),
+    ("c++", '''
+std::lock_guard<std::mutex> guard(mutex_);
+queue_.push(std::move(task));
+cv_.notify_one();
+'''),
+    ("c++", '''
+class Buffer {
+public:
+    Buffer(size_t n) : data_(new char[n]), size_(n) {}
+    ~Buffer() { delete[] data_; }
+    Buffer(const Buffer&) = delete;
+    Buffer& operator=(const Buffer&) = delete;
+private:
+    char* data_;
+    size_t size_;
+};
+'''),
+    ("c++", '''
+#include <iostream>
+#include <vector>
+#include <algorithm>
+
+int main() {
+    std::vector<int> v{5, 3, 1, 4};
+    std::sort(v.begin(), v.end());
+    for (const auto& x : v) {
+        std::cout << x << ' ';
+    }
+    std::cout << std::endl;
+}
+'''),
+    ("c++", '''
+class Shape {
+public:
+    virtual ~Shape() = default;
+    virtual double area() const = 0;
+};
+
+class Circle : public Shape {
+public:
+    explicit Circle(double r) : r_(r) {}
+    double area() const override { return 3.14159 * r_ * r_; }
+private:
+    double r_;
+};
+'''),
+    ("c++", '''
+template <typename T>
+T clamp(const T& value, const T& lo, const T& hi) {
+    return std::max(lo, std::min(value, hi));
+}
+'''),
+    ("c++", '''
+auto ptr = std::make_unique<Widget>(42);
+std::shared_ptr<Config> config = std::make_shared<Config>();
+std::map<std::string, int> counts;
+counts["apples"] += 1;
+'''),
+    ("c++", '''
+namespace util {
+
+std::string trim(const std::string& s) {
+    auto begin = s.find_first_not_of(" \\t");
+    if (begin == std::string::npos) return "";
+    auto end = s.find_last_not_of(" \\t");
+    return s.substr(begin, end - begin + 1);
+}
+
+}  // namespace util
+'''),
+    ("c++", '''
+TEST_F(ParserTest, HandlesEmptyInput) {
+    Parser parser;
+    EXPECT_TRUE(parser.parse("").empty());
+    ASSERT_EQ(parser.errors(), 0u);
+}
+'''),
+    ("c++", '''
+std::lock_guard<std::mutex> lock(mutex_);
+auto it = cache_.find(key);
+if (it != cache_.end()) {
+    return it->second;
+}
+'''),
+    ("c++", '''
+using namespace std;
+
+int main() {
+    int n;
+    cin >> n;
+    vector<long long> a(n);
+    for (auto &x : a) cin >> x;
+    cout << accumulate(a.begin(), a.end(), 0LL) << "\\n";
+    return 0;
+}
+'''),
+    ("c++", '''
+std::thread worker([&]() {
+    while (!done.load()) {
+        process(queue.pop());
+    }
+});
+worker.join();
+'''),
+    ("c++", '''
+struct Point {
+    double x, y;
+    Point operator+(const Point& o) const { return {x + o.x, y + o.y}; }
+    bool operator==(const Point& o) const = default;
+};
+'''),
+    ("c++", '''
+try {
+    auto value = std::stoi(input);
+    std::cout << value * 2 << '\\n';
+} catch (const std::invalid_argument& e) {
+    std::cerr << "invalid: " << e.what() << '\\n';
+}
+'''),
+    ("c++", '''
+Matrix::Matrix(std::size_t rows, std::size_t cols)
+    : rows_(rows), cols_(cols), data_(rows * cols, 0.0) {}
+
+double& Matrix::operator()(std::size_t r, std::size_t c) {
+    return data_[r * cols_ + c];
+}
+'''),
+    # ---------------------------------------------------------------- go
+    ("go", '''
+package main
+
+import "fmt"
+
+func main() {
+    a, b := 5, 3
+    fmt.Println("Sum:", a+b)
+}
+'''),
+    ("go", '''
+func readConfig(path string) (*Config, error) {
+    data, err := os.ReadFile(path)
+    if err != nil {
+        return nil, err
+    }
+    var cfg Config
+    if err := json.Unmarshal(data, &cfg); err != nil {
+        return nil, fmt.Errorf("parse %s: %w", path, err)
+    }
+    return &cfg, nil
+}
+'''),
+    ("go", '''
+type User struct {
+    ID    int    `json:"id"`
+    Name  string `json:"name"`
+    Email string `json:"email,omitempty"`
+}
+
+func (u *User) Display() string {
+    return u.Name + " <" + u.Email + ">"
+}
+'''),
+    ("go", '''
+for i, v := range values {
+    if v < 0 {
+        continue
+    }
+    total += v * i
+}
+'''),
+    ("go", '''
+var wg sync.WaitGroup
+results := make(chan int, len(jobs))
+for _, job := range jobs {
+    wg.Add(1)
+    go func(j int) {
+        defer wg.Done()
+        results <- process(j)
+    }(job)
+}
+wg.Wait()
+close(results)
+'''),
+    ("go", '''
+type Shape interface {
+    Area() float64
+    Perimeter() float64
+}
+
+type Rect struct {
+    W, H float64
+}
+
+func (r Rect) Area() float64 { return r.W * r.H }
+'''),
+    ("go", '''
+func TestAdd(t *testing.T) {
+    got := Add(2, 3)
+    if got != 5 {
+        t.Errorf("Add(2, 3) = %d; want 5", got)
+    }
+}
+'''),
+    ("go", '''
+http.HandleFunc("/health", func(w http.ResponseWriter, r *http.Request) {
+    w.WriteHeader(http.StatusOK)
+    fmt.Fprintln(w, "ok")
+})
+log.Fatal(http.ListenAndServe(":8080", nil))
+'''),
+    ("go", '''
+counts := map[string]int{}
+for _, word := range strings.Fields(text) {
+    counts[word]++
+}
+'''),
+    ("go", '''
+select {
+case msg := <-messages:
+    fmt.Println("received", msg)
+case <-time.After(time.Second):
+    fmt.Println("timeout")
+}
+'''),
+    ("go", '''
+func divide(a, b int) (int, error) {
+    if b == 0 {
+        return 0, errors.New("division by zero")
+    }
+    return a / b, nil
+}
+'''),
+    ("go", '''
+mu.Lock()
+defer mu.Unlock()
+if cache == nil {
+    cache = make(map[string][]byte)
+}
+cache[key] = value
+'''),
+    ("go", '''
+package main
+
+import (
+	"fmt"
+	"os"
+)
+
+func main() {
+	if len(os.Args) < 2 {
+		fmt.Fprintln(os.Stderr, "usage: greet NAME")
+		os.Exit(1)
+	}
+	fmt.Printf("hello %s\\n", os.Args[1])
+}
+'''),
+    ("go", '''
+type User struct {
+	ID    int    `json:"id"`
+	Name  string `json:"name"`
+	Email string `json:"email,omitempty"`
+}
+
+func (u *User) Validate() error {
+	if u.Name == "" {
+		return errors.New("name is required")
+	}
+	return nil
+}
+'''),
+    ("go", '''
+func TestAdd(t *testing.T) {
+	got := Add(2, 3)
+	if got != 5 {
+		t.Errorf("Add(2, 3) = %d; want 5", got)
+	}
+}
+'''),
+    ("go", '''
+data, err := os.ReadFile(path)
+if err != nil {
+	return nil, fmt.Errorf("read %s: %w", path, err)
+}
+var cfg Config
+if err := json.Unmarshal(data, &cfg); err != nil {
+	return nil, err
+}
+return &cfg, nil
+'''),
+    ("go", '''
+results := make(chan int)
+var wg sync.WaitGroup
+for _, job := range jobs {
+	wg.Add(1)
+	go func(j int) {
+		defer wg.Done()
+		results <- j * j
+	}(job)
+}
+go func() {
+	wg.Wait()
+	close(results)
+}()
+'''),
+    ("go", '''
+http.HandleFunc("/health", func(w http.ResponseWriter, r *http.Request) {
+	w.WriteHeader(http.StatusOK)
+	w.Write([]byte("ok"))
+})
+log.Fatal(http.ListenAndServe(":8080", nil))
+'''),
+    ("go", '''
+type Shape interface {
+	Area() float64
+	Perimeter() float64
+}
+
+type Rect struct {
+	W, H float64
+}
+
+func (r Rect) Area() float64      { return r.W * r.H }
+func (r Rect) Perimeter() float64 { return 2 * (r.W + r.H) }
+'''),
+    ("go", '''
+select {
+case msg := <-messages:
+	fmt.Println("received", msg)
+case <-time.After(time.Second):
+	fmt.Println("timeout")
+case <-ctx.Done():
+	return ctx.Err()
+}
+'''),
+    ("go", '''
+func reverse(s []int) []int {
+	out := make([]int, len(s))
+	for i, v := range s {
+		out[len(s)-1-i] = v
+	}
+	return out
+}
+'''),
+    ("go", '''
+counts := map[string]int{}
+for _, w := range strings.Fields(text) {
+	counts[strings.ToLower(w)]++
+}
+keys := make([]string, 0, len(counts))
+for k := range counts {
+	keys = append(keys, k)
+}
+sort.Strings(keys)
+'''),
+    ("go", '''
+func TestParse(t *testing.T) {
+	tests := []struct {
+		name string
+		in   string
+		want int
+	}{
+		{"empty", "", 0},
+		{"one", "1", 1},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := Parse(tt.in); got != tt.want {
+				t.Fatalf("got %d, want %d", got, tt.want)
+			}
+		})
+	}
+}
+'''),
+    ("go", '''
+const (
+	StatusActive Status = iota
+	StatusInactive
+)
+
+var ErrNotFound = errors.New("not found")
+'''),
+    # ---------------------------------------------------------------- not code
+    ("unknown", '''
+Please review the attached quarterly report and send me your comments by Friday.
+Thanks, and let me know if anything is unclear.
+'''),
+    ("unknown", '''
+The quick brown fox jumps over the lazy dog. This sentence contains every
+letter of the alphabet and is often used to test fonts and keyboards.
+'''),
+    ("unknown", '''
+Meeting notes
+- discussed release timeline
+- agreed to move the launch to next month
+- action items assigned to the platform team
+'''),
+    ("unknown", '''
+12 apples, 7 oranges, 3 bananas
+total: 22 pieces of fruit
+'''),
+    ("unknown", '''
+Hi team,
+
+The deployment is scheduled for Tuesday at 10am. Please make sure all open
+pull requests are merged by Monday evening so we have time to run the full
+regression suite.
+
+Best regards,
+Anna
+'''),
+    ("unknown", '''
+Steps to reproduce:
+1. Open the settings page.
+2. Click on "Notifications".
+3. Toggle the email option twice.
+
+Expected: the option stays enabled.
+Actual: the page reloads and the option is disabled again.
+'''),
+    ("unknown", '''
+Once upon a time there was a small village at the edge of a great forest.
+The people who lived there were farmers, and every autumn they gathered to
+celebrate the harvest with music and food.
+'''),
+    ("unknown", '''
+Shopping list:
+milk, eggs, bread, butter
+two kilos of potatoes
+something for dessert
+'''),
+    ("unknown", '''
+Release 2.4.0 adds support for dark mode, improves the startup time of the
+desktop client and fixes several crashes reported by users on older devices.
+Thanks to everyone who tested the beta!
+'''),
+    ("unknown", '''
+Q: How do I reset my password?
+A: Go to the login page, click "Forgot password" and follow the link we send
+to your email address. The link is valid for one hour.
+'''),
+    ("unknown", '''
+Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod
+tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam,
+quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo.
+'''),
+    ("unknown", '''
+Name       Department    Start date
+Alice      Finance       2019-04-01
+Bob        Engineering   2021-09-15
+Carol      Marketing     2018-01-07
+'''),
+]
@@ -0,0 +1,483 @@
+"""Load generator for the analysis endpoints: throughput and tail latency per concurrency level.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --mix review=1,debug=1 --concurrency 1,4,16,64 --duration 10
+    python -m benchmarks.loadtest --rate 20,40,80 --duration 20          # open loop, Poisson arrivals
+    python -m benchmarks.loadtest --spawn --concurrency 8               # one local uvicorn worker
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --save run.json
+    python -m benchmarks.loadtest --concurrency 1,4,16 --compare run.json
+
+By default the requests go straight into app.main.app through its ASGI
+interface, in this process and on this event loop, with its startup and
+shutdown events run around the test. There is no network, and the client
+costs microseconds per request. Because the client shares the loop with the
+app, the client is also stalled whenever an endpoint holds the loop.
+--spawn starts `uvicorn app.main:app` (one worker) in a subprocess and talks
+HTTP/1.1 to it over keep-alive connections, as does --url for a server
+that is already running.
+
+Arrival is closed-loop (--concurrency: N callers, each sending its next
+request when the last one is answered) or open-loop (--rate: Poisson
+arrivals at R requests/s, whatever the server's pace). In open loop,
+latency is counted from the scheduled send time, so a backed-up server
+shows up in the tail instead of being hidden by a slower send rate.
+Several comma-separated levels run one after another; each gets --warmup
+seconds that are not counted.
+
+Request bodies are benchmarks.corpora sources of --lines lines, with the
+languages taken in turn. Each body gets a unique trailing comment, so the
+result cache misses as it does for fresh code; --cache-hits reuses bodies.
+Responses other than 2xx, JSON bodies with "status": "error", connection
+failures and, in process, exceptions raised out of the app count as errors.
+In-process and --spawn runs write activity logs to a scratch database unless
+TESTSIGHT_DB is set.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from . import corpora
+
+ENDPOINTS = {
+    "review": "/review",
+    "debug": "/debug",
+    "refactor": "/refactor",
+    "generate-tests": "/generate-tests",
+    "analyze-logs": "/analyze-logs",
+}
+DEBUG_ERROR = "ZeroDivisionError: division by zero"
+COMMENTS = {"python": "#"}
+SOURCES_PER_LANGUAGE = 4
+QUANTILES = (0.5, 0.95, 0.99)
+MAX_IN_FLIGHT = 10000
+
+
+class Payloads:
+    """JSON bodies per endpoint, cycling through languages and sources."""
+
+    def __init__(self, lines: int, unique: bool = True):
+        self.unique = unique
+        self.sources = [(language, corpora.make_source(language, lines, seed))
+                        for seed in range(SOURCES_PER_LANGUAGE) for language in corpora.LANGUAGES]
+        self.log = corpora.make_log(lines * 80)
+        self.count = 0
+
+    def body(self, endpoint: str) -> bytes:
+        self.count += 1
+        if endpoint == "analyze-logs":
+            logs = self.log + (f"2024-01-01 00:00:00 INFO request {self.count}\n" if self.unique else "")
+            return json.dumps({"logs": logs}).encode()
+        language, code = self.sources[self.count % len(self.sources)]
+        if self.unique:
+            code += f"\n{COMMENTS.get(language, '//')} request {self.count}"
+        payload = {"code": code, "language": language}
+        if endpoint == "debug":
+            payload["error"] = DEBUG_ERROR
+        return json.dumps(payload).encode()
+
+
+def parse_mix(text: str) -> list:
+    """'review=3,debug=1' -> [(endpoint, weight), ...]"""
+    mix = []
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"unknown endpoint {name!r}, expected one of {', '.join(ENDPOINTS)}")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+class ASGIClient:
+    """Sends requests straight into an ASGI app."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def post(self, path: str, body: bytes) -> tuple:
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+            "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+            "headers": [(b"host", b"loadtest"), (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode())],
+            "client": ("127.0.0.1", 0), "server": ("loadtest", 80),
+        }
+        sent = False
+        chunks = []
+        status = 500
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Nothing more to read; the app only gets here if it waits for a disconnect
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        # Without a real socket nothing in the request path suspends, so each caller would run its
+        # request to completion before the others had even sent theirs; yielding here lets every
+        # pending request arrive first and then queue for the loop, as on a server
+        await asyncio.sleep(0)
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            # Starlette's ServerErrorMiddleware sends its 500 and then re-raises for the server to log; a server
+            # carries on with the next request, and so does the run
+            return 500, b"".join(chunks)
+        return status, b"".join(chunks)
+
+    async def close(self):
+        pass
+
+
+class HTTPClient:
+    """Minimal HTTP/1.1 client, one keep-alive connection per caller."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.idle = []
+
+    async def post(self, path: str, body: bytes) -> tuple:
+        if self.idle:
+            reader, writer = self.idle.pop()
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(f"POST {self.prefix}{path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            status, headers = await self._head(reader)
+            if headers.get("transfer-encoding") == "chunked":
+                data = await self._chunked(reader)
+            else:
+                data = await reader.readexactly(int(headers.get("content-length", 0)))
+        except BaseException:
+            writer.close()
+            raise
+        if headers.get("connection") == "close":
+            writer.close()
+        else:
+            self.idle.append((reader, writer))
+        return status, data
+
+    @staticmethod
+    async def _head(reader) -> tuple:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        return int(status_line.split()[1]), headers
+
+    @staticmethod
+    async def _chunked(reader) -> bytes:
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if not size:
+                await reader.readline()
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+
+    async def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+class Lifespan:
+    """Runs an ASGI app's startup and shutdown (the FastAPI on_event handlers) around a block."""
+
+    def __init__(self, app):
+        self.app = app
+        self.inbox = asyncio.Queue()
+        self.outbox = asyncio.Queue()
+
+    async def _send(self, message):
+        await self.outbox.put(message)
+
+    async def __aenter__(self):
+        self.task = asyncio.create_task(self.app({"type": "lifespan", "asgi": {"version": "3.0"}},
+                                                 self.inbox.get, self._send))
+        await self.inbox.put({"type": "lifespan.startup"})
+        message = await self.outbox.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"app startup failed: {message.get('message', '')}")
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.inbox.put({"type": "lifespan.shutdown"})
+        await self.outbox.get()
+        await self.task
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.started = 0.0
+        self.stopped = 0.0
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+
+async def call(client, payloads: Payloads, endpoint: str, recorder, start: float):
+    """One request; start is when it was due (send time in closed loop, scheduled arrival in open loop)."""
+    body = payloads.body(endpoint)
+    try:
+        status, data = await client.post(ENDPOINTS[endpoint], body)
+        ok = 200 <= status < 300 and b'"status":"error"' not in data[:200]
+    except (OSError, asyncio.IncompleteReadError, ValueError):
+        ok = False
+    if recorder is not None:
+        recorder.record(endpoint, time.perf_counter() - start, ok)
+
+
+async def closed_loop(client, payloads, mix, concurrency: int, warmup: float, duration: float, rng) -> Recorder:
+    recorder = Recorder()
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    begin = time.perf_counter()
+    recorder.started = begin + warmup
+    end = recorder.started + duration
+
+    async def caller():
+        while True:
+            now = time.perf_counter()
+            if now >= end:
+                return
+            await call(client, payloads, rng.choices(names, weights)[0], recorder if now >= recorder.started else None,
+                       now)
+
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    recorder.stopped = time.perf_counter()
+    return recorder
+
+
+async def open_loop(client, payloads, mix, rate: float, warmup: float, duration: float, rng) -> Recorder:
+    recorder = Recorder()
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    begin = time.perf_counter()
+    recorder.started = begin + warmup
+    end = recorder.started + duration
+    tasks = set()
+    due = begin
+    while True:
+        due += rng.expovariate(rate)
+        if due >= end:
+            break
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint = rng.choices(names, weights)[0]
+        counted = recorder if due >= recorder.started else None
+        if len(tasks) >= MAX_IN_FLIGHT:
+            # The server is hopelessly behind; count the arrival as failed instead of queueing it
+            if counted:
+                counted.record(endpoint, time.perf_counter() - due, False)
+            continue
+        task = asyncio.create_task(call(client, payloads, endpoint, counted, due))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    recorder.stopped = time.perf_counter()
+    return recorder
+
+
+def percentile(ordered: list, q: float) -> float | None:
+    """Nearest-rank q-quantile of a sorted list."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def latency_stats(latencies: list, errors: int, seconds: float) -> dict:
+    ordered = sorted(latencies)
+    stats = {"requests": len(ordered), "errors": errors,
+             "error_rate": round(errors / len(ordered), 4) if ordered else 0.0,
+             "throughput": round(len(ordered) / seconds, 2) if seconds else 0.0,
+             "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else None}
+    for q in QUANTILES:
+        value = percentile(ordered, q)
+        stats[f"p{round(q * 100)}_ms"] = round(value * 1000, 2) if value is not None else None
+    stats["max_ms"] = round(ordered[-1] * 1000, 2) if ordered else None
+    return stats
+
+
+def summarize(recorder: Recorder) -> dict:
+    # Throughput over the measured window, including the drain of requests sent before it closed
+    seconds = recorder.stopped - recorder.started
+    everything = [value for values in recorder.latencies.values() for value in values]
+    result = latency_stats(everything, sum(recorder.errors.values()), seconds)
+    result["endpoints"] = {endpoint: latency_stats(values, recorder.errors.get(endpoint, 0), seconds)
+                           for endpoint, values in sorted(recorder.latencies.items())}
+    return result
+
+
+COLUMNS = ("requests", "throughput", "error_rate", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+
+def print_table(runs: list, baseline: dict | None = None):
+    print(f"{'level':>12} {'endpoint':>15} " + " ".join(f"{column:>11}" for column in COLUMNS))
+    previous = {run["level"]: run for run in baseline["runs"]} if baseline else {}
+    for run in runs:
+        rows = [("all", run["result"])] + list(run["result"]["endpoints"].items())
+        base = previous.get(run["level"])
+        for endpoint, stats in rows:
+            print(f"{run['level']:>12} {endpoint:>15} " + " ".join(f"{format_stat(c, stats[c]):>11}" for c in COLUMNS))
+            if base is None:
+                continue
+            old = base["result"] if endpoint == "all" else base["result"]["endpoints"].get(endpoint)
+            if old:
+                print(f"{'':>12} {'vs baseline':>15} " + " ".join(f"{change(old[c], stats[c]):>11}" for c in COLUMNS))
+
+
+def format_stat(column: str, value) -> str:
+    if value is None:
+        return "-"
+    if column == "error_rate":
+        return f"{value:.2%}"
+    return f"{value:,}" if isinstance(value, int) else f"{value:,.1f}"
+
+
+def change(old, new) -> str:
+    if old is None or new is None:
+        return "-"
+    if not old:
+        return "=" if not new else "new"
+    return f"{new / old - 1:+.0%}"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_uvicorn(env: dict) -> tuple:
+    """Start one uvicorn worker on a free port; returns (process, url) once it accepts connections."""
+    port = free_port()
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+                                "--port", str(port), "--workers", "1", "--log-level", "warning"],
+                               env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start listening within 60s")
+
+
+async def run(args) -> list:
+    mix = parse_mix(args.mix)
+    payloads = Payloads(args.lines, unique=not args.cache_hits)
+    rng = random.Random(args.seed)
+    open_mode = args.rate is not None
+    levels = [float(level) if open_mode else int(level) for level in (args.rate or args.concurrency).split(",")]
+    if args.url:
+        client, lifespan = HTTPClient(args.url), None
+    else:
+        from app.main import app
+        client, lifespan = ASGIClient(app), Lifespan(app)
+    runs = []
+    if lifespan:
+        await lifespan.__aenter__()
+    try:
+        for level in levels:
+            if open_mode:
+                recorder = await open_loop(client, payloads, mix, level, args.warmup, args.duration, rng)
+                label = f"{level:g}/s"
+            else:
+                recorder = await closed_loop(client, payloads, mix, level, args.warmup, args.duration, rng)
+                label = f"{level}x"
+            runs.append({"level": label, "result": summarize(recorder)})
+    finally:
+        await client.close()
+        if lifespan:
+            await lifespan.__aexit__(None, None, None)
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mix", default="review=1,debug=1", help=f"endpoint=weight,... of {', '.join(ENDPOINTS)}")
+    parser.add_argument("--concurrency", default="1,4,16", help="closed loop: concurrent callers per level")
+    parser.add_argument("--rate", help="open loop: Poisson arrivals per second per level, e.g. 10,20,40")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each level")
+    parser.add_argument("--lines", type=int, default=200, help="lines of code per request body")
+    parser.add_argument("--cache-hits", action="store_true", help="reuse request bodies (result cache hits)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="load a running server instead of the in-process app")
+    parser.add_argument("--spawn", action="store_true", help="start a local uvicorn worker and load it")
+    parser.add_argument("--save", help="write the results to a JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier --save to compare with, level by level")
+    args = parser.parse_args()
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    os.environ.setdefault("TESTSIGHT_DB", os.path.join(tempfile.gettempdir(), "testsight_loadtest.db"))
+    process = None
+    if args.spawn:
+        process, args.url = spawn_uvicorn(dict(os.environ))
+    try:
+        runs = asyncio.run(run(args))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    target = "in-process ASGI" if not args.url else ("uvicorn (spawned)" if args.spawn else args.url)
+    print(f"{target}, mix {args.mix}, {args.lines}-line bodies, {args.duration:g}s per level "
+          f"({'open' if args.rate else 'closed'} loop)")
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(runs, baseline)
+    if args.save:
+        config = {key: getattr(args, key) for key in ("mix", "concurrency", "rate", "duration", "warmup", "lines",
+                                                      "cache_hits", "seed")}
+        config["target"] = target
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "runs": runs}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
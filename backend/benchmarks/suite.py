@@ -0,0 +1,264 @@
+"""Throughput of every analysis endpoint's analyzer, checked against a JSON baseline.
+
+Usage (from backend/):
+    python -m benchmarks.suite                      # compare with benchmarks/baselines/baseline.json
+    python -m benchmarks.suite --update             # (re)record the baseline
+    python -m benchmarks.suite --only review,debug --sizes 10000 --languages python
+    python -m benchmarks.suite --log-sizes 1m,64m,1g
+
+Calls the functions behind the endpoints directly, without HTTP or the result
+cache: detect_language, debug (/debug), review (/review), refactor
+(/refactor), generate_tests (/generate-tests) and analyze_logs
+(/analyze-logs). The code cases run on benchmarks.corpora sources in
+python, java, c# and javascript at 100, 10k and 100k lines. The log cases run
+on generated logs, plus 1 MB of each high-cardinality kind (free text and 300
+message types). Logs up to IN_MEMORY_LOG_BYTES go through analyze_logs as
+one string. Larger ones are written to disk once and read range by range the
+way /analyze-logs/file does, in this process.
+
+The parsed-document cache is cleared before every call, so each call pays
+for its own parse, as a cache miss does. A case is repeated until a round
+takes MIN_ROUND_SECONDS, and the best of --repeat rounds is kept.
+
+Shared and laptop CPUs drift by a third between runs, which would drown a
+20% gate. Next to every case the suite therefore also times calibrate(), a
+fixed pure-Python workload, and compares "relative" throughput (work per
+calibrate() run) instead of raw throughput; --raw compares raw numbers. A
+case that falls more than --threshold below the baseline is measured again
+up to --retries times, keeping its best run, and the suite exits with status
+1 when any case is still below.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import sys
+import time
+
+from app import analyzers, log_analyzer
+from app.documents import document_cache
+
+from . import corpora
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "baseline.json")
+ANALYZERS = {
+    "detect_language": lambda code, language: analyzers.detect_language(code),
+    "debug": lambda code, language: analyzers.debug(code, "ZeroDivisionError: division by zero", language),
+    "review": analyzers.review,
+    "refactor": analyzers.refactor,
+    "generate_tests": analyzers.generate_tests,
+}
+IN_MEMORY_LOG_BYTES = 64 * 1024 * 1024
+HIGH_CARDINALITY_LOGS = ("freetext", "types300")
+HIGH_CARDINALITY_LOG_BYTES = 1024 * 1024
+MIN_ROUND_SECONDS = 0.2
+UNITS = {"k": 1000, "m": 1024 ** 2, "g": 1024 ** 3}
+CALIBRATION_TEXT = " ".join(corpora.NOUNS) * 50
+
+
+def calibrate() -> dict:
+    """Reference workload: regex, dict and str operations like the analyzers do, about half a millisecond."""
+    counts = {}
+    for word in re.findall(r"\w+", CALIBRATION_TEXT):
+        counts[word] = counts.get(word, 0) + len(word.upper())
+    return counts
+
+
+def parse_size(text: str) -> int:
+    """'100', '10k', '64m', '1g' -> int (k is 1000 for line counts, m and g are binary for bytes)."""
+    text = text.strip().lower()
+    if text[-1:] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def size_label(n: int) -> str:
+    for suffix, unit in (("g", 1024 ** 3), ("m", 1024 ** 2), ("k", 1000)):
+        if n >= unit and n % unit == 0:
+            return f"{n // unit}{suffix}"
+    return str(n)
+
+
+def measure(fn, repeat: int) -> float:
+    """Best seconds per call over repeat rounds of enough calls to last MIN_ROUND_SECONDS.
+
+    Like timeit, the cyclic garbage collector is off while timing so its pauses do not land at random.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        return _measure(fn, repeat)
+    finally:
+        gc.enable()
+
+
+def _measure(fn, repeat: int) -> float:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_ROUND_SECONDS or number >= 1000:
+            break
+        number = max(number * 2, int(number * MIN_ROUND_SECONDS * 1.2 / elapsed)) if elapsed else number * 10
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def code_cases(names: list, languages: list, sizes: list):
+    """(case id, unit, work per call, call) for the code analyzers."""
+    for language in languages:
+        for size in sizes:
+            code = corpora.make_source(language, size)
+            lines = code.count("\n") + 1
+            for name in names:
+                analyzer = ANALYZERS[name]
+
+                def call(analyzer=analyzer, code=code, language=language):
+                    document_cache.clear()
+                    analyzer(code, language)
+                yield f"{name}/{language}/{size_label(size)}", "lines/s", lines, call
+
+
+def run_case(unit: str, work: float, call, repeat: int) -> dict:
+    calibration = measure(calibrate, repeat)
+    seconds = measure(call, repeat)
+    return {"unit": unit, "seconds": round(seconds, 6), "throughput": round(work / seconds, 1),
+            "relative": float(f"{work * calibration / seconds:.4g}")}
+
+
+def analyze_log_file(path: str):
+    stats = log_analyzer.LogStats()
+    for start, end in log_analyzer.file_ranges(path):
+        stats.merge(log_analyzer.analyze_range(path, start, end))
+    return stats.result()
+
+
+def log_cases(sizes: list):
+    for size in sizes:
+        if size <= IN_MEMORY_LOG_BYTES:
+            logs = corpora.make_log(size)
+            work, call = len(logs.encode()) / 1e6, lambda logs=logs: analyzers.analyze_logs(logs)
+        else:
+            path = corpora.write_log(size)
+            work, call = os.path.getsize(path) / 1e6, lambda path=path: analyze_log_file(path)
+        yield f"analyze_logs/{size_label(size)}", "MB/s", work, call
+    # Logs with thousands of shapes, where the template miner rather than parsing sets the pace
+    for kind in HIGH_CARDINALITY_LOGS:
+        logs = corpora.make_log(HIGH_CARDINALITY_LOG_BYTES, kind=kind)
+        yield (f"analyze_logs/{kind}/{size_label(HIGH_CARDINALITY_LOG_BYTES)}", "MB/s", len(logs.encode()) / 1e6,
+               lambda logs=logs: analyzers.analyze_logs(logs))
+
+
+def machine() -> dict:
+    return {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine(),
+            "cpus": os.cpu_count()}
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"machine": None, "cases": {}}
+
+
+def save(path: str, data: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def format_throughput(value: float, unit: str) -> str:
+    return f"{value:,.0f} {unit}" if unit == "lines/s" else f"{value:,.1f} {unit}"
+
+
+def compare(results: dict, baseline: dict, threshold: float, key: str = "relative") -> list:
+    """Ids of the cases whose key (relative or raw throughput) dropped more than threshold below the baseline.
+
+    Prints raw throughputs next to the change in key.
+    """
+    regressions = []
+    print(f"{'case':<34} {'throughput':>18} {'baseline':>18} {'change':>8}")
+    for case, result in results.items():
+        base = baseline["cases"].get(case)
+        current = format_throughput(result["throughput"], result["unit"])
+        if base is None:
+            print(f"{case:<34} {current:>18} {'-':>18} {'new':>8}")
+            continue
+        change = result[key] / base[key] - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(case)
+            flag = "  REGRESSION"
+        print(f"{case:<34} {current:>18} {format_throughput(base['throughput'], base['unit']):>18} "
+              f"{change:>+8.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", default=",".join(list(ANALYZERS) + ["analyze_logs"]),
+                        help="comma-separated analyzers to run")
+    parser.add_argument("--languages", default=",".join(corpora.LANGUAGES))
+    parser.add_argument("--sizes", default="100,10k,100k", help="source sizes in lines")
+    parser.add_argument("--log-sizes", default="1m,64m", help="log sizes in bytes, e.g. 1m,64m,1g")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed throughput drop, 0.2 = 20%%")
+    parser.add_argument("--retries", type=int, default=2, help="re-measurements of a case that looks regressed")
+    parser.add_argument("--raw", action="store_true", help="compare raw instead of calibrated throughput")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    parser.add_argument("--update", action="store_true", help="write the results into the baseline instead")
+    args = parser.parse_args()
+
+    only = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = set(only) - set(ANALYZERS) - {"analyze_logs"}
+    if unknown:
+        parser.error(f"unknown analyzers: {', '.join(sorted(unknown))}")
+    languages = [language.strip() for language in args.languages.split(",")]
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    cases = list(code_cases([name for name in ANALYZERS if name in only], languages, sizes))
+    if "analyze_logs" in only:
+        cases += log_cases([parse_size(size) for size in args.log_sizes.split(",")])
+
+    baseline = load_baseline(args.baseline)
+    key = "throughput" if args.raw else "relative"
+    results = {}
+    for case, unit, work, call in cases:
+        results[case] = run_case(unit, work, call, args.repeat)
+        base = baseline["cases"].get(case)
+        for _ in range(args.retries if base and not args.update else 0):
+            if results[case][key] >= base[key] * (1 - args.threshold):
+                break
+            results[case] = max(results[case], run_case(unit, work, call, args.repeat), key=lambda r: r[key])
+
+    if args.output:
+        save(args.output, {"machine": machine(), "cases": results})
+    if args.update:
+        baseline["machine"] = machine()
+        baseline["cases"].update(results)
+        baseline["cases"] = dict(sorted(baseline["cases"].items()))
+        save(args.baseline, baseline)
+        compare(results, {"cases": {}}, args.threshold)
+        print(f"baseline written to {args.baseline}")
+        return
+    if baseline["machine"] and baseline["machine"] != machine():
+        print(f"note: baseline recorded on {baseline['machine']}, this is {machine()}")
+    regressions = compare(results, baseline, args.threshold, key)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
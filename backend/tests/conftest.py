@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# The app reads its configuration at import time, so point it at scratch locations first
+_scratch = tempfile.mkdtemp(prefix="testsight-tests-")
+os.environ.setdefault("TESTSIGHT_DB", os.path.join(_scratch, "test_sight.db"))
+os.environ.setdefault("TESTSIGHT_EMBEDDED_WORKERS", "0")
+os.environ.setdefault("TESTSIGHT_UPLOAD_DIR", os.path.join(_scratch, "uploads"))
+os.environ.setdefault("TESTSIGHT_PROFILE_DIR", os.path.join(_scratch, "profiles"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
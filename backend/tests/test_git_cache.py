@@ -0,0 +1,68 @@
+import os
+import subprocess
+import time
+
+from app import git_cache as git_cache_module
+from app.git_cache import GitCache, git
+
+
+def make_remote(root, name: str) -> str:
+    path = os.path.join(root, name)
+    os.makedirs(path)
+    git("init", "--quiet", cwd=path)
+    with open(os.path.join(path, "calc.py"), "w") as f:
+        f.write("def add(a, b):\n    return a + b\n" * 100)
+    git("add", ".", cwd=path)
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "--quiet", "-m", "init", cwd=path)
+    return path
+
+
+def age(path: str, seconds: float):
+    t = time.time() - seconds
+    os.utime(path, (t, t))
+
+
+def test_workspaces_are_removed_on_release(tmp_path):
+    cache = GitCache(str(tmp_path / "cache"), max_bytes=1 << 30)
+    remote = make_remote(str(tmp_path), "repo")
+    first, sha = cache.checkout(remote)
+    second, _ = cache.checkout(remote)
+    assert first != second
+    assert subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=first, text=True).strip() == sha
+    cache.release(first)
+    cache.release(second)
+    assert os.listdir(cache.workspaces_dir) == []
+    # The mirror stays for the next checkout
+    assert os.path.isdir(cache.mirror_path(remote))
+
+
+def test_quota_reads_recorded_sizes_instead_of_walking(tmp_path, monkeypatch):
+    cache = GitCache(str(tmp_path / "cache"), max_bytes=1 << 30)
+    remote = make_remote(str(tmp_path), "repo")
+    workspace, _ = cache.checkout(remote)
+    walks = []
+    real_dir_size = git_cache_module.dir_size
+    monkeypatch.setattr(git_cache_module, "dir_size", lambda path: walks.append(path) or real_dir_size(path))
+    for _ in range(3):
+        cache.enforce_quota()
+    assert walks == []
+    cache.release(workspace)
+
+
+def test_quota_evicts_idle_mirrors_and_stale_workspaces(tmp_path):
+    cache = GitCache(str(tmp_path / "cache"), max_bytes=0, min_age=3600, stale_age=86400)
+    old, busy, recent = (make_remote(str(tmp_path), name) for name in ("old", "busy", "recent"))
+    for remote in (old, busy, recent):
+        cache.release(cache.checkout(remote)[0])
+    running, _ = cache.checkout(busy)
+    leftover, _ = cache.checkout(old)
+    age(cache.mirror_path(old), 7200)
+    age(cache.mirror_path(busy), 7200)
+    age(leftover, 2 * 86400)
+
+    evicted = cache.enforce_quota()
+    assert sorted(evicted) == sorted([leftover, cache.mirror_path(old)])
+    assert not os.path.exists(cache.mirror_path(old) + ".size")
+    # Busy still has a running job's workspace, recent was used within min_age
+    assert os.path.isdir(cache.mirror_path(busy)) and os.path.isdir(cache.mirror_path(recent))
+    assert os.path.isdir(running)
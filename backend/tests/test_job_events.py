@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+from app import job_events, metrics
+from app.jobs import create_job, set_job_status
+from app.models import get_conn
+
+
+def stage_count(stage: str) -> int:
+    counts, _ = metrics.JOB_STAGE_DURATION.values().get((stage,), ([0], 0.0))
+    return sum(counts)
+
+
+def record_stage(job_id: int, previous: str, seconds: float):
+    conn = get_conn()
+    with conn:
+        conn.execute(job_events.INSERT_EVENT_SQL, (job_id, "stage", json.dumps({"stage": "next", "previous": previous,
+                                                                                "seconds": seconds}), "2024-01-01"))
+
+
+def test_restart_does_not_replay_recorded_stages(monkeypatch):
+    job = create_job("/tmp/replay", None, False, 1, "tests")
+    for _ in range(3):
+        record_stage(job["id"], "replayed", 1.5)
+
+    # A fresh process: nothing folded in yet
+    monkeypatch.setitem(job_events._stage_cursor, "id", None)
+    job_events.seed_stage_cursor()
+    job_events.collect_stage_metrics()
+    assert stage_count("replayed") == 0
+
+    record_stage(job["id"], "replayed", 2.0)
+    job_events.collect_stage_metrics()
+    job_events.collect_stage_metrics()
+    assert stage_count("replayed") == 1
+
+
+def test_collect_without_seeding_starts_at_the_end(monkeypatch):
+    job = create_job("/tmp/replay", None, False, 1, "tests")
+    record_stage(job["id"], "unseeded", 1.0)
+    monkeypatch.setitem(job_events._stage_cursor, "id", None)
+    job_events.collect_stage_metrics()
+    record_stage(job["id"], "unseeded", 1.0)
+    job_events.collect_stage_metrics()
+    assert stage_count("unseeded") == 1
+
+
+def insert_event(job_id: int, kind: str, data: dict):
+    conn = get_conn()
+    with conn:
+        conn.execute(job_events.INSERT_EVENT_SQL, (job_id, kind, json.dumps(data), "2024-01-01"))
+
+
+async def collect(job_id: int, last_id: int = 0) -> list:
+    return [chunk async for chunk in job_events.sse_events(job_id, last_id)]
+
+
+def test_watchers_share_one_tail(monkeypatch):
+    monkeypatch.setattr(job_events, "POLL_SECONDS", 0.01)
+    monkeypatch.setattr(job_events, "MAX_POLL_SECONDS", 0.05)
+    calls = {"tail": 0, "job": 0, "replay": 0}
+    for name, key in (("fetch_new_events", "tail"), ("get_job", "job"), ("fetch_job_events", "replay")):
+        real = getattr(job_events, name)
+        monkeypatch.setattr(job_events, name, lambda *a, real=real, key=key: calls.__setitem__(key, calls[key] + 1)
+                            or real(*a))
+    job = create_job("/tmp/watched", None, False, 1, "tests")
+    insert_event(job["id"], "stage", {"stage": "clone"})
+
+    async def scenario():
+        watchers = [asyncio.create_task(collect(job["id"])) for _ in range(5)]
+        await asyncio.sleep(0.3)
+        for n in range(3):
+            await asyncio.to_thread(insert_event, job["id"], "output", {"line": f"line {n}"})
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.3)
+        await asyncio.to_thread(insert_event, job["id"], "status", {"status": "done"})
+        return await asyncio.wait_for(asyncio.gather(*watchers), 5)
+
+    streams = asyncio.run(scenario())
+    for stream in streams:
+        kinds = [chunk.split("\n")[1] for chunk in stream]
+        assert kinds == ["event: stage"] + ["event: output"] * 3 + ["event: status"]
+        assert stream == streams[0]
+    # Each watcher replays and checks its job once; the idle tail backs off instead of polling every 10 ms
+    assert calls["job"] == 5 and calls["replay"] == 5
+    assert calls["tail"] < 40
+    assert not job_events.event_tail.subscribers
+
+
+def test_finished_job_without_a_status_event_ends_the_stream():
+    job = create_job("/tmp/watched", None, False, 1, "tests")
+    insert_event(job["id"], "stage", {"stage": "clone"})
+    set_job_status(job["id"], "failed")
+    stream = asyncio.run(asyncio.wait_for(collect(job["id"]), 5))
+    assert stream[-1].startswith("id: ") and '"status": "failed"' in stream[-1]
+    # Resuming after the last event replays nothing but still ends
+    last_id = int(stream[0].split("\n")[0][4:])
+    assert len(asyncio.run(asyncio.wait_for(collect(job["id"], last_id), 5))) == 1
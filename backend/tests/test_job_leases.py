@@ -0,0 +1,99 @@
+import time
+
+from app import jobs, worker_pool
+from app.jobs import claim_job, create_job, get_job, requeue_expired_jobs, set_job_status
+from app.models import get_conn
+from app.repo_review import run_review_job
+from app.worker import save_run
+
+from test_review_jobs import check_reviewed, make_repo
+
+RESULT = {"tests_total": 1, "tests_failed": 0, "coverage": 100.0, "results": []}
+
+
+def claim(owner: str, lease_seconds: float = 60):
+    job = create_job("/tmp/leased", kind="tests")
+    # Other tests leave jobs queued; only this one is to be claimed
+    conn = get_conn()
+    with conn:
+        conn.execute("UPDATE jobs SET status='failed' WHERE status='queued' AND id<>?", (job["id"],))
+    claimed = claim_job(owner, lease_seconds)
+    assert claimed["id"] == job["id"] and claimed["lease_owner"] == owner
+    return claimed
+
+
+def expire(job_id: int):
+    conn = get_conn()
+    with conn:
+        conn.execute("UPDATE jobs SET lease_expires_at=? WHERE id=?", (time.time() - 1, job_id))
+
+
+def run_count(job_id: int) -> int:
+    return get_conn().execute("SELECT COUNT(*) FROM runs WHERE job_id=?", (job_id,)).fetchone()[0]
+
+
+def test_expired_lease_is_requeued_and_the_old_owner_cannot_finish():
+    job = claim("worker-a")
+    assert jobs.heartbeat_job(job["id"], "worker-a", 60)
+    expire(job["id"])
+    assert requeue_expired_jobs(max_attempts=3) == 1
+    assert get_job(job["id"])["status"] == "queued"
+    assert not jobs.heartbeat_job(job["id"], "worker-a", 60)
+
+    second = claim_job("worker-b", 60)
+    assert second["id"] == job["id"] and second["attempts"] == 2
+
+    # worker-a is still running and finishes late
+    assert save_run(job["id"], RESULT, owner="worker-a") is None
+    assert not set_job_status(job["id"], "failed", "worker-a")
+    current = get_job(job["id"])
+    assert (current["status"], current["lease_owner"]) == ("running", "worker-b")
+    assert run_count(job["id"]) == 0
+
+    assert save_run(job["id"], RESULT, owner="worker-b") is not None
+    assert get_job(job["id"])["status"] == "done"
+    assert run_count(job["id"]) == 1
+
+
+def test_lease_running_out_on_the_last_attempt_fails_the_job():
+    job = claim("worker-a")
+    expire(job["id"])
+    assert requeue_expired_jobs(max_attempts=1) == 0
+    assert get_job(job["id"])["status"] == "failed"
+
+
+def test_heartbeat_notices_the_lost_lease():
+    job = claim("worker-a")
+    expire(job["id"])
+    requeue_expired_jobs(max_attempts=3)
+    with worker_pool.Heartbeat(job["id"], "worker-a", lease_seconds=0.03) as heartbeat:
+        deadline = time.monotonic() + 5
+        while not heartbeat.lost and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert heartbeat.lost
+
+
+class LostLease:
+    owner = "worker-a"
+    lost = True
+
+
+def test_review_job_with_a_lost_lease_leaves_the_new_owner_alone(tmp_path):
+    job = claim("worker-a")
+    conn = get_conn()
+    with conn:
+        conn.execute("UPDATE jobs SET repo_url=?, kind='review' WHERE id=?", (make_repo(tmp_path), job["id"]))
+    expire(job["id"])
+    requeue_expired_jobs(max_attempts=3)
+    claim_job("worker-b", 60)
+
+    run_review_job(job["id"], LostLease())
+    current = get_job(job["id"])
+    assert (current["status"], current["lease_owner"]) == ("running", "worker-b")
+
+    class Held(LostLease):
+        owner = "worker-b"
+        lost = False
+
+    run_review_job(job["id"], Held())
+    check_reviewed(job["id"])
@@ -0,0 +1,26 @@
+import asyncio
+import random
+
+from fastapi import FastAPI
+
+from benchmarks import loadtest
+
+
+def test_in_process_run_survives_an_endpoint_that_raises():
+    app = FastAPI()
+
+    @app.post("/review")
+    async def review():
+        return {"status": "success"}
+
+    @app.post("/debug")
+    async def debug():
+        raise RuntimeError("analyzer bug")
+
+    payloads = loadtest.Payloads(10)
+    mix = loadtest.parse_mix("review=1,debug=1")
+    recorder = asyncio.run(loadtest.closed_loop(loadtest.ASGIClient(app), payloads, mix, 4, 0.0, 0.2,
+                                                random.Random(0)))
+    result = loadtest.summarize(recorder)
+    assert result["endpoints"]["debug"]["errors"] == result["endpoints"]["debug"]["requests"] > 0
+    assert result["endpoints"]["review"]["errors"] == 0 < result["endpoints"]["review"]["requests"]
@@ -0,0 +1,104 @@
+from app import log_analyzer
+from app.log_templates import TemplateMiner
+from app.log_timeseries import parse_timestamp
+
+LOG = "".join(
+    f"2024-01-01 10:{i // 60 % 60:02d}:{i % 60:02d} {level} {message}\n"
+    for i, (level, message) in enumerate(
+        [("INFO", f"user {n} logged in from 10.0.0.{n % 7}") for n in range(40)]
+        + [("ERROR", f"connection to db-{n % 3} lost after {n * 7} ms") for n in range(25)]
+        + [("WARN", "disk usage high on /var"), ("INFO", "cache warmed")] * 10
+        + [("INFO", f"user {n} logged out") for n in range(30)]
+    )
+)
+
+
+def templates(stats):
+    return [(t["template"], t["count"], t["first_line"], t["last_line"]) for t in stats.result(100)["templates"]]
+
+
+def test_last_line_never_moves_back_across_chunks():
+    miner = TemplateMiner()
+    miner.feed("foo a\nfoo b\n", 0)
+    miner.feed("foo b\nfoo a\nfoo b\n", 2)
+    (template,) = miner.templates
+    assert (template.count, template.first, template.last) == (5, 1, 5)
+
+
+def test_variable_tokens_are_masked():
+    miner = TemplateMiner()
+    miner.feed("took 12 ms\ntook 7 ms\ntook 345 ms\n")
+    assert [(" ".join(t.tokens), t.count) for t in miner.templates] == [("took <*> ms", 3)]
+
+
+def test_chunked_and_merged_analysis_match_one_pass():
+    whole = log_analyzer.LogStats()
+    whole.feed(LOG)
+    expected = templates(whole)
+    assert expected and sum(count for _, count, _, _ in expected) == LOG.count("\n")
+
+    for size in (64, 500, 4096):
+        fed = log_analyzer.LogStats()
+        merged = log_analyzer.LogStats()
+        for chunk in log_analyzer.text_chunks(LOG, size):
+            fed.feed(chunk)
+            merged.merge(log_analyzer.analyze_bytes(chunk.encode()))
+        assert templates(fed) == expected
+        assert templates(merged) == expected
+        assert merged.result()["timeline"] == whole.result()["timeline"]
+
+
+def test_out_of_range_timestamps_count_as_untimestamped():
+    days = {}
+    assert parse_timestamp("0000-01-01 10:00:00", days) is None
+    assert parse_timestamp("2024-13-01 10:00:00", days) is None
+    assert parse_timestamp("2024-01-01 24:00:00", days) is None
+    assert parse_timestamp("9999-12-31 23:59:59", days) == 253402300799
+    assert parse_timestamp("0001-01-01 00:00:00", days) == -62135596800
+
+    logs = "[0000-01-01 10:00:00] ERROR boot\n[2024-01-01 10:00:00] ERROR db down\n[0000-01-01 10:00:01] INFO ok\n"
+    result = log_analyzer.analyze_text(logs)
+    assert result["status"] == "success"
+    assert result["errors"] == 2
+    # The year-0 line before any valid stamp has no bucket; the one after joins the 2024 bucket
+    assert result["timeline"]["times"] == ["2024-01-01T10:00:00"]
+    assert result["timeline"]["errors"] == [1]
+    assert result["timeline"]["info"] == [1]
+
+
+def test_analyze_log_file_with_year_zero(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    monkeypatch.setattr(log_analyzer, "LOG_ROOT", str(tmp_path))
+    (tmp_path / "app.log").write_text("[0000-01-01 10:00:00] ERROR boot\n[2024-02-30 10:00:00] WARN odd day\n")
+    with TestClient(app) as client:
+        response = client.post("/analyze-logs/file", data={"path": "app.log"})
+        assert response.status_code == 200
+        assert response.json()["errors"] == 1
+        response = client.post("/analyze-logs", json={"logs": "[0000-01-01 10:00:00] ERROR boot"})
+        assert response.status_code == 200
+
+
+def test_message_types_route_apart_past_a_shared_first_word():
+    miner = TemplateMiner()
+    miner.feed("".join(f"10:00:0{n % 10} INFO job {verb} queue {n}\n" for n in range(20) for verb in ("started", "stopped")))
+    assert sorted((" ".join(t.tokens), t.count) for t in miner.templates) == [
+        ("<*> INFO job started queue <*>", 20), ("<*> INFO job stopped queue <*>", 20)]
+    assert len(miner._leaf("<*> INFO job started queue <*>".split())) == 1
+
+
+def test_lines_that_overflow_a_full_leaf_count_as_unmatched_and_are_remembered(monkeypatch):
+    # Same routed prefix, but too few tokens in common to join: each shape needs its own template
+    shapes = [f"ping from host {' '.join(word * 3 for word in words)}\n" for words in ("abcdefg", "hijklmn", "opqrstu")]
+    miner = TemplateMiner(max_leaf=2)
+    miner.feed(shapes[0] + shapes[1] + shapes[2] * 2)
+    assert [t.count for t in miner.templates] == [1, 1]
+    assert miner.unmatched == 2
+
+    def no_add(*args, **kwargs):
+        raise AssertionError("a remembered shape went back through the tree")
+
+    monkeypatch.setattr(miner, "add", no_add)
+    miner.feed(shapes[2], 4)
+    assert miner.unmatched == 3
@@ -0,0 +1,48 @@
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import profiling
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_profile_header_is_ignored_by_default(client):
+    assert not profiling.HEADER_ENABLED
+    response = client.get("/", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+
+@pytest.mark.parametrize("mode", ["cprofile", "sample"])
+def test_profiled_request_reports_its_attribution_limits(client, monkeypatch, mode):
+    monkeypatch.setattr(profiling, "HEADER_ENABLED", True)
+    response = client.get("/", headers={"X-Profile": mode})
+    profile_id = response.headers["x-profile-id"]
+    assert profile_id != "busy"
+
+    report = client.get(f"/profiles/{profile_id}").json()
+    assert report["mode"] == mode
+    assert report["notes"] == [profiling.NOTES[mode], profiling.MEMORY_NOTE]
+    assert report["allocations"]
+    # save() took the snapshot and stopped the tracing the profile started
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_stops_when_the_request_fails(monkeypatch):
+    monkeypatch.setattr(profiling, "HEADER_ENABLED", True)
+
+    async def broken(scope, receive, send):
+        raise RuntimeError("boom")
+
+    client = TestClient(profiling.ProfilingMiddleware(broken), raise_server_exceptions=False)
+    assert client.get("/", headers={"X-Profile": "1"}).status_code == 500
+    assert not tracemalloc.is_tracing()
+    assert profiling._busy.acquire(blocking=False)
+    profiling._busy.release()
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import types
+
+from app import result_cache as cache_module
+from app.result_cache import DiskTier, ResultCache, cache_key, code_fingerprint
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+def last_used(disk: DiskTier, key: str) -> float:
+    return disk.pool.get().execute("SELECT last_used FROM result_cache WHERE key=?", (key,)).fetchone()[0]
+
+
+def make_cache(tmp_path, monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    disk = DiskTier(str(tmp_path / "cache.db"), kwargs.pop("disk_bytes", 1 << 20)) if kwargs.pop("disk", True) else None
+    return ResultCache(disk=disk, **kwargs), clock
+
+
+def test_entries_expire_after_the_ttl(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl=60)
+    cache.put("k", {"v": 1})
+    clock.now += 59
+    assert cache.get("k") == {"v": 1}
+    clock.now += 2
+    assert cache.get("k") is None
+    assert cache.stats()["expired"] == 1
+    # The disk copy has expired as well and is dropped on the next trim
+    assert cache.disk.trim(clock.now) == 1
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch, disk=False, max_bytes=40)
+    for key in "abc":
+        cache.put(key, {"v": key})  # 9 bytes each
+    cache.get("a")
+    cache.put("d", {"v": "dddddddddddd"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "a"} and cache.get("d") is not None
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_disk_hits_batch_their_last_used_updates(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl=0)
+    cache.put("k", {"v": 1})
+    stored = last_used(cache.disk, "k")
+    for _ in range(3):
+        clock.now += 10
+        cache._entries.clear()
+        assert cache.get("k") == {"v": 1}
+    assert cache.stats()["disk_hits"] == 3
+    assert last_used(cache.disk, "k") == stored
+    cache.put("other", {"v": 2})
+    assert last_used(cache.disk, "k") == clock.now
+
+    monkeypatch.setattr(cache_module, "DISK_TOUCH_BATCH", 2)
+    cache.put("k2", {"v": 3})
+    clock.now += 10
+    cache.disk.get("k", clock.now)
+    cache.disk.get("k2", clock.now)
+    assert last_used(cache.disk, "k") == last_used(cache.disk, "k2") == clock.now
+
+
+def test_disk_trim_keeps_recently_hit_entries(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl=0, disk_bytes=1)
+    for key in ("old", "hit", "new"):
+        clock.now += 1
+        cache.disk.put(key, "x" * 100, 0, clock.now)
+    clock.now += 1
+    assert cache.disk.get("hit", clock.now) is not None
+    # Sizes are compressed bytes; keep room for two entries
+    size = cache.disk.stats()["bytes"] // 3
+    cache.disk.max_bytes = 2 * size
+    assert cache.disk.trim(clock.now) == 1
+    assert cache.disk.get("old", clock.now) is None
+    assert cache.disk.get("hit", clock.now) is not None
+
+
+def test_code_changes_retire_old_entries(tmp_path, monkeypatch):
+    source = tmp_path / "rules.py"
+    source.write_text("RULES = 1\n")
+    module = types.SimpleNamespace(__file__=str(source))
+    before = code_fingerprint(module)
+    source.write_text("RULES = 2\n")
+    after = code_fingerprint(module)
+    assert before != after
+    params = {"code": "x = 1", "language": "python"}
+    assert cache_key("review", params, before) != cache_key("review", params, after)
+    assert cache_key("review", params, after) == cache_key("review", dict(reversed(params.items())), after)
+
+
+def test_async_lookups_keep_disk_io_off_the_loop(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    threads = []
+    for name in ("get", "put"):
+        real = getattr(cache.disk, name)
+        monkeypatch.setattr(cache.disk, name, lambda *a, real=real: threads.append(threading.current_thread()) or real(*a))
+    calls = []
+
+    def review(code, language):
+        calls.append(code)
+        return {"status": "success", "code": code}
+
+    async def scenario():
+        first = await cache.get_or_compute_async("review", review, code="x", language="python")
+        cache._entries.clear()
+        second = await cache.get_or_compute_async("review", review, code="x", language="python")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second and calls == ["x"]
+    assert len(threads) == 3 and threading.main_thread() not in threads
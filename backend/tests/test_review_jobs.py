@@ -0,0 +1,78 @@
+import os
+import time
+
+from app import repo_review, worker_pool
+from app.jobs import create_job, get_job
+from app.repo_review import get_review_findings, get_review_summary
+
+SOURCES = {
+    "calc.py": "def divide(a, b):\n    return a / b\n\npassword = \"hunter2\"\n",
+    "src/App.java": "public class App {\n    public static void main(String[] args) {\n"
+                    "        String query = \"SELECT * FROM users WHERE id = \" + args[0];\n    }\n}\n",
+    "web/index.js": "function run(x) {\n    return eval(x);\n}\n",
+    "README.md": "# not reviewed\n",
+}
+
+
+def make_repo(root):
+    for path, text in SOURCES.items():
+        full = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "w") as f:
+            f.write(text)
+    return str(root)
+
+
+def drain_queue():
+    while worker_pool.process_one("test-drain"):
+        pass
+
+
+def check_reviewed(job_id):
+    job = get_job(job_id)
+    assert job["status"] == "done"
+    summary = get_review_summary(job_id)
+    assert summary["files_reviewed"] == 3
+    assert summary["files_skipped"] == 0
+    messages = [f["message"] for f in get_review_findings(job_id)]
+    assert any("password" in m.lower() for m in messages)
+    assert any("SQL injection" in m for m in messages)
+    assert any("eval" in m for m in messages)
+
+
+def test_review_job_through_process_one(tmp_path, monkeypatch):
+    drain_queue()
+    monkeypatch.setattr(repo_review, "PROCESSES", 2)
+    job = create_job(make_repo(tmp_path), kind="review")
+    assert worker_pool.process_one("test-worker")
+    check_reviewed(job["id"])
+
+
+def test_review_job_in_worker_process(tmp_path, monkeypatch):
+    # Review jobs start a process pool of their own, which a daemonic worker could not do
+    drain_queue()
+    monkeypatch.setenv("TESTSIGHT_REVIEW_PROCESSES", "2")
+    monkeypatch.setenv("TESTSIGHT_JOB_POLL_SECONDS", "0.1")
+    job = create_job(make_repo(tmp_path), kind="review")
+    stop_event, procs = worker_pool.start_pool(1)
+    try:
+        deadline = time.monotonic() + 120
+        while get_job(job["id"])["status"] in ("queued", "running") and time.monotonic() < deadline:
+            time.sleep(0.2)
+    finally:
+        worker_pool.stop_pool(stop_event, procs)
+    check_reviewed(job["id"])
+
+
+def test_repository_review_bypasses_the_result_cache(tmp_path, monkeypatch):
+    from app.result_cache import ResultCache
+
+    def no_cache(*args, **kwargs):
+        raise AssertionError("repository reviews must not use the result cache")
+
+    monkeypatch.setattr(ResultCache, "get_or_compute", no_cache)
+    monkeypatch.setattr(ResultCache, "put", no_cache)
+    root = make_repo(tmp_path)
+    result = repo_review.review_file(root, "calc.py", "python")
+    assert result[-1] is None
+    assert any("password" in message.lower() for _, _, message, _ in result[5])
@@ -0,0 +1,78 @@
+import random
+
+from app import review_rules
+from benchmarks.bench_review import SNIPPETS, legacy_scan, make_source
+
+
+def findings(code):
+    return [(line_no, rule.message) for line_no, rule in review_rules.scan(code)]
+
+
+def messages(code):
+    return [message for _, message in findings(code)]
+
+
+def test_matches_legacy_loop_on_generated_sources():
+    for seed in range(20):
+        code = make_source(400, seed)
+        assert findings(code) == legacy_scan(code)
+
+
+def test_matches_legacy_loop_on_shuffled_snippets_with_edge_lines():
+    extra = ["/* password = \"x\" */", " * SELECT * FROM t WHERE a = \" + b", "// eval(x)", "   ", "x = 1234567;",
+             "y = a1234;", "final int Z = 5000;", "int.Parse(s);", "Integer.parseInt(s)", "q = num2 / 2;",
+             "if (num2 == 0) return;", "\tTRY {", "x = \"" + "y" * 150 + "\";", "z = 100;", "w = 99;"]
+    rng = random.Random(7)
+    for _ in range(50):
+        code = "\n".join(rng.choices(SNIPPETS + extra, k=rng.randint(1, 60)))
+        assert findings(code) == legacy_scan(code)
+
+
+def test_parse_without_try_nearby():
+    assert "Consider adding try-catch for parse operations to handle invalid input" in \
+        messages("a = 1;\nint x = int.Parse(s);")
+
+
+def test_parse_with_try_within_window():
+    # The window is 0-based lines i-5 .. i+4 for 1-based line i: four lines above to five below
+    parse = "int x = int.Parse(s);"
+    cases = [
+        ("try {\n" + "a;\n" * 3 + parse, False),
+        ("try {\n" + "a;\n" * 4 + parse, True),
+        (parse + "\n" + "a;\n" * 4 + "} catch { try", False),
+        (parse + "\n" + "a;\n" * 5 + "} catch { try", True),
+    ]
+    for code, fires in cases:
+        assert any("try-catch" in m for m in messages(code)) == fires
+        assert findings(code) == legacy_scan(code)
+
+
+def test_zero_check_window_before_division():
+    division = "res = num1 / num2;"
+    assert "Add check for division by zero" in messages(division)
+    guarded = "if (num2 != 0) {\n" + "a;\n" * 8 + division
+    assert "Add check for division by zero" not in messages(guarded)
+    too_far = "if (num2 != 0) {\n" + "a;\n" * 9 + division
+    assert "Add check for division by zero" in messages(too_far)
+    # A check after the division does not count
+    after = division + "\nif (num2 == 0) {}"
+    assert "Add check for division by zero" in messages(after)
+    for code in (guarded, too_far, after):
+        assert findings(code) == legacy_scan(code)
+
+
+def test_comment_lines_are_skipped():
+    for comment in ("// password = \"x\"", "/* eval(x) */", "* SELECT * FROM t WHERE id = \" + id", "   // 123456"):
+        assert findings(comment) == []
+
+
+def test_magic_numbers_from_digit_folding():
+    assert messages("x = 1234;") == ["Consider using named constants instead of magic numbers"]
+    assert messages("x = 987;") == ["Consider using named constants instead of magic numbers"]
+    # Fewer than three digits, digits inside a word, and constants do not fire
+    assert messages("x = 99;") == []
+    assert messages("x = abc1234;") == []
+    assert messages("const int X = 5000;") == []
+    # Non-ASCII digits fold too and match \d like the legacy loop does
+    code = "x = ١٢٣;"
+    assert findings(code) == legacy_scan(code)
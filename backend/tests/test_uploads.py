@@ -0,0 +1,200 @@
+import asyncio
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import uploads
+from app.main import app
+
+SOURCE = b"def add(a, b):\n    return a + b\n" * 200
+
+
+def make_zip(files: dict, compression: int = zipfile.ZIP_DEFLATED) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buf.getvalue()
+
+
+def make_tar(files: dict, mode: str = "w:gz") -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode=mode) as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def corrupt_member(data: bytes, name: bytes) -> bytes:
+    """The zip with the compressed bytes right after name's local header flipped; the directory stays intact."""
+    data = bytearray(data)
+    start = data.index(name) + len(name)
+    for i in range(start + 5, start + 40):
+        data[i] ^= 0xFF
+    return bytes(data)
+
+
+def upload(client, filename: str, data: bytes):
+    return client.post("/repos/upload", files={"file": (filename, data)})
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_zip_upload_is_extracted(client):
+    response = upload(client, "repo.zip", make_zip({"repo/calc.py": SOURCE, "repo/tests/__init__.py": b""}))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["files"] == 2
+    assert os.path.basename(body["repo_path"]) == "repo"
+    with open(os.path.join(body["repo_path"], "calc.py"), "rb") as f:
+        assert f.read() == SOURCE
+
+
+@pytest.mark.parametrize("name", ["../evil.py", "repo/../../evil.py", "/etc/evil.py", "C:/evil.py"])
+@pytest.mark.parametrize("kind", ["zip", "tar.gz"])
+def test_escaping_member_paths_are_rejected(client, name, kind):
+    files = {"repo/ok.py": SOURCE, name: b"print('pwned')\n"}
+    data = make_zip(files) if kind == "zip" else make_tar(files)
+    before = set(os.listdir(uploads.UPLOAD_DIR)) if os.path.isdir(uploads.UPLOAD_DIR) else set()
+    response = upload(client, f"repo.{kind}", data)
+    assert response.status_code == 400
+    assert "Unsafe path" in response.json()["detail"]
+    assert set(os.listdir(uploads.UPLOAD_DIR)) <= before
+
+
+def test_corrupt_zip_member_is_a_bad_request(client):
+    data = corrupt_member(make_zip({"repo/calc.py": SOURCE}), b"repo/calc.py")
+    response = upload(client, "repo.zip", data)
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Not a valid zip archive")
+
+
+XZ = make_tar({"repo/calc.py": SOURCE}, "w:xz")
+
+
+@pytest.mark.parametrize("filename, data", [
+    ("repo.zip", b"PK\x03\x04 definitely not a zip"),
+    ("repo.zip", make_zip({"repo/calc.py": SOURCE})[:-30]),
+    ("repo.tar.gz", make_tar({"repo/calc.py": SOURCE})[:100]),
+    ("repo.tar.xz", XZ[:len(XZ) // 2]),
+], ids=["not-zip", "zip-truncated", "tgz-truncated", "txz-truncated"])
+def test_broken_archives_are_a_bad_request(client, filename, data):
+    assert upload(client, filename, data).status_code == 400
+
+
+def test_archive_expanding_past_the_limit_is_too_large(client, monkeypatch):
+    # A few KB of zeros that inflate to 1 MB, against a 64 KB extraction budget
+    bomb = make_zip({"repo/zeros.bin": bytes(1024 * 1024)})
+    assert len(bomb) < 8 * 1024
+    monkeypatch.setattr(uploads.Extraction.__init__, "__defaults__", (64 * 1024, uploads.MAX_EXTRACTED_FILES))
+    response = upload(client, "bomb.zip", bomb)
+    assert response.status_code == 413
+    assert "expands past" in response.json()["detail"]
+
+
+def test_archive_with_too_many_files_is_too_large(client, monkeypatch):
+    monkeypatch.setattr(uploads.Extraction.__init__, "__defaults__", (uploads.MAX_EXTRACTED_BYTES, 3))
+    data = make_tar({f"repo/m{i}.py": b"x = 1\n" for i in range(5)})
+    assert upload(client, "repo.tgz", data).status_code == 413
+
+
+def test_oversized_upload_is_rejected_while_streaming(monkeypatch):
+    # Straight through ASGI: TestClient would read the whole body before the app sees any of it
+    limit = 256 * 1024
+    chunk = b"x" * (64 * 1024)
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", limit)
+    body = [b'--b\r\nContent-Disposition: form-data; name="file"; filename="big.py"\r\n\r\n'] + [chunk] * 64
+    received = 0
+    sent = []
+
+    async def receive():
+        nonlocal received
+        received += 1
+        return {"type": "http.request", "body": body[received - 1], "more_body": received < len(body)}
+
+    async def send(message):
+        sent.append(message)
+
+    # No Content-Length: only the running count can stop this
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+             "path": "/repos/upload", "raw_path": b"/repos/upload", "query_string": b"", "root_path": "",
+             "headers": [(b"content-type", b"multipart/form-data; boundary=b")], "client": ("test", 1),
+             "server": ("test", 80)}
+    asyncio.run(app(scope, receive, send))
+    assert sent[0]["status"] == 413
+    assert received * len(chunk) <= limit + uploads.FORM_OVERHEAD + 2 * len(chunk)
+
+
+def test_declared_length_over_the_limit_is_rejected_up_front(client, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_IMAGE_BYTES", 1024)
+    response = client.post("/code/upload-image", files={"file": ("shot.png", bytes(uploads.FORM_OVERHEAD + 2048))})
+    assert response.status_code == 413
+
+
+def test_upload_without_a_file_is_a_bad_request(client):
+    assert client.post("/repos/upload", data={"name": "repo"}).status_code == 400
+    assert client.post("/repos/upload", content=b"{}", headers={"content-type": "application/json"}).status_code == 400
+
+
+def test_workspace_key_covers_the_file_name(client):
+    first = upload(client, "calc.py", SOURCE).json()
+    renamed = upload(client, "calc_test.py", SOURCE).json()
+    again = upload(client, "calc.py", SOURCE).json()
+    assert first["sha256"] == renamed["sha256"]
+    assert renamed["repo_path"] != first["repo_path"]
+    assert os.listdir(renamed["repo_path"]) == ["calc_test.py"]
+    assert again["reused"] and again["repo_path"] == first["repo_path"]
+
+
+def test_jobs_work_on_their_own_copy_of_an_upload(client):
+    from app.jobs import create_job
+    from app.job_events import JobEvents
+    from app.worker import checkout_workspace, release_workspace
+
+    repo_path = upload(client, "shared.zip", make_zip({"shared/calc.py": SOURCE})).json()["repo_path"]
+    jobs = [create_job(repo_path, None, False, 1, "tests") for _ in range(2)]
+    copies = [checkout_workspace(job, JobEvents(job["id"]))[0] for job in jobs]
+    assert len({repo_path, *copies}) == 3
+    for copy in copies:
+        os.makedirs(os.path.join(copy, "tests"))
+        with open(os.path.join(copy, "tests", "test_generated.py"), "w") as f:
+            f.write("def test_ok():\n    pass\n")
+    assert sorted(os.listdir(repo_path)) == ["calc.py"]
+
+    for job, copy in zip(jobs, copies):
+        release_workspace(job, copy)
+        assert not os.path.exists(copy)
+    # Read-only jobs (reviews) use the shared workspace in place
+    review = create_job(repo_path, None, False, 1, "review")
+    assert checkout_workspace(review, JobEvents(review["id"]), writable=False)[0] == repo_path
+    release_workspace(review, repo_path)
+    assert os.path.isdir(repo_path)
+
+
+def test_least_recently_used_workspaces_are_evicted(client, monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_DIR", os.path.join(uploads.UPLOAD_DIR, "evict"))
+    paths = [upload(client, f"m{i}.py", bytes(10000)).json()["repo_path"] for i in range(4)]
+    workspaces = [uploads.upload_workspace(path) for path in paths]
+    day = 86400
+    for age, workspace in zip((4 * day, 2 * day, 3 * day, 0), workspaces):
+        os.utime(workspace, (os.path.getmtime(workspace) - age,) * 2)
+    stale = os.path.join(uploads.UPLOAD_DIR, ".incoming-crashed")
+    os.makedirs(stale)
+    os.utime(stale, (os.path.getmtime(stale) - day,) * 2)
+
+    evicted = uploads.evict_workspaces(max_bytes=25000)
+    assert sorted(evicted) == sorted([workspaces[0], workspaces[2], stale])
+    assert [os.path.isdir(w) for w in workspaces] == [False, True, False, True]
+    # The newest stays even when it alone is over the quota
+    assert uploads.evict_workspaces(max_bytes=0) == [workspaces[1]]
+    assert os.path.isdir(workspaces[3])
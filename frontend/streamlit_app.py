@@ -1,6 +1,7 @@
 import streamlit as st
 import requests
 import time
+import json
 import os
 from datetime import datetime
 
@@ -39,6 +40,17 @@ def load_stats_from_db():
         print(f"Error loading stats: {e}")
     return {'tests': 0, 'bugs': 0, 'reviews': 0, 'refactors': 0, 'total': 0}
 
+# Latency percentiles per tool from the backend's in-process metrics
+@st.cache_data(ttl=2)
+def load_latency_summary():
+    try:
+        r = requests.get(f"{BACKEND_URL}/metrics/summary", timeout=2)
+        if r.status_code == 200:
+            return r.json()
+    except Exception as e:
+        print(f"Error loading metrics: {e}")
+    return None
+
 # Load fresh stats from database
 current_stats = load_stats_from_db()
 
@@ -94,6 +106,24 @@ if st.session_state.page == 'Dashboard':
     with col_left:
         st.subheader("Activity Distribution")
         st.info("No activity recorded yet. Start using the tools!")
+
+        st.subheader("Latency per Tool")
+        latency = load_latency_summary()
+        tool_names = {'tests': 'Test Generation', 'bugs': 'Debugger', 'reviews': 'Code Review',
+                      'refactors': 'Refactor Bot', 'log_analysis': 'Log Analyzer'}
+        if latency and any(t['count'] for t in latency['tools'].values()):
+            rows = [{"tool": tool_names.get(tool, tool), "requests": t['count'], "p50 (ms)": t['p50_ms'],
+                     "p95 (ms)": t['p95_ms'], "p99 (ms)": t['p99_ms']}
+                    for tool, t in latency['tools'].items() if t['count']]
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+            st.bar_chart({p: {row['tool']: row[f"{p} (ms)"] for row in rows} for p in ("p50", "p95", "p99")})
+            if latency['job_stages']:
+                st.caption("Job stages")
+                st.dataframe([{"stage": s['stage'], "runs": s['count'], "p50 (s)": round(s['p50_ms'] / 1000, 2),
+                               "p95 (s)": round(s['p95_ms'] / 1000, 2), "p99 (s)": round(s['p99_ms'] / 1000, 2)}
+                              for s in latency['job_stages']], use_container_width=True, hide_index=True)
+        else:
+            st.info("No requests timed yet.")
     
     with col_right:
         st.subheader("Quick Actions")
@@ -135,7 +165,7 @@ elif st.session_state.page == 'Test Gen':
         elif input_method == "Git URL":
             repo_url = st.text_input('Git Repository URL', placeholder='https://github.com/user/repo')
         elif input_method == "Upload Zip":
-            uploaded_zip = st.file_uploader('Upload zip of repo', type=['zip'], key='zip_upload')
+            uploaded_zip = st.file_uploader('Upload zip or tar.gz of repo', type=['zip', 'gz', 'tgz', 'tar'], key='zip_upload')
         elif input_method == "Upload Image":
             uploaded_image = st.file_uploader('Drag and drop file here (Limit 300MB per file • zip)', 
                                              type=['png', 'jpg', 'jpeg', 'bmp'], key='image_upload')
@@ -209,26 +239,35 @@ elif st.session_state.page == 'Test Gen':
         
         progress_bar = st.progress(0)
         status_text = st.empty()
+        output_box = st.empty()
         
-        for i in range(100):
-            try:
-                r = requests.get(f"{BACKEND_URL}/jobs/{st.session_state['job_id']}")
-                if r.status_code == 200:
-                    job = r.json()
-                    status_text.markdown(f"**Status:** {job.get('status')} | **Repo:** {job.get('repo_url')}")
-                    
-                    if job.get('status') == 'done':
-                        progress_bar.progress(100)
-                        st.success('✅ Tests generated successfully!')
-                        break
-                    elif job.get('status') in ('failed_clone', 'failed'):
-                        st.error('❌ Job failed')
-                        break
-                    else:
-                        progress_bar.progress(min(i + 10, 90))
-                        time.sleep(1)
-            except:
-                break
+        # Server-Sent Events: stage changes and pytest output as they happen
+        stage_progress = {'clone': 10, 'generate': 30, 'test': 50, 'save': 90}
+        output_lines = []
+        event = None
+        try:
+            with requests.get(f"{BACKEND_URL}/jobs/{st.session_state['job_id']}/events", stream=True, timeout=(5, 60)) as r:
+                for line in r.iter_lines(decode_unicode=True):
+                    if line.startswith('event:'):
+                        event = line[6:].strip()
+                    elif line.startswith('data:') and event:
+                        data = json.loads(line[5:])
+                        if event == 'stage':
+                            status_text.markdown(f"**Stage:** {data.get('stage')}")
+                            progress_bar.progress(stage_progress.get(data.get('stage'), 0))
+                        elif event == 'output':
+                            output_lines.append(data.get('line', ''))
+                            output_box.code('\n'.join(output_lines[-200:]), language='text')
+                        elif event == 'status':
+                            status_text.markdown(f"**Status:** {data.get('status')}")
+                            if data.get('status') == 'done':
+                                progress_bar.progress(100)
+                                st.success('✅ Tests generated successfully!')
+                            else:
+                                st.error('❌ Job failed')
+                            break
+        except Exception as e:
+            st.warning(f"Lost connection to job progress: {str(e)}")
 
 # Debugger Page
 elif st.session_state.page == 'Debugger':
@@ -450,6 +489,28 @@ elif st.session_state.page == 'Log Analyzer':
                                         st.warning(f"🟡 **Warning:** {insight['message']}")
                                     elif insight['type'] == 'info':
                                         st.info(f"🔵 **Info:** {insight['message']}")
+
+                                timeline = result.get('timeline')
+                                if timeline:
+                                    st.markdown(f"### Timeline (per {timeline['bucket_seconds']}s):")
+                                    st.line_chart({"time": timeline['times'], "errors": timeline['errors'],
+                                                   "warnings": timeline['warnings'], "total": timeline['total']},
+                                                  x="time", y=["errors", "warnings", "total"])
+                                    for anomaly in result.get('anomalies', [])[:10]:
+                                        label = anomaly.get('template') or anomaly['series']
+                                        st.warning(f"📈 {anomaly['time']}: {label} at {anomaly['count']} "
+                                                   f"(expected ~{anomaly['expected']}, z={anomaly['z']})")
+
+                                templates = result.get('templates', [])
+                                if templates:
+                                    st.markdown(f"### Top Templates ({result.get('template_count', len(templates))} found):")
+                                    st.dataframe([{
+                                        "Template": t['template'],
+                                        "Count": t['count'],
+                                        "First Line": t['first_line'],
+                                        "Last Line": t['last_line'],
+                                        "Sample": t['samples'][0] if t['samples'] else "",
+                                    } for t in templates], use_container_width=True)
                     except Exception as e:
                         st.error(f"Error: {str(e)}")
     